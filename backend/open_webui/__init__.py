@@ -99,5 +99,18 @@ def dev(
     )
 
 
+@app.command()
+def reindex_chats():
+    """Rebuild the full-text search index of all chats."""
+    import open_webui.config  # applies pending migrations, which create the index
+    from open_webui.models.chats import Chats
+
+    if not Chats.has_search_index():
+        typer.echo("Chat search index is not available for this database.")
+        raise typer.Exit(1)
+
+    typer.echo(f"Indexed {Chats.rebuild_search_index()} chats.")
+
+
 if __name__ == "__main__":
     app()
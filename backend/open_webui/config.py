@@ -5,6 +5,8 @@ import shutil
 import base64
 import redis
 import random
+import threading
+import time
 
 from datetime import datetime
 from pathlib import Path
@@ -31,7 +33,7 @@ from open_webui.env import (
     log,
 )
 from open_webui.internal.db import Base, get_db
-from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.redis import get_redis_connection, RedisPubSubListener
 
 
 class EndpointFilter(logging.Filter):
@@ -210,18 +212,52 @@ class PersistentConfig(Generic[T]):
 
 
 class AppConfig:
+    """
+    Serves config values from process memory.
+
+    With Redis configured, every change made through `__setattr__` is written
+    to Redis together with an incremented version counter and announced on a
+    pub/sub channel. Other workers then reload all values in one snapshot
+    read. While the subscription is down, reads fall back to comparing the
+    version counter at most once per `SYNC_INTERVAL` seconds.
+    """
+
     _state: dict[str, PersistentConfig]
     _redis: Optional[redis.Redis] = None
+    _listener: Optional[RedisPubSubListener] = None
+
+    CHANNEL = "open-webui:config:invalidate"
+    VERSION_KEY = "open-webui:config:version"
+    SYNC_INTERVAL = 1.0
 
     def __init__(
         self, redis_url: Optional[str] = None, redis_sentinels: Optional[list] = []
     ):
         super().__setattr__("_state", {})
+        super().__setattr__("_lock", threading.Lock())
+        # Version and number of keys of the last snapshot read from Redis
+        super().__setattr__("_version", None)
+        super().__setattr__("_loaded_keys", 0)
+        super().__setattr__("_checked_at", 0.0)
+
         if redis_url:
             super().__setattr__(
                 "_redis",
                 get_redis_connection(redis_url, redis_sentinels, decode_responses=True),
             )
+            try:
+                super().__setattr__(
+                    "_listener",
+                    RedisPubSubListener(
+                        redis_url,
+                        redis_sentinels,
+                        self.CHANNEL,
+                        callback=lambda _: self._reload(),
+                        on_reset=self._reload,
+                    ),
+                )
+            except Exception as e:
+                log.warning(f"Config change notifications unavailable: {e}")
 
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
@@ -232,18 +268,33 @@ class AppConfig:
 
             if self._redis:
                 redis_key = f"open-webui:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+                pipe = self._redis.pipeline()
+                pipe.set(redis_key, json.dumps(self._state[key].value))
+                pipe.incr(self.VERSION_KEY)
+                pipe.execute()
+
+                if self._listener:
+                    self._listener.publish(key)
+                else:
+                    self._redis.publish(self.CHANNEL, key)
+
+    def _reload(self):
+        """Read all values from Redis in a single round trip."""
+        with self._lock:
+            keys = list(self._state.keys())
+            try:
+                pipe = self._redis.pipeline()
+                pipe.get(self.VERSION_KEY)
+                pipe.mget([f"open-webui:config:{key}" for key in keys])
+                version, redis_values = pipe.execute()
+            except Exception as e:
+                log.warning(f"Failed to load config from Redis: {e}")
+                return
+
+            for key, redis_value in zip(keys, redis_values):
+                if redis_value is None:
+                    continue
 
-    def __getattr__(self, key):
-        if key not in self._state:
-            raise AttributeError(f"Config key '{key}' not found")
-
-        # If Redis is available, check for an updated value
-        if self._redis:
-            redis_key = f"open-webui:config:{key}"
-            redis_value = self._redis.get(redis_key)
-
-            if redis_value is not None:
                 try:
                     decoded_value = json.loads(redis_value)
 
@@ -255,6 +306,37 @@ class AppConfig:
                 except json.JSONDecodeError:
                     log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
 
+            super().__setattr__("_version", version)
+            super().__setattr__("_loaded_keys", len(keys))
+            super().__setattr__("_checked_at", time.monotonic())
+
+    def _sync(self):
+        listener = self._listener.start() if self._listener else None
+
+        if self._loaded_keys != len(self._state):
+            # Keys registered since the last snapshot
+            self._reload()
+        elif (
+            not (listener and listener.connected)
+            and time.monotonic() - self._checked_at >= self.SYNC_INTERVAL
+        ):
+            super().__setattr__("_checked_at", time.monotonic())
+            try:
+                version = self._redis.get(self.VERSION_KEY)
+            except Exception as e:
+                log.warning(f"Failed to check the config version in Redis: {e}")
+                return
+
+            if version != self._version:
+                self._reload()
+
+    def __getattr__(self, key):
+        if key not in self._state:
+            raise AttributeError(f"Config key '{key}' not found")
+
+        if self._redis:
+            self._sync()
+
         return self._state[key].value
 
 
@@ -2152,6 +2234,15 @@ ENABLE_RAG_HYBRID_SEARCH = PersistentConfig(
     os.environ.get("ENABLE_RAG_HYBRID_SEARCH", "").lower() == "true",
 )
 
+# Persistent per-collection lexical (BM25) index used by hybrid search. The
+# index files are local to the node and aren't updated with the chunks added
+# or deleted on other nodes, so it is only meant for single-node deployments
+# and is opt-in.
+ENABLE_RAG_BM25_INDEX = (
+    os.environ.get("ENABLE_RAG_BM25_INDEX", "False").lower() == "true"
+)
+RAG_BM25_INDEX_DIR = os.environ.get("RAG_BM25_INDEX_DIR", f"{CACHE_DIR}/bm25")
+
 RAG_FULL_CONTEXT = PersistentConfig(
     "RAG_FULL_CONTEXT",
     "rag.full_context",
@@ -2254,6 +2345,49 @@ RAG_EMBEDDING_PREFIX_FIELD_NAME = os.environ.get(
     "RAG_EMBEDDING_PREFIX_FIELD_NAME", None
 )
 
+# Content-addressed cache of computed embeddings, keyed by engine, endpoint,
+# model and prefix. RAG_EMBEDDING_CACHE_SIZE vectors are kept in memory.
+# RAG_EMBEDDING_CACHE_BACKEND adds a shared second tier: "redis" or "disk".
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+RAG_EMBEDDING_CACHE_BACKEND = os.environ.get("RAG_EMBEDDING_CACHE_BACKEND", "")
+RAG_EMBEDDING_CACHE_DIR = os.environ.get(
+    "RAG_EMBEDDING_CACHE_DIR", f"{CACHE_DIR}/embeddings"
+)
+
+try:
+    RAG_EMBEDDING_CACHE_SIZE = int(os.environ.get("RAG_EMBEDDING_CACHE_SIZE", "10000"))
+except ValueError:
+    RAG_EMBEDDING_CACHE_SIZE = 10000
+
+try:
+    RAG_EMBEDDING_CACHE_TTL = int(os.environ.get("RAG_EMBEDDING_CACHE_TTL", "604800"))
+except ValueError:
+    RAG_EMBEDDING_CACHE_TTL = 604800
+
+# Reranking scores keyed by model, query and chunk content. ColBERT scores are
+# relative to the other candidates, so ColBERT caches the token embeddings of
+# up to RAG_COLBERT_CACHE_SIZE chunks instead.
+ENABLE_RAG_RERANKING_CACHE = (
+    os.environ.get("ENABLE_RAG_RERANKING_CACHE", "True").lower() == "true"
+)
+
+try:
+    RAG_RERANKING_CACHE_SIZE = int(os.environ.get("RAG_RERANKING_CACHE_SIZE", "50000"))
+except ValueError:
+    RAG_RERANKING_CACHE_SIZE = 50000
+
+try:
+    RAG_RERANKING_CACHE_TTL = int(os.environ.get("RAG_RERANKING_CACHE_TTL", "86400"))
+except ValueError:
+    RAG_RERANKING_CACHE_TTL = 86400
+
+try:
+    RAG_COLBERT_CACHE_SIZE = int(os.environ.get("RAG_COLBERT_CACHE_SIZE", "2000"))
+except ValueError:
+    RAG_COLBERT_CACHE_SIZE = 2000
+
 RAG_RERANKING_ENGINE = PersistentConfig(
     "RAG_RERANKING_ENGINE",
     "rag.reranking_engine",
@@ -2966,6 +3100,19 @@ WHISPER_VAD_FILTER = PersistentConfig(
 
 WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "").lower() or None
 
+# Long or large recordings are split into chunks of up to
+# AUDIO_STT_CHUNK_DURATION seconds, transcribed by AUDIO_STT_CHUNK_WORKERS
+# workers while the rest of the recording is still being split.
+try:
+    AUDIO_STT_CHUNK_DURATION = int(os.environ.get("AUDIO_STT_CHUNK_DURATION", "600"))
+except ValueError:
+    AUDIO_STT_CHUNK_DURATION = 600
+
+try:
+    AUDIO_STT_CHUNK_WORKERS = int(os.environ.get("AUDIO_STT_CHUNK_WORKERS", "4"))
+except ValueError:
+    AUDIO_STT_CHUNK_WORKERS = 4
+
 # Add Deepgram configuration
 DEEPGRAM_API_KEY = PersistentConfig(
     "DEEPGRAM_API_KEY",
@@ -3102,6 +3249,34 @@ AUDIO_TTS_AZURE_SPEECH_OUTPUT_FORMAT = PersistentConfig(
     ),
 )
 
+# Synthesised speech is cached on disk by request body. Clips not played for
+# AUDIO_TTS_CACHE_TTL seconds are removed, and the least recently played ones
+# go first when the cache grows past AUDIO_TTS_CACHE_MAX_SIZE_MB.
+try:
+    AUDIO_TTS_CACHE_MAX_SIZE_MB = int(
+        os.environ.get("AUDIO_TTS_CACHE_MAX_SIZE_MB", "1024")
+    )
+except ValueError:
+    AUDIO_TTS_CACHE_MAX_SIZE_MB = 1024
+
+try:
+    AUDIO_TTS_CACHE_TTL = int(os.environ.get("AUDIO_TTS_CACHE_TTL", "2592000"))
+except ValueError:
+    AUDIO_TTS_CACHE_TTL = 2592000
+
+try:
+    AUDIO_TTS_CACHE_EVICTION_INTERVAL = int(
+        os.environ.get("AUDIO_TTS_CACHE_EVICTION_INTERVAL", "600")
+    )
+except ValueError:
+    AUDIO_TTS_CACHE_EVICTION_INTERVAL = 600
+
+# Forward audio to the client as the TTS engine produces it, instead of
+# receiving the whole clip first
+ENABLE_AUDIO_TTS_STREAMING = (
+    os.environ.get("ENABLE_AUDIO_TTS_STREAMING", "True").lower() == "true"
+)
+
 
 ####################################
 # LDAP
@@ -320,6 +320,67 @@ ENABLE_REALTIME_CHAT_SAVE = (
     os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 )
 
+# Write-behind budget for realtime chat saves: a streamed message is persisted
+# at most once per interval (seconds) or once this many characters accumulated.
+REALTIME_CHAT_SAVE_INTERVAL = os.environ.get("REALTIME_CHAT_SAVE_INTERVAL", "1")
+try:
+    REALTIME_CHAT_SAVE_INTERVAL = float(REALTIME_CHAT_SAVE_INTERVAL)
+except Exception:
+    REALTIME_CHAT_SAVE_INTERVAL = 1.0
+
+REALTIME_CHAT_SAVE_BUFFER_SIZE = os.environ.get(
+    "REALTIME_CHAT_SAVE_BUFFER_SIZE", "2048"
+)
+try:
+    REALTIME_CHAT_SAVE_BUFFER_SIZE = int(REALTIME_CHAT_SAVE_BUFFER_SIZE)
+except Exception:
+    REALTIME_CHAT_SAVE_BUFFER_SIZE = 2048
+
+ENABLE_CHAT_COMPLETION_DELTA_EVENTS = (
+    os.environ.get("ENABLE_CHAT_COMPLETION_DELTA_EVENTS", "False").lower() == "true"
+)
+
+# Number of delta-encoded chat:completion events between full content snapshots
+CHAT_COMPLETION_SNAPSHOT_INTERVAL = os.environ.get(
+    "CHAT_COMPLETION_SNAPSHOT_INTERVAL", "50"
+)
+try:
+    CHAT_COMPLETION_SNAPSHOT_INTERVAL = int(CHAT_COMPLETION_SNAPSHOT_INTERVAL)
+except Exception:
+    CHAT_COMPLETION_SNAPSHOT_INTERVAL = 50
+
+# Seconds group memberships are served from memory, 0 disables the cache.
+# With REDIS_URL set, group changes also invalidate other workers immediately.
+GROUP_MEMBERSHIP_CACHE_TTL = os.environ.get("GROUP_MEMBERSHIP_CACHE_TTL", "60")
+try:
+    GROUP_MEMBERSHIP_CACHE_TTL = float(GROUP_MEMBERSHIP_CACHE_TTL)
+except Exception:
+    GROUP_MEMBERSHIP_CACHE_TTL = 60.0
+
+# Seconds resolved users are served from memory, 0 disables the cache.
+# With REDIS_URL set, user changes also invalidate other workers immediately.
+USER_CACHE_TTL = os.environ.get("USER_CACHE_TTL", "10")
+try:
+    USER_CACHE_TTL = float(USER_CACHE_TTL)
+except Exception:
+    USER_CACHE_TTL = 10.0
+
+# last_active_at is only written when it moved by more than the granularity,
+# in one bulk update per flush interval.
+USER_LAST_ACTIVE_GRANULARITY = os.environ.get("USER_LAST_ACTIVE_GRANULARITY", "60")
+try:
+    USER_LAST_ACTIVE_GRANULARITY = float(USER_LAST_ACTIVE_GRANULARITY)
+except Exception:
+    USER_LAST_ACTIVE_GRANULARITY = 60.0
+
+USER_LAST_ACTIVE_FLUSH_INTERVAL = os.environ.get(
+    "USER_LAST_ACTIVE_FLUSH_INTERVAL", "10"
+)
+try:
+    USER_LAST_ACTIVE_FLUSH_INTERVAL = float(USER_LAST_ACTIVE_FLUSH_INTERVAL)
+except Exception:
+    USER_LAST_ACTIVE_FLUSH_INTERVAL = 10.0
+
 ####################################
 # REDIS
 ####################################
@@ -409,6 +470,13 @@ WEBSOCKET_SENTINEL_HOSTS = os.environ.get("WEBSOCKET_SENTINEL_HOSTS", "")
 
 WEBSOCKET_SENTINEL_PORT = os.environ.get("WEBSOCKET_SENTINEL_PORT", "26379")
 
+WEBSOCKET_POOL_CACHE_TTL = os.environ.get("WEBSOCKET_POOL_CACHE_TTL", "5")
+
+try:
+    WEBSOCKET_POOL_CACHE_TTL = float(WEBSOCKET_POOL_CACHE_TTL)
+except Exception:
+    WEBSOCKET_POOL_CACHE_TTL = 5.0
+
 AIOHTTP_CLIENT_TIMEOUT = os.environ.get("AIOHTTP_CLIENT_TIMEOUT", "")
 
 if AIOHTTP_CLIENT_TIMEOUT == "":
@@ -437,6 +505,23 @@ else:
     except Exception:
         AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = 10
 
+# Model lists of OpenAI/Ollama upstreams are served from cache for this many
+# seconds, then served stale for up to MODEL_LIST_CACHE_STALE_TTL seconds while
+# being refreshed in the background (0 disables the cache)
+MODEL_LIST_CACHE_TTL = os.environ.get("MODEL_LIST_CACHE_TTL", "10")
+
+try:
+    MODEL_LIST_CACHE_TTL = float(MODEL_LIST_CACHE_TTL)
+except Exception:
+    MODEL_LIST_CACHE_TTL = 10.0
+
+MODEL_LIST_CACHE_STALE_TTL = os.environ.get("MODEL_LIST_CACHE_STALE_TTL", "600")
+
+try:
+    MODEL_LIST_CACHE_STALE_TTL = float(MODEL_LIST_CACHE_STALE_TTL)
+except Exception:
+    MODEL_LIST_CACHE_STALE_TTL = 600.0
+
 
 AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA = os.environ.get(
     "AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA", "10"
@@ -452,11 +537,207 @@ else:
     except Exception:
         AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA = 10
 
+# OpenAPI specs of tool servers are revalidated (ETag/Last-Modified) in the
+# background every TOOL_SERVER_CACHE_TTL seconds, and served stale for up to
+# TOOL_SERVER_CACHE_STALE_TTL seconds while a server is unreachable
+# (0 disables the cache)
+TOOL_SERVER_CACHE_TTL = os.environ.get("TOOL_SERVER_CACHE_TTL", "300")
+
+try:
+    TOOL_SERVER_CACHE_TTL = float(TOOL_SERVER_CACHE_TTL)
+except Exception:
+    TOOL_SERVER_CACHE_TTL = 300.0
+
+TOOL_SERVER_CACHE_STALE_TTL = os.environ.get("TOOL_SERVER_CACHE_STALE_TTL", "86400")
+
+try:
+    TOOL_SERVER_CACHE_STALE_TTL = float(TOOL_SERVER_CACHE_STALE_TTL)
+except Exception:
+    TOOL_SERVER_CACHE_STALE_TTL = 86400.0
+
 
 AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Connection pool of the shared upstream clients (0 means unlimited)
+AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "100"
+)
+
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST)
+except Exception:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 100
+
+AIOHTTP_CLIENT_DNS_CACHE_TTL = os.environ.get("AIOHTTP_CLIENT_DNS_CACHE_TTL", "300")
+
+try:
+    AIOHTTP_CLIENT_DNS_CACHE_TTL = int(AIOHTTP_CLIENT_DNS_CACHE_TTL)
+except Exception:
+    AIOHTTP_CLIENT_DNS_CACHE_TTL = 300
+
+AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = os.environ.get(
+    "AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT", "30"
+)
+
+try:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = float(AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT)
+except Exception:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = 30.0
+
+
+####################################
+# OLLAMA LOAD BALANCER
+####################################
+
+# One of "least_outstanding", "ewma", "affinity" or "random"
+OLLAMA_LOAD_BALANCER_STRATEGY = os.environ.get(
+    "OLLAMA_LOAD_BALANCER_STRATEGY", "least_outstanding"
+).lower()
+
+OLLAMA_LOAD_BALANCER_FAILURE_THRESHOLD = os.environ.get(
+    "OLLAMA_LOAD_BALANCER_FAILURE_THRESHOLD", "3"
+)
+
+try:
+    OLLAMA_LOAD_BALANCER_FAILURE_THRESHOLD = int(OLLAMA_LOAD_BALANCER_FAILURE_THRESHOLD)
+except Exception:
+    OLLAMA_LOAD_BALANCER_FAILURE_THRESHOLD = 3
+
+OLLAMA_LOAD_BALANCER_COOLDOWN = os.environ.get("OLLAMA_LOAD_BALANCER_COOLDOWN", "30")
+
+try:
+    OLLAMA_LOAD_BALANCER_COOLDOWN = float(OLLAMA_LOAD_BALANCER_COOLDOWN)
+except Exception:
+    OLLAMA_LOAD_BALANCER_COOLDOWN = 30.0
+
+# How often the loaded models of every node are refreshed for "affinity"
+OLLAMA_LOAD_BALANCER_PS_INTERVAL = os.environ.get(
+    "OLLAMA_LOAD_BALANCER_PS_INTERVAL", "10"
+)
+
+try:
+    OLLAMA_LOAD_BALANCER_PS_INTERVAL = float(OLLAMA_LOAD_BALANCER_PS_INTERVAL)
+except Exception:
+    OLLAMA_LOAD_BALANCER_PS_INTERVAL = 10.0
+
+
+####################################
+# EMBEDDING CLIENT
+####################################
+
+# Seconds an embedding request may take, and to connect to the endpoint
+EMBEDDING_REQUEST_TIMEOUT = os.environ.get("EMBEDDING_REQUEST_TIMEOUT", "300")
+
+try:
+    EMBEDDING_REQUEST_TIMEOUT = int(EMBEDDING_REQUEST_TIMEOUT)
+except Exception:
+    EMBEDDING_REQUEST_TIMEOUT = 300
+
+EMBEDDING_CONNECT_TIMEOUT = os.environ.get("EMBEDDING_CONNECT_TIMEOUT", "60")
+
+try:
+    EMBEDDING_CONNECT_TIMEOUT = int(EMBEDDING_CONNECT_TIMEOUT)
+except Exception:
+    EMBEDDING_CONNECT_TIMEOUT = 60
+
+EMBEDDING_MAX_RETRIES = os.environ.get("EMBEDDING_MAX_RETRIES", "3")
+
+try:
+    EMBEDDING_MAX_RETRIES = int(EMBEDDING_MAX_RETRIES)
+except Exception:
+    EMBEDDING_MAX_RETRIES = 3
+
+# Rate limited (429) responses are waited out without using up the retries
+# above, up to this many times per batch
+EMBEDDING_MAX_RATE_LIMIT_RETRIES = os.environ.get(
+    "EMBEDDING_MAX_RATE_LIMIT_RETRIES", "20"
+)
+
+try:
+    EMBEDDING_MAX_RATE_LIMIT_RETRIES = int(EMBEDDING_MAX_RATE_LIMIT_RETRIES)
+except Exception:
+    EMBEDDING_MAX_RATE_LIMIT_RETRIES = 20
+
+# Default number of texts per embedding batch
+EMBEDDING_BATCH_SIZE = os.environ.get("EMBEDDING_BATCH_SIZE", "100")
+
+try:
+    EMBEDDING_BATCH_SIZE = int(EMBEDDING_BATCH_SIZE)
+except Exception:
+    EMBEDDING_BATCH_SIZE = 100
+
+# Number of batches sent to an embedding endpoint at the same time
+EMBEDDING_MAX_CONCURRENT_REQUESTS = os.environ.get(
+    "EMBEDDING_MAX_CONCURRENT_REQUESTS", "4"
+)
+
+try:
+    EMBEDDING_MAX_CONCURRENT_REQUESTS = int(EMBEDDING_MAX_CONCURRENT_REQUESTS)
+except Exception:
+    EMBEDDING_MAX_CONCURRENT_REQUESTS = 4
+
+# Upper bound on the (estimated) input tokens of a single batch
+EMBEDDING_BATCH_MAX_TOKENS = os.environ.get("EMBEDDING_BATCH_MAX_TOKENS", "100000")
+
+try:
+    EMBEDDING_BATCH_MAX_TOKENS = int(EMBEDDING_BATCH_MAX_TOKENS)
+except Exception:
+    EMBEDDING_BATCH_MAX_TOKENS = 100000
+
+# Client side rate limits per endpoint, 0 disables them
+EMBEDDING_REQUESTS_PER_MINUTE = os.environ.get("EMBEDDING_REQUESTS_PER_MINUTE", "0")
+
+try:
+    EMBEDDING_REQUESTS_PER_MINUTE = int(EMBEDDING_REQUESTS_PER_MINUTE)
+except Exception:
+    EMBEDDING_REQUESTS_PER_MINUTE = 0
+
+EMBEDDING_TOKENS_PER_MINUTE = os.environ.get("EMBEDDING_TOKENS_PER_MINUTE", "0")
+
+try:
+    EMBEDDING_TOKENS_PER_MINUTE = int(EMBEDDING_TOKENS_PER_MINUTE)
+except Exception:
+    EMBEDDING_TOKENS_PER_MINUTE = 0
+
+####################################
+# FILE INGESTION
+####################################
+
+# Files extracted and embedded in parallel by the background ingestion queue
+INGESTION_WORKERS = os.environ.get("INGESTION_WORKERS", "4")
+
+try:
+    INGESTION_WORKERS = max(1, int(INGESTION_WORKERS))
+except Exception:
+    INGESTION_WORKERS = 4
+
+# Seconds without a heartbeat after which a file claimed by a worker that died
+# is picked up again
+INGESTION_TASK_TIMEOUT = os.environ.get("INGESTION_TASK_TIMEOUT", "900")
+
+try:
+    INGESTION_TASK_TIMEOUT = float(INGESTION_TASK_TIMEOUT)
+except Exception:
+    INGESTION_TASK_TIMEOUT = 900.0
+
+# Files whose processing was interrupted this many times (e.g. because they
+# crash the worker) are marked as failed instead of being picked up again
+INGESTION_TASK_MAX_ATTEMPTS = os.environ.get("INGESTION_TASK_MAX_ATTEMPTS", "3")
+
+try:
+    INGESTION_TASK_MAX_ATTEMPTS = max(1, int(INGESTION_TASK_MAX_ATTEMPTS))
+except Exception:
+    INGESTION_TASK_MAX_ATTEMPTS = 3
+
+INGESTION_POLL_INTERVAL = os.environ.get("INGESTION_POLL_INTERVAL", "5")
+
+try:
+    INGESTION_POLL_INTERVAL = float(INGESTION_POLL_INTERVAL)
+except Exception:
+    INGESTION_POLL_INTERVAL = 5.0
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -502,6 +783,42 @@ else:
     except Exception:
         SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS = None
 
+# Concurrent calls of the local embedding and reranking models are merged into
+# batches of up to SENTENCE_TRANSFORMERS_BATCH_MAX_SIZE inputs, waiting at most
+# SENTENCE_TRANSFORMERS_BATCH_MAX_WAIT_MS for other callers
+ENABLE_SENTENCE_TRANSFORMERS_BATCHING = (
+    os.environ.get("ENABLE_SENTENCE_TRANSFORMERS_BATCHING", "True").lower() == "true"
+)
+
+try:
+    SENTENCE_TRANSFORMERS_BATCH_MAX_SIZE = max(
+        1, int(os.environ.get("SENTENCE_TRANSFORMERS_BATCH_MAX_SIZE", "64"))
+    )
+except Exception:
+    SENTENCE_TRANSFORMERS_BATCH_MAX_SIZE = 64
+
+try:
+    SENTENCE_TRANSFORMERS_BATCH_MAX_WAIT_MS = float(
+        os.environ.get("SENTENCE_TRANSFORMERS_BATCH_MAX_WAIT_MS", "5")
+    )
+except Exception:
+    SENTENCE_TRANSFORMERS_BATCH_MAX_WAIT_MS = 5.0
+
+# Opt-in: int8 ONNX exports of the local models, made with POST
+# /api/v1/retrieval/models/optimize, are loaded instead of the original models
+# on CPU. Their vectors differ slightly from the original model's, files are
+# re-embedded when reindexed. SENTENCE_TRANSFORMERS_ONNX_QUANTIZATION is the
+# default target: "arm64", "avx2", "avx512" or "avx512_vnni"; it is detected
+# from the CPU when not set
+ENABLE_SENTENCE_TRANSFORMERS_OPTIMIZED_MODELS = (
+    os.environ.get("ENABLE_SENTENCE_TRANSFORMERS_OPTIMIZED_MODELS", "False").lower()
+    == "true"
+)
+
+SENTENCE_TRANSFORMERS_ONNX_QUANTIZATION = os.environ.get(
+    "SENTENCE_TRANSFORMERS_ONNX_QUANTIZATION", ""
+)
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -181,6 +181,7 @@ from open_webui.config import (
     AUDIO_TTS_AZURE_SPEECH_REGION,
     AUDIO_TTS_AZURE_SPEECH_BASE_URL,
     AUDIO_TTS_AZURE_SPEECH_OUTPUT_FORMAT,
+    AUDIO_TTS_CACHE_EVICTION_INTERVAL,
     PLAYWRIGHT_WS_URL,
     PLAYWRIGHT_TIMEOUT,
     FIRECRAWL_API_BASE_URL,
@@ -438,8 +439,12 @@ from open_webui.utils.chat import (
     chat_action as chat_action_handler,
 )
 from open_webui.utils.embeddings import generate_embeddings
+from open_webui.utils.http_client import start_http_clients, stop_http_clients
+from open_webui.utils.ingestion import INGESTION_QUEUE
+from open_webui.utils.tools import refresh_tool_servers
+from open_webui.utils.speech_cache import SPEECH_CACHE
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import has_access_batch
 
 from open_webui.utils.auth import (
     get_license_data,
@@ -546,11 +551,34 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    # Pooled upstream HTTP clients shared by the OpenAI/Ollama proxies
+    app.state.http_clients = start_http_clients()
+
+    # Background file ingestion, resumes jobs left unfinished by a restart
+    INGESTION_QUEUE.start(app)
+
+    # Tool server specs are revalidated in the background
+    app.state.tool_servers_refresher = asyncio.create_task(refresh_tool_servers(app))
+
+    # Keeps the speech cache within its size and TTL
+    app.state.speech_cache_evictor = asyncio.create_task(
+        SPEECH_CACHE.run_eviction(AUDIO_TTS_CACHE_EVICTION_INTERVAL)
+    )
+
     yield
 
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    app.state.tool_servers_refresher.cancel()
+    app.state.speech_cache_evictor.cancel()
+
+    await stop_http_clients()
+    await INGESTION_QUEUE.stop()
+
+    # Write the last_active_at updates still waiting for the next flush
+    Users.last_active.flush()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -1225,27 +1253,40 @@ if audit_level != AuditLevel.NONE:
 @app.get("/api/models")
 async def get_models(request: Request, user=Depends(get_verified_user)):
     def get_filtered_models(models, user):
-        filtered_models = []
+        model_infos = {
+            model_info.id: model_info
+            for model_info in Models.get_models_by_ids(
+                [model["id"] for model in models if not model.get("arena")]
+            )
+        }
+
+        # (model, owned by the user, access control) for every candidate
+        candidates = []
         for model in models:
             if model.get("arena"):
-                if has_access(
-                    user.id,
-                    type="read",
-                    access_control=model.get("info", {})
-                    .get("meta", {})
-                    .get("access_control", {}),
-                ):
-                    filtered_models.append(model)
+                candidates.append(
+                    (
+                        model,
+                        False,
+                        model.get("info", {}).get("meta", {}).get("access_control", {}),
+                    )
+                )
                 continue
 
-            model_info = Models.get_model_by_id(model["id"])
+            model_info = model_infos.get(model["id"])
             if model_info:
-                if user.id == model_info.user_id or has_access(
-                    user.id, type="read", access_control=model_info.access_control
-                ):
-                    filtered_models.append(model)
+                candidates.append(
+                    (model, user.id == model_info.user_id, model_info.access_control)
+                )
 
-        return filtered_models
+        access = has_access_batch(
+            user.id, "read", [access_control for _, _, access_control in candidates]
+        )
+        return [
+            model
+            for (model, owned, _), allowed in zip(candidates, access)
+            if owned or allowed
+        ]
 
     all_models = await get_all_models(request, user=user)
 
@@ -1911,7 +1952,10 @@ async def get_current_usage(user=Depends(get_verified_user)):
     This is an experimental endpoint and subject to change.
     """
     try:
-        return {"model_ids": get_models_in_use(), "user_ids": get_active_user_ids()}
+        return {
+            "model_ids": await get_models_in_use(),
+            "user_ids": await get_active_user_ids(),
+        }
     except Exception as e:
         log.error(f"Error getting usage statistics: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
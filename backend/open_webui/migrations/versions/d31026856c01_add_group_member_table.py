@@ -0,0 +1,72 @@
+"""Add group_member table
+
+Revision ID: d31026856c01
+Revises: 9f0c9cd09105
+Create Date: 2025-06-02 03:00:00.000000
+
+"""
+
+import json
+import time
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, select
+
+revision = "d31026856c01"
+down_revision = "9f0c9cd09105"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "group_member",
+        sa.Column("group_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("group_id", "user_id", name="pk_group_id_user_id"),
+    )
+    op.create_index("group_member_user_id_idx", "group_member", ["user_id"])
+
+    # Backfill memberships from the JSON 'user_ids' column of 'group'
+    group_table = table(
+        "group",
+        sa.Column("id", sa.Text()),
+        sa.Column("user_ids", sa.JSON()),
+    )
+    group_member_table = table(
+        "group_member",
+        sa.Column("group_id", sa.Text()),
+        sa.Column("user_id", sa.Text()),
+        sa.Column("created_at", sa.BigInteger()),
+    )
+
+    conn = op.get_bind()
+    now = int(time.time())
+    rows = []
+    for group_id, user_ids in conn.execute(
+        select(group_table.c.id, group_table.c.user_ids)
+    ):
+        if isinstance(user_ids, str):
+            try:
+                user_ids = json.loads(user_ids)
+            except json.JSONDecodeError:
+                user_ids = None
+
+        if not isinstance(user_ids, list):
+            continue
+
+        for user_id in dict.fromkeys(user_ids):
+            if isinstance(user_id, str) and user_id:
+                rows.append(
+                    {"group_id": group_id, "user_id": user_id, "created_at": now}
+                )
+
+    if rows:
+        op.bulk_insert(group_member_table, rows)
+
+
+def downgrade():
+    op.drop_index("group_member_user_id_idx", table_name="group_member")
+    op.drop_table("group_member")
@@ -0,0 +1,171 @@
+"""Add chat search index
+
+Revision ID: e8a2f6c1b7d4
+Revises: d31026856c01
+Create Date: 2025-06-09 03:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e8a2f6c1b7d4"
+down_revision = "d31026856c01"
+branch_labels = None
+depends_on = None
+
+
+# Text of all messages of a chat, tolerating malformed chat JSON
+SQLITE_CHAT_CONTENT = """
+    CASE WHEN json_valid({chat}) THEN (
+        SELECT group_concat(json_extract(message.value, '$.content'), ' ')
+        FROM json_each({chat}, '$.messages') AS message
+        WHERE message.type = 'object'
+    ) END
+"""
+
+SQLITE_UPGRADE = [
+    # FTS5 rowids are mapped to chat ids here, as the implicit rowid of the
+    # chat table is not stable across VACUUM
+    """
+    CREATE TABLE chat_search (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        chat_id TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE chat_fts USING fts5(
+        title, content, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER chat_search_insert AFTER INSERT ON chat BEGIN
+        INSERT OR IGNORE INTO chat_search (chat_id) VALUES (new.id);
+        INSERT INTO chat_fts (rowid, title, content) VALUES (
+            (SELECT id FROM chat_search WHERE chat_id = new.id),
+            new.title,
+            {SQLITE_CHAT_CONTENT.format(chat="new.chat")}
+        );
+    END
+    """,
+    f"""
+    CREATE TRIGGER chat_search_update AFTER UPDATE OF title, chat ON chat BEGIN
+        DELETE FROM chat_fts
+        WHERE rowid = (SELECT id FROM chat_search WHERE chat_id = old.id);
+        INSERT OR IGNORE INTO chat_search (chat_id) VALUES (new.id);
+        INSERT INTO chat_fts (rowid, title, content) VALUES (
+            (SELECT id FROM chat_search WHERE chat_id = new.id),
+            new.title,
+            {SQLITE_CHAT_CONTENT.format(chat="new.chat")}
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER chat_search_delete AFTER DELETE ON chat BEGIN
+        DELETE FROM chat_fts
+        WHERE rowid = (SELECT id FROM chat_search WHERE chat_id = old.id);
+        DELETE FROM chat_search WHERE chat_id = old.id;
+    END
+    """,
+    "INSERT INTO chat_search (chat_id) SELECT id FROM chat",
+    f"""
+    INSERT INTO chat_fts (rowid, title, content)
+    SELECT chat_search.id, chat.title, {SQLITE_CHAT_CONTENT.format(chat="chat.chat")}
+    FROM chat JOIN chat_search ON chat_search.chat_id = chat.id
+    """,
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS chat_search_delete",
+    "DROP TRIGGER IF EXISTS chat_search_update",
+    "DROP TRIGGER IF EXISTS chat_search_insert",
+    "DROP TABLE IF EXISTS chat_fts",
+    "DROP TABLE IF EXISTS chat_search",
+]
+
+POSTGRESQL_UPGRADE = [
+    """
+    CREATE TABLE chat_search (
+        chat_id TEXT PRIMARY KEY REFERENCES chat (id) ON DELETE CASCADE,
+        document TSVECTOR NOT NULL
+    )
+    """,
+    "CREATE INDEX chat_search_document_idx ON chat_search USING GIN (document)",
+    """
+    CREATE FUNCTION chat_search_document(title TEXT, chat JSON) RETURNS TSVECTOR AS $$
+        SELECT setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce((
+                SELECT string_agg(message->>'content', ' ')
+                FROM json_array_elements(
+                    CASE WHEN json_typeof(chat->'messages') = 'array'
+                        THEN chat->'messages' ELSE '[]'::json END
+                ) AS message
+                WHERE json_typeof(message) = 'object'
+            ), '')), 'B')
+    $$ LANGUAGE SQL IMMUTABLE
+    """,
+    """
+    CREATE FUNCTION chat_search_update() RETURNS TRIGGER AS $$
+    BEGIN
+        INSERT INTO chat_search (chat_id, document)
+        VALUES (NEW.id, chat_search_document(NEW.title, NEW.chat))
+        ON CONFLICT (chat_id) DO UPDATE SET document = EXCLUDED.document;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER chat_search_insert AFTER INSERT ON chat
+    FOR EACH ROW EXECUTE FUNCTION chat_search_update()
+    """,
+    """
+    CREATE TRIGGER chat_search_update AFTER UPDATE OF title, chat ON chat
+    FOR EACH ROW EXECUTE FUNCTION chat_search_update()
+    """,
+    """
+    INSERT INTO chat_search (chat_id, document)
+    SELECT id, chat_search_document(title, chat) FROM chat
+    """,
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS chat_search_update ON chat",
+    "DROP TRIGGER IF EXISTS chat_search_insert ON chat",
+    "DROP FUNCTION IF EXISTS chat_search_update()",
+    "DROP TABLE IF EXISTS chat_search",
+    "DROP FUNCTION IF EXISTS chat_search_document(TEXT, JSON)",
+]
+
+
+def upgrade():
+    conn = op.get_bind()
+    dialect_name = conn.dialect.name
+
+    if dialect_name == "sqlite":
+        if not conn.execute(
+            sa.text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        ).scalar():
+            # Chat search falls back to scanning the chat JSON
+            return
+        statements = SQLITE_UPGRADE
+    elif dialect_name == "postgresql":
+        statements = POSTGRESQL_UPGRADE
+    else:
+        return
+
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade():
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == "sqlite":
+        statements = SQLITE_DOWNGRADE
+    elif dialect_name == "postgresql":
+        statements = POSTGRESQL_DOWNGRADE
+    else:
+        return
+
+    for statement in statements:
+        op.execute(statement)
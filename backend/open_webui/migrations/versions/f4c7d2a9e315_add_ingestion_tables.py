@@ -0,0 +1,54 @@
+"""Add ingestion_job and ingestion_task tables
+
+Revision ID: f4c7d2a9e315
+Revises: e8a2f6c1b7d4
+Create Date: 2025-06-16 03:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "f4c7d2a9e315"
+down_revision = "e8a2f6c1b7d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ingestion_job",
+        sa.Column("id", sa.Text(), nullable=False, primary_key=True),
+        sa.Column("user_id", sa.Text(), nullable=True),
+        sa.Column("type", sa.Text(), nullable=True),
+        sa.Column("status", sa.Text(), nullable=True),
+        sa.Column("meta", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index("ingestion_job_user_id_idx", "ingestion_job", ["user_id"])
+
+    op.create_table(
+        "ingestion_task",
+        sa.Column("id", sa.Text(), nullable=False, primary_key=True),
+        sa.Column("job_id", sa.Text(), nullable=False),
+        sa.Column("file_id", sa.Text(), nullable=False),
+        sa.Column("collection_name", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index("ingestion_task_job_id_idx", "ingestion_task", ["job_id"])
+    op.create_index(
+        "ingestion_task_status_idx", "ingestion_task", ["status", "updated_at"]
+    )
+
+
+def downgrade():
+    op.drop_index("ingestion_task_status_idx", table_name="ingestion_task")
+    op.drop_index("ingestion_task_job_id_idx", table_name="ingestion_task")
+    op.drop_table("ingestion_task")
+    op.drop_index("ingestion_job_user_id_idx", table_name="ingestion_job")
+    op.drop_table("ingestion_job")
@@ -4,7 +4,7 @@ import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import has_access_batch
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
@@ -97,11 +97,13 @@ class ChannelTable:
         self, user_id: str, permission: str = "read"
     ) -> list[ChannelModel]:
         channels = self.get_channels()
+        access = has_access_batch(
+            user_id, permission, [channel.access_control for channel in channels]
+        )
         return [
             channel
-            for channel in channels
-            if channel.user_id == user_id
-            or has_access(user_id, permission, channel.access_control)
+            for channel, allowed in zip(channels, access)
+            if channel.user_id == user_id or allowed
         ]
 
     def get_channel_by_id(self, id: str) -> Optional[ChannelModel]:
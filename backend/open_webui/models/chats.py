@@ -1,5 +1,6 @@
 import logging
 import json
+import re
 import time
 import uuid
 from typing import Optional
@@ -10,7 +11,8 @@ from open_webui.env import SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, text, inspect
+from sqlalchemy.sql import column, table
 from sqlalchemy.sql import exists
 
 ####################
@@ -105,6 +107,10 @@ class ChatTitleIdResponse(BaseModel):
 
 
 class ChatTable:
+    def __init__(self):
+        # Whether the chat_search index exists, checked on first search
+        self.search_index = None
+
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
             id = str(uuid.uuid4())
@@ -248,6 +254,91 @@ class ChatTable:
         chat["history"] = history
         return self.update_chat_by_id(id, chat)
 
+    def update_message_by_id_and_message_id(
+        self, id: str, message_id: str, message: dict
+    ) -> bool:
+        """
+        Merge `message` into a single message of the chat history in place.
+
+        Unlike `upsert_message_to_chat_by_id_and_message_id`, the chat JSON is
+        never loaded or re-serialised in Python; the database patches the
+        message fields directly. Returns False when the update could not be
+        applied this way (unsupported dialect, unknown chat, no message
+        history object), in which case callers should fall back to the upsert.
+        """
+        # Quotes and backslashes can't be part of a quoted JSON path key
+        keys = [message_id, *message.keys()]
+        if any('"' in key or "\\" in key for key in keys):
+            return False
+
+        try:
+            with get_db() as db:
+                dialect_name = db.bind.dialect.name
+                params = {
+                    "id": id,
+                    "message_id": message_id,
+                    "updated_at": int(time.time()),
+                }
+
+                if dialect_name == "sqlite":
+                    # Paths are bound like the values, only placeholders
+                    # are part of the statement
+                    paths = []
+                    for idx, (key, value) in enumerate(message.items()):
+                        paths.append(f":path_{idx}, json(:value_{idx})")
+                        params[f"path_{idx}"] = '$.history.messages."%s"."%s"' % (
+                            message_id,
+                            key,
+                        )
+                        params[f"value_{idx}"] = json.dumps(value)
+                    paths.append("'$.history.currentId', :message_id")
+
+                    result = db.execute(
+                        text(
+                            f"""
+                            UPDATE chat
+                            SET chat = json_set(chat, {", ".join(paths)}),
+                                updated_at = :updated_at
+                            WHERE id = :id
+                              AND json_type(chat, '$.history.messages') = 'object'
+                            """
+                        ),
+                        params,
+                    )
+                elif dialect_name == "postgresql":
+                    params["message"] = json.dumps(message)
+                    result = db.execute(
+                        text(
+                            """
+                            UPDATE chat
+                            SET chat = jsonb_set(
+                                    jsonb_set(
+                                        chat::jsonb,
+                                        ARRAY['history', 'messages', :message_id],
+                                        COALESCE(
+                                            chat::jsonb #> ARRAY['history', 'messages', :message_id],
+                                            '{}'::jsonb
+                                        ) || CAST(:message AS jsonb)
+                                    ),
+                                    '{history,currentId}',
+                                    to_jsonb(CAST(:message_id AS text))
+                                )::json,
+                                updated_at = :updated_at
+                            WHERE id = :id
+                              AND jsonb_typeof(chat::jsonb #> '{history,messages}') = 'object'
+                            """
+                        ),
+                        params,
+                    )
+                else:
+                    return False
+
+                db.commit()
+                return result.rowcount > 0
+        except Exception as e:
+            log.debug(f"update_message_by_id_and_message_id failed: {e}")
+            return False
+
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
     ) -> Optional[ChatModel]:
@@ -569,6 +660,173 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def _filter_by_tag_ids(self, query, dialect_name: str, tag_ids: list[str]):
+        # Check if there are any tags to filter, it should have all the tags
+        if dialect_name == "sqlite":
+            if "none" in tag_ids:
+                query = query.filter(
+                    text(
+                        """
+                        NOT EXISTS (
+                            SELECT 1
+                            FROM json_each(Chat.meta, '$.tags') AS tag
+                        )
+                        """
+                    )
+                )
+            elif tag_ids:
+                query = query.filter(
+                    and_(
+                        *[
+                            text(
+                                f"""
+                                EXISTS (
+                                    SELECT 1
+                                    FROM json_each(Chat.meta, '$.tags') AS tag
+                                    WHERE tag.value = :tag_id_{tag_idx}
+                                )
+                                """
+                            ).params(**{f"tag_id_{tag_idx}": tag_id})
+                            for tag_idx, tag_id in enumerate(tag_ids)
+                        ]
+                    )
+                )
+        elif dialect_name == "postgresql":
+            if "none" in tag_ids:
+                query = query.filter(
+                    text(
+                        """
+                        NOT EXISTS (
+                            SELECT 1
+                            FROM json_array_elements_text(Chat.meta->'tags') AS tag
+                        )
+                        """
+                    )
+                )
+            elif tag_ids:
+                query = query.filter(
+                    and_(
+                        *[
+                            text(
+                                f"""
+                                EXISTS (
+                                    SELECT 1
+                                    FROM json_array_elements_text(Chat.meta->'tags') AS tag
+                                    WHERE tag = :tag_id_{tag_idx}
+                                )
+                                """
+                            ).params(**{f"tag_id_{tag_idx}": tag_id})
+                            for tag_idx, tag_id in enumerate(tag_ids)
+                        ]
+                    )
+                )
+        else:
+            raise NotImplementedError(f"Unsupported dialect: {dialect_name}")
+
+        return query
+
+    def _filter_by_search_text(self, query, dialect_name: str, search_text: str):
+        if dialect_name == "sqlite":
+            # SQLite case: using JSON1 extension for JSON searching
+            return query.filter(
+                (
+                    Chat.title.ilike(
+                        f"%{search_text}%"
+                    )  # Case-insensitive search in title
+                    | text(
+                        """
+                        EXISTS (
+                            SELECT 1 
+                            FROM json_each(Chat.chat, '$.messages') AS message 
+                            WHERE LOWER(message.value->>'content') LIKE '%' || :search_text || '%'
+                        )
+                        """
+                    )
+                ).params(search_text=search_text)
+            )
+        elif dialect_name == "postgresql":
+            # PostgreSQL relies on proper JSON query for search
+            return query.filter(
+                (
+                    Chat.title.ilike(
+                        f"%{search_text}%"
+                    )  # Case-insensitive search in title
+                    | text(
+                        """
+                        EXISTS (
+                            SELECT 1
+                            FROM json_array_elements(Chat.chat->'messages') AS message
+                            WHERE LOWER(message->>'content') LIKE '%' || :search_text || '%'
+                        )
+                        """
+                    )
+                ).params(search_text=search_text)
+            )
+        else:
+            raise NotImplementedError(f"Unsupported dialect: {dialect_name}")
+
+    def _filter_by_search_index(self, query, dialect_name: str, words: list[str]):
+        """
+        Match every word as a prefix against the full-text index kept by the
+        `chat_search` triggers. Returns the query and an ORDER BY clause that
+        ranks title matches above message matches.
+        """
+        if dialect_name == "sqlite":
+            chat_search = table("chat_search", column("id"), column("chat_id"))
+            chat_fts = table("chat_fts", column("rowid"))
+            query = (
+                query.join(chat_search, chat_search.c.chat_id == Chat.id)
+                .join(chat_fts, chat_fts.c.rowid == chat_search.c.id)
+                .filter(text("chat_fts MATCH :search_query"))
+                .params(search_query=" ".join(f'"{word}"*' for word in words))
+            )
+            return query, text("bm25(chat_fts, 10.0, 1.0)")
+
+        chat_search = table("chat_search", column("chat_id"), column("document"))
+        query = (
+            query.join(chat_search, chat_search.c.chat_id == Chat.id)
+            .filter(text("chat_search.document @@ to_tsquery('simple', :search_query)"))
+            .params(search_query=" & ".join(f"'{word}':*" for word in words))
+        )
+        return query, text(
+            "ts_rank(chat_search.document, to_tsquery('simple', :search_query)) DESC"
+        )
+
+    def has_search_index(self) -> bool:
+        if self.search_index is None:
+            with get_db() as db:
+                self.search_index = db.bind.dialect.name in (
+                    "sqlite",
+                    "postgresql",
+                ) and inspect(db.bind).has_table("chat_search")
+        return self.search_index
+
+    def rebuild_search_index(self) -> int:
+        """Re-index every chat, e.g. after restoring a database dump."""
+        with get_db() as db:
+            dialect_name = db.bind.dialect.name
+            if dialect_name == "sqlite":
+                db.execute(text("DELETE FROM chat_fts"))
+                db.execute(text("DELETE FROM chat_search"))
+                # Re-fires the chat_search_update trigger for every chat
+                result = db.execute(text("UPDATE chat SET title = title"))
+                db.execute(text("INSERT INTO chat_fts (chat_fts) VALUES ('optimize')"))
+            elif dialect_name == "postgresql":
+                db.execute(text("DELETE FROM chat_search"))
+                result = db.execute(
+                    text(
+                        """
+                        INSERT INTO chat_search (chat_id, document)
+                        SELECT id, chat_search_document(title, chat) FROM chat
+                        """
+                    )
+                )
+            else:
+                raise NotImplementedError(f"Unsupported dialect: {dialect_name}")
+
+            db.commit()
+            return result.rowcount
+
     def get_chats_by_user_id_and_search_text(
         self,
         user_id: str,
@@ -576,9 +834,15 @@ class ChatTable:
         include_archived: bool = False,
         skip: int = 0,
         limit: int = 60,
+        order_by: str = "updated_at",
     ) -> list[ChatModel]:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Search the chats of a user by title and message content, allowing
+        pagination using skip and limit. `tag:<name>` words filter by tag.
+
+        Words are matched as prefixes against the chat search index. Without
+        the index (or for input without any word characters) the chat JSON is
+        scanned instead. `order_by` is either "updated_at" or "rank".
         """
         search_text = search_text.lower().strip()
 
@@ -601,118 +865,30 @@ class ChatTable:
         ]
 
         search_text = " ".join(search_text_words)
+        words = re.findall(r"\w+", search_text)
+        use_search_index = bool(words) and self.has_search_index()
 
         with get_db() as db:
+            dialect_name = db.bind.dialect.name
             query = db.query(Chat).filter(Chat.user_id == user_id)
 
             if not include_archived:
                 query = query.filter(Chat.archived == False)
 
-            query = query.order_by(Chat.updated_at.desc())
-
-            # Check if the database dialect is either 'sqlite' or 'postgresql'
-            dialect_name = db.bind.dialect.name
-            if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                query = query.filter(
-                    (
-                        Chat.title.ilike(
-                            f"%{search_text}%"
-                        )  # Case-insensitive search in title
-                        | text(
-                            """
-                            EXISTS (
-                                SELECT 1 
-                                FROM json_each(Chat.chat, '$.messages') AS message 
-                                WHERE LOWER(message.value->>'content') LIKE '%' || :search_text || '%'
-                            )
-                            """
-                        )
-                    ).params(search_text=search_text)
-                )
-
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
-                        text(
-                            """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_each(Chat.meta, '$.tags') AS tag
-                            )
-                            """
-                        )
-                    )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_each(Chat.meta, '$.tags') AS tag
-                                        WHERE tag.value = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
-                        )
+            if use_search_index:
+                query, rank = self._filter_by_search_index(query, dialect_name, words)
+                if order_by == "rank":
+                    query = query.order_by(rank, Chat.updated_at.desc())
+                else:
+                    query = query.order_by(Chat.updated_at.desc())
+            else:
+                query = query.order_by(Chat.updated_at.desc())
+                if search_text:
+                    query = self._filter_by_search_text(
+                        query, dialect_name, search_text
                     )
 
-            elif dialect_name == "postgresql":
-                # PostgreSQL relies on proper JSON query for search
-                query = query.filter(
-                    (
-                        Chat.title.ilike(
-                            f"%{search_text}%"
-                        )  # Case-insensitive search in title
-                        | text(
-                            """
-                            EXISTS (
-                                SELECT 1
-                                FROM json_array_elements(Chat.chat->'messages') AS message
-                                WHERE LOWER(message->>'content') LIKE '%' || :search_text || '%'
-                            )
-                            """
-                        )
-                    ).params(search_text=search_text)
-                )
-
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
-                        text(
-                            """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                            )
-                            """
-                        )
-                    )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                                        WHERE tag = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
-                        )
-                    )
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
-                )
+            query = self._filter_by_tag_ids(query, dialect_name, tag_ids)
 
             # Perform pagination at the SQL level
             all_chats = query.offset(skip).limit(limit).all()
@@ -171,6 +171,20 @@ class FilesTable:
                 log.exception(f"Error retrieving all files: {e}")
                 return []
 
+    def get_recent_file_ids(self, limit: int) -> list[str]:
+        with get_db() as db:
+            try:
+                return [
+                    id
+                    for (id,) in db.query(File.id)
+                    .order_by(File.updated_at.desc())
+                    .limit(limit)
+                    .all()
+                ]
+            except Exception as e:
+                log.exception(f"Error retrieving recent file ids: {e}")
+                return []
+
     def get_files_by_ids(self, ids: list[str]) -> list[FileModel]:
         log.debug(f"Retrieving files by ids: {ids}")
         with get_db() as db:
@@ -6,7 +6,7 @@ from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, func
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -116,41 +116,41 @@ class FunctionsTable:
             with get_db() as db:
                 # Get existing functions
                 existing_functions = db.query(Function).all()
-                existing_ids = {func.id for func in existing_functions}
+                existing_ids = {function.id for function in existing_functions}
 
                 # Prepare a set of new function IDs
-                new_function_ids = {func.id for func in functions}
+                new_function_ids = {function.id for function in functions}
 
                 # Update or insert functions
-                for func in functions:
-                    if func.id in existing_ids:
-                        db.query(Function).filter_by(id=func.id).update(
+                for function in functions:
+                    if function.id in existing_ids:
+                        db.query(Function).filter_by(id=function.id).update(
                             {
-                                **func.model_dump(),
+                                **function.model_dump(),
                                 "user_id": user_id,
                                 "updated_at": int(time.time()),
                             }
                         )
                     else:
-                        new_func = Function(
+                        new_function = Function(
                             **{
-                                **func.model_dump(),
+                                **function.model_dump(),
                                 "user_id": user_id,
                                 "updated_at": int(time.time()),
                             }
                         )
-                        db.add(new_func)
+                        db.add(new_function)
 
                 # Remove functions that are no longer present
-                for func in existing_functions:
-                    if func.id not in new_function_ids:
-                        db.delete(func)
+                for function in existing_functions:
+                    if function.id not in new_function_ids:
+                        db.delete(function)
 
                 db.commit()
 
                 return [
-                    FunctionModel.model_validate(func)
-                    for func in db.query(Function).all()
+                    FunctionModel.model_validate(function)
+                    for function in db.query(Function).all()
                 ]
         except Exception as e:
             log.exception(f"Error syncing functions for user {user_id}: {e}")
@@ -194,6 +194,23 @@ class FunctionsTable:
                     for function in db.query(Function).filter_by(type=type).all()
                 ]
 
+    def get_functions_by_types(
+        self, types: list[str], active_only=False
+    ) -> list[FunctionModel]:
+        with get_db() as db:
+            query = db.query(Function).filter(Function.type.in_(types))
+            if active_only:
+                query = query.filter_by(is_active=True)
+            return [FunctionModel.model_validate(function) for function in query.all()]
+
+    def get_version_stamp(self) -> tuple[int, int]:
+        """Return the number of functions and their latest `updated_at`."""
+        with get_db() as db:
+            count, updated_at = db.query(
+                func.count(Function.id), func.max(Function.updated_at)
+            ).one()
+            return count, updated_at or 0
+
     def get_global_filter_functions(self) -> list[FunctionModel]:
         with get_db() as db:
             return [
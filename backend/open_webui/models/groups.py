@@ -1,17 +1,25 @@
 import json
 import logging
+import threading
 import time
 from typing import Optional
 import uuid
 
 from open_webui.internal.db import Base, get_db
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    GROUP_MEMBERSHIP_CACHE_TTL,
+    REDIS_URL,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+)
+from open_webui.utils.redis import RedisPubSubListener, get_sentinels_from_env
 
 from open_webui.models.files import FileMetadataResponse
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON, func
+from sqlalchemy import BigInteger, Column, Index, Text, JSON, PrimaryKeyConstraint
 
 
 log = logging.getLogger(__name__)
@@ -41,6 +49,19 @@ class Group(Base):
     updated_at = Column(BigInteger)
 
 
+class GroupMember(Base):
+    __tablename__ = "group_member"
+
+    group_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+    created_at = Column(BigInteger)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("group_id", "user_id", name="pk_group_id_user_id"),
+        Index("group_member_user_id_idx", "user_id"),
+    )
+
+
 class GroupModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: str
@@ -87,7 +108,167 @@ class GroupUpdateForm(GroupForm):
     user_ids: Optional[list[str]] = None
 
 
+class GroupMembershipCache:
+    """
+    Process-local index of group memberships, user id -> [(group id,
+    permissions)], built from a single join of the group and membership
+    tables.
+
+    The index is dropped whenever a group changes, locally through the
+    `GroupTable` write methods and on other workers through a Redis pub/sub
+    message. It also expires after `ttl` seconds. If Redis is configured but
+    the subscription is down, the cache is bypassed.
+    """
+
+    CHANNEL = "open-webui:groups:invalidate"
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = 0
+        self._index = None
+        self._loaded_at = 0.0
+
+        self.listener = None
+        if ttl > 0 and REDIS_URL:
+            try:
+                self.listener = RedisPubSubListener(
+                    REDIS_URL,
+                    get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+                    self.CHANNEL,
+                    callback=lambda _: self.invalidate(publish=False),
+                    on_reset=lambda: self.invalidate(publish=False),
+                )
+            except Exception as e:
+                log.warning(f"Group membership invalidation unavailable: {e}")
+                self.ttl = 0
+
+    def enabled(self) -> bool:
+        if self.ttl <= 0:
+            return False
+        if self.listener is not None:
+            return self.listener.start().connected
+        return True
+
+    def invalidate(self, publish: bool = True):
+        with self._lock:
+            self._version += 1
+            self._index = None
+
+        if publish and self.listener is not None:
+            self.listener.publish(str(time.time()))
+
+    def get(self, load) -> dict[str, list[tuple[str, dict]]]:
+        with self._lock:
+            if (
+                self._index is not None
+                and time.monotonic() - self._loaded_at < self.ttl
+            ):
+                return self._index
+            version = self._version
+
+        index = load()
+
+        with self._lock:
+            # Only keep the index if no group changed while it was built
+            if version == self._version:
+                self._index = index
+                self._loaded_at = time.monotonic()
+        return index
+
+
 class GroupTable:
+    def __init__(self):
+        self.cache = GroupMembershipCache(GROUP_MEMBERSHIP_CACHE_TTL)
+
+    def _get_user_ids_by_group_ids(self, db, group_ids: list[str]) -> dict:
+        user_ids = {group_id: [] for group_id in group_ids}
+        if group_ids:
+            for group_id, user_id in (
+                db.query(GroupMember.group_id, GroupMember.user_id)
+                .filter(GroupMember.group_id.in_(group_ids))
+                .order_by(GroupMember.created_at)
+                .all()
+            ):
+                user_ids[group_id].append(user_id)
+        return user_ids
+
+    def _to_group_models(self, db, groups: list[Group]) -> list[GroupModel]:
+        user_ids = self._get_user_ids_by_group_ids(db, [group.id for group in groups])
+        return [
+            GroupModel.model_validate(group).model_copy(
+                update={"user_ids": user_ids[group.id]}
+            )
+            for group in groups
+        ]
+
+    def _set_group_members(self, db, group_id: str, user_ids: list[str]):
+        """Replace the members of a group, touching only the rows that change."""
+        user_ids = list(dict.fromkeys(user_ids))
+        db.flush()
+        current_user_ids = {
+            user_id
+            for (user_id,) in db.query(GroupMember.user_id).filter_by(group_id=group_id)
+        }
+
+        removed_user_ids = current_user_ids - set(user_ids)
+        if removed_user_ids:
+            db.query(GroupMember).filter(
+                GroupMember.group_id == group_id,
+                GroupMember.user_id.in_(removed_user_ids),
+            ).delete(synchronize_session=False)
+
+        now = int(time.time())
+        db.add_all(
+            [
+                GroupMember(group_id=group_id, user_id=user_id, created_at=now)
+                for user_id in user_ids
+                if user_id not in current_user_ids
+            ]
+        )
+
+        # The legacy JSON column is kept in sync for downgrades
+        db.query(Group).filter_by(id=group_id).update({"user_ids": user_ids})
+
+    def _touch_groups(self, db, group_ids: set[str]):
+        """Refresh the legacy user_ids column and updated_at of changed groups."""
+        db.flush()
+        user_ids = self._get_user_ids_by_group_ids(db, list(group_ids))
+        for group_id in group_ids:
+            db.query(Group).filter_by(id=group_id).update(
+                {"user_ids": user_ids[group_id], "updated_at": int(time.time())}
+            )
+
+    def _load_membership_index(self) -> dict[str, list[tuple[str, dict]]]:
+        index = {}
+        with get_db() as db:
+            for user_id, group_id, permissions in (
+                db.query(GroupMember.user_id, Group.id, Group.permissions)
+                .join(Group, Group.id == GroupMember.group_id)
+                .order_by(Group.updated_at.desc())
+                .all()
+            ):
+                index.setdefault(user_id, []).append((group_id, permissions or {}))
+        return index
+
+    def get_memberships_by_member_id(self, user_id: str) -> list[tuple[str, dict]]:
+        """(group id, permissions) of every group the user is a member of."""
+        if self.cache.enabled():
+            return self.cache.get(self._load_membership_index).get(user_id, [])
+
+        with get_db() as db:
+            return [
+                (group_id, permissions or {})
+                for group_id, permissions in db.query(Group.id, Group.permissions)
+                .join(GroupMember, GroupMember.group_id == Group.id)
+                .filter(GroupMember.user_id == user_id)
+                .order_by(Group.updated_at.desc())
+                .all()
+            ]
+
+    def get_group_ids_by_member_id(self, user_id: str) -> set[str]:
+        return {group_id for group_id, _ in self.get_memberships_by_member_id(user_id)}
+
     def insert_new_group(
         self, user_id: str, form_data: GroupForm
     ) -> Optional[GroupModel]:
@@ -105,10 +286,12 @@ class GroupTable:
             try:
                 result = Group(**group.model_dump())
                 db.add(result)
+                self._set_group_members(db, group.id, group.user_ids)
                 db.commit()
                 db.refresh(result)
+                self.cache.invalidate()
                 if result:
-                    return GroupModel.model_validate(result)
+                    return self._to_group_models(db, [result])[0]
                 else:
                     return None
 
@@ -117,53 +300,65 @@ class GroupTable:
 
     def get_groups(self) -> list[GroupModel]:
         with get_db() as db:
-            return [
-                GroupModel.model_validate(group)
-                for group in db.query(Group).order_by(Group.updated_at.desc()).all()
-            ]
+            return self._to_group_models(
+                db, db.query(Group).order_by(Group.updated_at.desc()).all()
+            )
 
     def get_groups_by_member_id(self, user_id: str) -> list[GroupModel]:
         with get_db() as db:
-            return [
-                GroupModel.model_validate(group)
-                for group in db.query(Group)
-                .filter(
-                    func.json_array_length(Group.user_ids) > 0
-                )  # Ensure array exists
-                .filter(
-                    Group.user_ids.cast(String).like(f'%"{user_id}"%')
-                )  # String-based check
+            return self._to_group_models(
+                db,
+                db.query(Group)
+                .join(GroupMember, GroupMember.group_id == Group.id)
+                .filter(GroupMember.user_id == user_id)
                 .order_by(Group.updated_at.desc())
-                .all()
-            ]
+                .all(),
+            )
 
     def get_group_by_id(self, id: str) -> Optional[GroupModel]:
         try:
             with get_db() as db:
                 group = db.query(Group).filter_by(id=id).first()
-                return GroupModel.model_validate(group) if group else None
+                return self._to_group_models(db, [group])[0] if group else None
         except Exception:
             return None
 
-    def get_group_user_ids_by_id(self, id: str) -> Optional[str]:
-        group = self.get_group_by_id(id)
-        if group:
-            return group.user_ids
-        else:
-            return None
+    def get_group_user_ids_by_id(self, id: str) -> Optional[list[str]]:
+        with get_db() as db:
+            if not db.query(Group.id).filter_by(id=id).first():
+                return None
+            return self._get_user_ids_by_group_ids(db, [id])[id]
+
+    def get_user_ids_by_group_ids(self, group_ids: list[str]) -> set[str]:
+        if not group_ids:
+            return set()
+
+        with get_db() as db:
+            return {
+                user_id
+                for (user_id,) in db.query(GroupMember.user_id)
+                .filter(GroupMember.group_id.in_(group_ids))
+                .distinct()
+            }
 
     def update_group_by_id(
         self, id: str, form_data: GroupUpdateForm, overwrite: bool = False
     ) -> Optional[GroupModel]:
         try:
             with get_db() as db:
+                data = form_data.model_dump(exclude_none=True)
+                user_ids = data.pop("user_ids", None)
+
                 db.query(Group).filter_by(id=id).update(
                     {
-                        **form_data.model_dump(exclude_none=True),
+                        **data,
                         "updated_at": int(time.time()),
                     }
                 )
+                if user_ids is not None:
+                    self._set_group_members(db, id, user_ids)
                 db.commit()
+                self.cache.invalidate()
                 return self.get_group_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -172,8 +367,10 @@ class GroupTable:
     def delete_group_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                db.query(GroupMember).filter_by(group_id=id).delete()
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                self.cache.invalidate()
                 return True
         except Exception:
             return False
@@ -181,8 +378,10 @@ class GroupTable:
     def delete_all_groups(self) -> bool:
         with get_db() as db:
             try:
+                db.query(GroupMember).delete()
                 db.query(Group).delete()
                 db.commit()
+                self.cache.invalidate()
 
                 return True
             except Exception:
@@ -191,18 +390,17 @@ class GroupTable:
     def remove_user_from_all_groups(self, user_id: str) -> bool:
         with get_db() as db:
             try:
-                groups = self.get_groups_by_member_id(user_id)
-
-                for group in groups:
-                    group.user_ids.remove(user_id)
-                    db.query(Group).filter_by(id=group.id).update(
-                        {
-                            "user_ids": group.user_ids,
-                            "updated_at": int(time.time()),
-                        }
+                group_ids = {
+                    group_id
+                    for (group_id,) in db.query(GroupMember.group_id).filter_by(
+                        user_id=user_id
                     )
-                    db.commit()
+                }
+                db.query(GroupMember).filter_by(user_id=user_id).delete()
+                self._touch_groups(db, group_ids)
+                db.commit()
 
+                self.cache.invalidate()
                 return True
             except Exception:
                 return False
@@ -237,39 +435,48 @@ class GroupTable:
                     except Exception as e:
                         log.exception(e)
                         continue
+
+            if new_groups:
+                self.cache.invalidate()
             return new_groups
 
     def sync_groups_by_group_names(self, user_id: str, group_names: list[str]) -> bool:
         with get_db() as db:
             try:
-                groups = db.query(Group).filter(Group.name.in_(group_names)).all()
-                group_ids = [group.id for group in groups]
+                group_ids = {
+                    group_id
+                    for (group_id,) in db.query(Group.id).filter(
+                        Group.name.in_(group_names)
+                    )
+                }
+                current_group_ids = {
+                    group_id
+                    for (group_id,) in db.query(GroupMember.group_id).filter_by(
+                        user_id=user_id
+                    )
+                }
 
                 # Remove user from groups not in the new list
-                existing_groups = self.get_groups_by_member_id(user_id)
-
-                for group in existing_groups:
-                    if group.id not in group_ids:
-                        group.user_ids.remove(user_id)
-                        db.query(Group).filter_by(id=group.id).update(
-                            {
-                                "user_ids": group.user_ids,
-                                "updated_at": int(time.time()),
-                            }
-                        )
+                removed_group_ids = current_group_ids - group_ids
+                if removed_group_ids:
+                    db.query(GroupMember).filter(
+                        GroupMember.user_id == user_id,
+                        GroupMember.group_id.in_(removed_group_ids),
+                    ).delete(synchronize_session=False)
 
                 # Add user to new groups
-                for group in groups:
-                    if user_id not in group.user_ids:
-                        group.user_ids.append(user_id)
-                        db.query(Group).filter_by(id=group.id).update(
-                            {
-                                "user_ids": group.user_ids,
-                                "updated_at": int(time.time()),
-                            }
-                        )
+                added_group_ids = group_ids - current_group_ids
+                now = int(time.time())
+                db.add_all(
+                    [
+                        GroupMember(group_id=group_id, user_id=user_id, created_at=now)
+                        for group_id in added_group_ids
+                    ]
+                )
 
+                self._touch_groups(db, removed_group_ids | added_group_ids)
                 db.commit()
+                self.cache.invalidate()
                 return True
             except Exception as e:
                 log.exception(e)
@@ -0,0 +1,334 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import SRC_LOG_LEVELS
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Index, Integer, Text, JSON, func, or_
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+####################
+# Ingestion DB Schema
+####################
+
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_job"
+
+    id = Column(Text, primary_key=True)
+    user_id = Column(Text)
+
+    type = Column(Text)  # "reindex" or "add"
+    status = Column(Text)  # "pending", "running", "completed" or "cancelled"
+    meta = Column(JSON, nullable=True)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (Index("ingestion_job_user_id_idx", "user_id"),)
+
+
+class IngestionTask(Base):
+    __tablename__ = "ingestion_task"
+
+    id = Column(Text, primary_key=True)
+    job_id = Column(Text, nullable=False)
+
+    file_id = Column(Text, nullable=False)
+    collection_name = Column(Text, nullable=False)
+
+    # "pending", "processing", "completed", "skipped", "failed" or "cancelled"
+    status = Column(Text, nullable=False)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        Index("ingestion_task_job_id_idx", "job_id"),
+        Index("ingestion_task_status_idx", "status", "updated_at"),
+    )
+
+
+class IngestionJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+
+    type: str
+    status: str
+    meta: Optional[dict] = None
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+class IngestionTaskModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    job_id: str
+
+    file_id: str
+    collection_name: str
+
+    status: str
+    error: Optional[str] = None
+    attempts: int = 0
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+####################
+# Forms
+####################
+
+
+class IngestionJobResponse(IngestionJobModel):
+    total: int = 0
+    progress: dict[str, int] = {}  # task status -> count
+    errors: list[IngestionTaskModel] = []
+
+
+class IngestionTable:
+    def insert_new_job(
+        self,
+        user_id: str,
+        type: str,
+        items: list[tuple[str, str]],
+        meta: Optional[dict] = None,
+    ) -> IngestionJobModel:
+        """Create a job with one task per (file_id, collection_name) item."""
+        now = int(time.time())
+        job = IngestionJobModel(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            type=type,
+            status="pending" if items else "completed",
+            meta=meta or {},
+            created_at=now,
+            updated_at=now,
+        )
+
+        with get_db() as db:
+            db.add(IngestionJob(**job.model_dump()))
+            db.bulk_insert_mappings(
+                IngestionTask,
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "job_id": job.id,
+                        "file_id": file_id,
+                        "collection_name": collection_name,
+                        "status": "pending",
+                        "attempts": 0,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for file_id, collection_name in dict.fromkeys(items)
+                ],
+            )
+            db.commit()
+        return job
+
+    def get_job_by_id(self, id: str) -> Optional[IngestionJobModel]:
+        with get_db() as db:
+            job = db.get(IngestionJob, id)
+            return IngestionJobModel.model_validate(job) if job else None
+
+    def get_jobs_by_user_id(
+        self, user_id: str, limit: int = 20
+    ) -> list[IngestionJobModel]:
+        with get_db() as db:
+            return [
+                IngestionJobModel.model_validate(job)
+                for job in db.query(IngestionJob)
+                .filter_by(user_id=user_id)
+                .order_by(IngestionJob.created_at.desc())
+                .limit(limit)
+                .all()
+            ]
+
+    def get_unfinished_jobs(self) -> list[IngestionJobModel]:
+        with get_db() as db:
+            return [
+                IngestionJobModel.model_validate(job)
+                for job in db.query(IngestionJob)
+                .filter(IngestionJob.status.in_(["pending", "running"]))
+                .order_by(IngestionJob.created_at)
+                .all()
+            ]
+
+    def get_job_progress(self, id: str) -> dict[str, int]:
+        with get_db() as db:
+            return {
+                status: count
+                for status, count in db.query(
+                    IngestionTask.status, func.count(IngestionTask.id)
+                )
+                .filter_by(job_id=id)
+                .group_by(IngestionTask.status)
+                .all()
+            }
+
+    def get_job_response_by_id(self, id: str) -> Optional[IngestionJobResponse]:
+        job = self.get_job_by_id(id)
+        if job is None:
+            return None
+
+        progress = self.get_job_progress(id)
+        with get_db() as db:
+            errors = [
+                IngestionTaskModel.model_validate(task)
+                for task in db.query(IngestionTask)
+                .filter_by(job_id=id, status="failed")
+                .limit(100)
+                .all()
+            ]
+
+        return IngestionJobResponse(
+            **job.model_dump(),
+            total=sum(progress.values()),
+            progress=progress,
+            errors=errors,
+        )
+
+    def get_file_ids_by_job_id_and_statuses(
+        self, id: str, statuses: list[str]
+    ) -> list[str]:
+        with get_db() as db:
+            return [
+                file_id
+                for (file_id,) in db.query(IngestionTask.file_id)
+                .filter(IngestionTask.job_id == id, IngestionTask.status.in_(statuses))
+                .order_by(IngestionTask.created_at)
+                .all()
+            ]
+
+    def update_job_status_by_id(
+        self, id: str, status: str
+    ) -> Optional[IngestionJobModel]:
+        with get_db() as db:
+            job = db.get(IngestionJob, id)
+            if job is None:
+                return None
+            job.status = status
+            job.updated_at = int(time.time())
+            db.commit()
+            db.refresh(job)
+            return IngestionJobModel.model_validate(job)
+
+    def claim_tasks_by_job_id(
+        self, id: str, limit: int, stale_before: int, max_attempts: int
+    ) -> list[IngestionTaskModel]:
+        """
+        Mark up to `limit` pending tasks of a job as processing and return
+        them. Tasks left processing without a heartbeat since before
+        `stale_before` (a worker that died mid-file) are claimed again, or
+        marked as failed once they were claimed `max_attempts` times. The
+        conditional UPDATE makes sure a task is only claimed by one worker
+        process.
+        """
+        stale = (IngestionTask.status == "processing") & (
+            IngestionTask.updated_at < stale_before
+        )
+        claimable = or_(
+            IngestionTask.status == "pending",
+            stale & (IngestionTask.attempts < max_attempts),
+        )
+
+        claimed = []
+        with get_db() as db:
+            db.query(IngestionTask).filter(
+                IngestionTask.job_id == id,
+                stale,
+                IngestionTask.attempts >= max_attempts,
+            ).update(
+                {
+                    "status": "failed",
+                    "error": f"Processing was interrupted {max_attempts} times",
+                    "updated_at": int(time.time()),
+                },
+                synchronize_session=False,
+            )
+
+            candidates = (
+                db.query(IngestionTask.id)
+                .filter(IngestionTask.job_id == id, claimable)
+                .order_by(IngestionTask.created_at)
+                .limit(limit)
+                .all()
+            )
+
+            now = int(time.time())
+            for (task_id,) in candidates:
+                result = (
+                    db.query(IngestionTask)
+                    .filter(IngestionTask.id == task_id, claimable)
+                    .update(
+                        {
+                            "status": "processing",
+                            "attempts": IngestionTask.attempts + 1,
+                            "updated_at": now,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                if result:
+                    claimed.append(task_id)
+            db.commit()
+
+            return [
+                IngestionTaskModel.model_validate(task)
+                for task in db.query(IngestionTask)
+                .filter(IngestionTask.id.in_(claimed))
+                .all()
+            ]
+
+    def touch_tasks_by_ids(self, ids: list[str]) -> int:
+        """Heartbeat of tasks being processed, so they aren't claimed again as stale."""
+        with get_db() as db:
+            result = (
+                db.query(IngestionTask)
+                .filter(IngestionTask.id.in_(ids), IngestionTask.status == "processing")
+                .update({"updated_at": int(time.time())}, synchronize_session=False)
+            )
+            db.commit()
+            return result
+
+    def update_task_status_by_id(
+        self, id: str, status: str, error: Optional[str] = None
+    ) -> bool:
+        with get_db() as db:
+            result = (
+                db.query(IngestionTask)
+                .filter_by(id=id)
+                .update(
+                    {
+                        "status": status,
+                        "error": error,
+                        "updated_at": int(time.time()),
+                    }
+                )
+            )
+            db.commit()
+            return result > 0
+
+    def cancel_job_by_id(self, id: str) -> Optional[IngestionJobModel]:
+        with get_db() as db:
+            db.query(IngestionTask).filter_by(job_id=id, status="pending").update(
+                {"status": "cancelled", "updated_at": int(time.time())}
+            )
+            db.commit()
+        return self.update_job_status_by_id(id, "cancelled")
+
+
+Ingestions = IngestionTable()
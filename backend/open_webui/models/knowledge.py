@@ -14,7 +14,7 @@ from open_webui.models.users import Users, UserResponse
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import has_access_batch
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -147,11 +147,15 @@ class KnowledgeTable:
         self, user_id: str, permission: str = "write"
     ) -> list[KnowledgeUserModel]:
         knowledge_bases = self.get_knowledge_bases()
+        access = has_access_batch(
+            user_id,
+            permission,
+            [knowledge_base.access_control for knowledge_base in knowledge_bases],
+        )
         return [
             knowledge_base
-            for knowledge_base in knowledge_bases
-            if knowledge_base.user_id == user_id
-            or has_access(user_id, permission, knowledge_base.access_control)
+            for knowledge_base, allowed in zip(knowledge_bases, access)
+            if knowledge_base.user_id == user_id or allowed
         ]
 
     def get_knowledge_by_id(self, id: str) -> Optional[KnowledgeModel]:
@@ -15,7 +15,7 @@ from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
 
 
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import has_access_batch
 
 
 log = logging.getLogger(__name__)
@@ -173,6 +173,14 @@ class ModelsTable:
         with get_db() as db:
             return [ModelModel.model_validate(model) for model in db.query(Model).all()]
 
+    def get_version_stamp(self) -> tuple[int, int]:
+        """Return the number of models and their latest `updated_at`."""
+        with get_db() as db:
+            count, updated_at = db.query(
+                func.count(Model.id), func.max(Model.updated_at)
+            ).one()
+            return count, updated_at or 0
+
     def get_models(self) -> list[ModelUserResponse]:
         with get_db() as db:
             models = []
@@ -199,13 +207,22 @@ class ModelsTable:
         self, user_id: str, permission: str = "write"
     ) -> list[ModelUserResponse]:
         models = self.get_models()
+        access = has_access_batch(
+            user_id, permission, [model.access_control for model in models]
+        )
         return [
             model
-            for model in models
-            if model.user_id == user_id
-            or has_access(user_id, permission, model.access_control)
+            for model, allowed in zip(models, access)
+            if model.user_id == user_id or allowed
         ]
 
+    def get_models_by_ids(self, ids: list[str]) -> list[ModelModel]:
+        with get_db() as db:
+            return [
+                ModelModel.model_validate(model)
+                for model in db.query(Model).filter(Model.id.in_(ids)).all()
+            ]
+
     def get_model_by_id(self, id: str) -> Optional[ModelModel]:
         try:
             with get_db() as db:
@@ -238,7 +255,12 @@ class ModelsTable:
                 result = (
                     db.query(Model)
                     .filter_by(id=id)
-                    .update(model.model_dump(exclude={"id"}))
+                    .update(
+                        {
+                            **model.model_dump(exclude={"id"}),
+                            "updated_at": int(time.time()),
+                        }
+                    )
                 )
                 db.commit()
 
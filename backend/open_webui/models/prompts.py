@@ -7,7 +7,7 @@ from open_webui.models.users import Users, UserResponse
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import has_access_batch
 
 ####################
 # Prompts DB Schema
@@ -122,12 +122,13 @@ class PromptsTable:
         self, user_id: str, permission: str = "write"
     ) -> list[PromptUserResponse]:
         prompts = self.get_prompts()
-
+        access = has_access_batch(
+            user_id, permission, [prompt.access_control for prompt in prompts]
+        )
         return [
             prompt
-            for prompt in prompts
-            if prompt.user_id == user_id
-            or has_access(user_id, permission, prompt.access_control)
+            for prompt, allowed in zip(prompts, access)
+            if prompt.user_id == user_id or allowed
         ]
 
     def update_prompt_by_command(
@@ -8,7 +8,7 @@ from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import has_access_batch
 
 
 log = logging.getLogger(__name__)
@@ -161,12 +161,13 @@ class ToolsTable:
         self, user_id: str, permission: str = "write"
     ) -> list[ToolUserModel]:
         tools = self.get_tools()
-
+        access = has_access_batch(
+            user_id, permission, [tool.access_control for tool in tools]
+        )
         return [
             tool
-            for tool in tools
-            if tool.user_id == user_id
-            or has_access(user_id, permission, tool.access_control)
+            for tool, allowed in zip(tools, access)
+            if tool.user_id == user_id or allowed
         ]
 
     def get_tool_valves_by_id(self, id: str) -> Optional[dict]:
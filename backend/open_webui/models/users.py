@@ -1,7 +1,20 @@
+import hashlib
+import logging
+import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    USER_CACHE_TTL,
+    USER_LAST_ACTIVE_GRANULARITY,
+    USER_LAST_ACTIVE_FLUSH_INTERVAL,
+    REDIS_URL,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+)
+from open_webui.utils.redis import RedisPubSubListener, get_sentinels_from_env
 
 
 from open_webui.models.chats import Chats
@@ -12,6 +25,9 @@ from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text
 from sqlalchemy import or_
 
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
 
 ####################
 # User DB Schema
@@ -102,7 +118,183 @@ class UserUpdateForm(BaseModel):
     password: Optional[str] = None
 
 
+class UserCache:
+    """
+    Short-lived process-local cache of users resolved from tokens and API
+    keys, keyed by user id (and by a hash of the API key).
+
+    Entries are dropped whenever the user changes, locally through the
+    `UsersTable` write methods and on other workers through a Redis pub/sub
+    message. They also expire after `ttl` seconds. If Redis is configured but
+    the subscription is down, the cache is bypassed.
+    """
+
+    CHANNEL = "open-webui:users:invalidate"
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = 0
+        self._users: dict[str, tuple[float, UserModel]] = {}
+        self._api_keys: dict[str, str] = {}
+
+        self.listener = None
+        if ttl > 0 and REDIS_URL:
+            try:
+                self.listener = RedisPubSubListener(
+                    REDIS_URL,
+                    get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+                    self.CHANNEL,
+                    callback=lambda id: self.invalidate(id or None, publish=False),
+                    on_reset=lambda: self.invalidate(publish=False),
+                )
+            except Exception as e:
+                log.warning(f"User cache invalidation unavailable: {e}")
+                self.ttl = 0
+
+    def enabled(self) -> bool:
+        if self.ttl <= 0:
+            return False
+        if self.listener is not None:
+            return self.listener.start().connected
+        return True
+
+    @staticmethod
+    def _hash_api_key(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode()).hexdigest()
+
+    def invalidate(self, id: Optional[str] = None, publish: bool = True):
+        with self._lock:
+            self._version += 1
+            if id is None:
+                self._users.clear()
+                self._api_keys.clear()
+            else:
+                self._users.pop(id, None)
+                self._api_keys = {
+                    key: user_id
+                    for key, user_id in self._api_keys.items()
+                    if user_id != id
+                }
+
+        if publish and self.listener is not None:
+            self.listener.publish(id or "")
+
+    def _get(self, id: str) -> Optional[UserModel]:
+        entry = self._users.get(id)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def _set(self, user: UserModel, version: int, api_key: Optional[str] = None):
+        with self._lock:
+            # Only keep the user if it didn't change while it was loaded
+            if version == self._version:
+                # Callers may change the returned user, cache a copy of it
+                self._users[user.id] = (time.monotonic() + self.ttl, user.model_copy())
+                if api_key is not None:
+                    self._api_keys[self._hash_api_key(api_key)] = user.id
+
+    def get(self, id: str, load: Callable[[], Optional[UserModel]]):
+        if not self.enabled():
+            return load()
+
+        with self._lock:
+            user = self._get(id)
+            version = self._version
+        if user is not None:
+            return user.model_copy()
+
+        user = load()
+        if user is not None:
+            self._set(user, version)
+        return user
+
+    def get_by_api_key(
+        self, api_key: str, load: Callable[[], Optional[UserModel]]
+    ) -> Optional[UserModel]:
+        if not self.enabled():
+            return load()
+
+        with self._lock:
+            id = self._api_keys.get(self._hash_api_key(api_key))
+            user = self._get(id) if id else None
+            version = self._version
+        if user is not None:
+            return user.model_copy()
+
+        user = load()
+        if user is not None:
+            self._set(user, version, api_key)
+        return user
+
+
+class LastActiveTracker:
+    """
+    Coalesces `last_active_at` updates.
+
+    `touch` only records a user when their timestamp moved by at least
+    `granularity` seconds since it was last written. Recorded users are
+    written with a single bulk UPDATE at most once per `interval` seconds,
+    from a background thread.
+    """
+
+    def __init__(self, granularity: float, interval: float):
+        self.granularity = granularity
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._written: dict[str, int] = {}
+        self._flushed_at = time.monotonic()
+        self._flushing = False
+
+    def touch(self, id: str):
+        now = int(time.time())
+        with self._lock:
+            if now - self._written.get(id, 0) < self.granularity:
+                return
+            self._written[id] = now
+            self._pending.add(id)
+
+            if self._flushing or time.monotonic() - self._flushed_at < self.interval:
+                return
+            self._flushing = True
+
+        threading.Thread(target=self._flush_in_background, daemon=True).start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._flushing = False
+
+    def flush(self):
+        with self._lock:
+            ids, self._pending = list(self._pending), set()
+            self._flushed_at = time.monotonic()
+
+        if not ids:
+            return
+
+        try:
+            with get_db() as db:
+                db.query(User).filter(User.id.in_(ids)).update(
+                    {"last_active_at": int(time.time())}, synchronize_session=False
+                )
+                db.commit()
+        except Exception as e:
+            log.warning(f"Failed to update last_active_at of {len(ids)} users: {e}")
+
+
 class UsersTable:
+    def __init__(self):
+        self.cache = UserCache(USER_CACHE_TTL)
+        self.last_active = LastActiveTracker(
+            USER_LAST_ACTIVE_GRANULARITY, USER_LAST_ACTIVE_FLUSH_INTERVAL
+        )
+
     def insert_new_user(
         self,
         id: str,
@@ -143,6 +335,14 @@ class UsersTable:
         except Exception:
             return None
 
+    def get_cached_user_by_id(self, id: str) -> Optional[UserModel]:
+        return self.cache.get(id, lambda: self.get_user_by_id(id))
+
+    def get_cached_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
+        return self.cache.get_by_api_key(
+            api_key, lambda: self.get_user_by_api_key(api_key)
+        )
+
     def get_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
         try:
             with get_db() as db:
@@ -275,6 +475,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                self.cache.invalidate(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -289,6 +490,7 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                self.cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -308,6 +510,10 @@ class UsersTable:
         except Exception:
             return None
 
+    def touch_user_last_active_by_id(self, id: str):
+        """Record activity, written in bulk by `LastActiveTracker`."""
+        self.last_active.touch(id)
+
     def update_user_oauth_sub_by_id(
         self, id: str, oauth_sub: str
     ) -> Optional[UserModel]:
@@ -315,6 +521,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"oauth_sub": oauth_sub})
                 db.commit()
+                self.cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -326,6 +533,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                self.cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -345,6 +553,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                self.cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -363,6 +572,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                    self.cache.invalidate(id)
 
                 return True
             else:
@@ -375,6 +585,7 @@ class UsersTable:
             with get_db() as db:
                 result = db.query(User).filter_by(id=id).update({"api_key": api_key})
                 db.commit()
+                self.cache.invalidate(id)
                 return True if result == 1 else False
         except Exception:
             return False
@@ -0,0 +1,283 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import uuid
+from typing import Any, Optional
+
+from langchain_core.documents import Document
+
+from open_webui.config import ENABLE_RAG_BM25_INDEX, RAG_BM25_INDEX_DIR
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.retrieval.vector.main import GetResult
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts5_available() -> bool:
+    try:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(text)")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+class BM25Index:
+    """
+    Persistent lexical index for hybrid search.
+
+    Each vector DB collection gets its own SQLite FTS5 database under
+    `RAG_BM25_INDEX_DIR`, so BM25 statistics stay per collection and dropping
+    a collection is a single file removal. Chunks are added incrementally when
+    they are inserted into the vector DB; collections that were created before
+    the index existed are backfilled once on first query. Every chunk is
+    stored under a rowid derived from its id, so adding a chunk again
+    replaces it.
+
+    The index files are local to the node. With several nodes sharing a
+    vector DB, a node doesn't see the chunks added or deleted by the others,
+    so the index is meant for single-node deployments and only enabled with
+    `ENABLE_RAG_BM25_INDEX=True`.
+    """
+
+    def __init__(self, directory: str, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled and _fts5_available()
+
+        if enabled and not self.enabled:
+            log.warning(
+                "SQLite FTS5 is not available, falling back to in-memory BM25 for hybrid search"
+            )
+
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def _get_path(self, collection_name: str) -> str:
+        digest = hashlib.sha256(collection_name.encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.db")
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5("
+            "text, id UNINDEXED, metadata UNINDEXED, "
+            "tokenize='porter unicode61 remove_diacritics 2')"
+        )
+        return conn
+
+    def _remove(self, path: str):
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(f"{path}{suffix}")
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _get_rowid(id: Optional[str]) -> Optional[int]:
+        if id is None:
+            return None
+        return int(hashlib.sha256(id.encode()).hexdigest()[:15], 16)
+
+    @classmethod
+    def _rows(cls, ids: list[str], texts: list[str], metadatas: list[Any]):
+        for idx, text in enumerate(texts):
+            id = ids[idx] if ids else None
+            yield (
+                cls._get_rowid(id),
+                text or "",
+                id,
+                json.dumps(metadatas[idx] if metadatas else {}, default=str),
+            )
+
+    def _insert(self, conn: sqlite3.Connection, rows):
+        conn.executemany(
+            "INSERT OR REPLACE INTO chunks (rowid, text, id, metadata) "
+            "VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+    def has_index(self, collection_name: str) -> bool:
+        return self.enabled and os.path.exists(self._get_path(collection_name))
+
+    def build(self, collection_name: str, result: GetResult):
+        """(Re)build the index of a collection from a full vector DB read."""
+        if not self.enabled:
+            return
+
+        path = self._get_path(collection_name)
+        # Build into a temporary file and swap it in so that concurrent
+        # readers never observe a partially built index.
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        conn = self._connect(tmp_path)
+        try:
+            with conn:
+                self._insert(
+                    conn,
+                    self._rows(
+                        result.ids[0] if result.ids else [],
+                        result.documents[0] if result.documents else [],
+                        result.metadatas[0] if result.metadatas else [],
+                    ),
+                )
+            conn.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            conn.close()
+
+        self._remove(path)
+        os.replace(tmp_path, path)
+        log.debug(f"bm25:build {collection_name}")
+
+    def add(
+        self,
+        collection_name: str,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[Any],
+        create: bool = False,
+    ):
+        """
+        Add chunks to the index of a collection.
+
+        When the collection has no index yet and `create` is False, nothing is
+        written; the index will be backfilled from the vector DB on first use,
+        which also covers chunks inserted before this call. The chunks must be
+        in the vector DB already, so a backfill running concurrently picks
+        them up (see `reconcile`).
+        """
+        if not self.enabled:
+            return
+
+        path = self._get_path(collection_name)
+        if create:
+            self._remove(path)
+        elif not os.path.exists(path):
+            return
+
+        conn = self._connect(path)
+        try:
+            with conn:
+                self._insert(conn, self._rows(ids, texts, metadatas))
+        finally:
+            conn.close()
+
+    def reconcile(self, collection_name: str, built: GetResult, latest: GetResult):
+        """
+        Catch up an index built from `built` with a later vector DB read.
+
+        Chunks added or deleted while the index was being built skipped it,
+        as it didn't exist yet; they are applied from the difference of the
+        two reads.
+        """
+        if not self.has_index(collection_name):
+            return
+
+        built_ids = set(built.ids[0] if built.ids else [])
+        ids = latest.ids[0] if latest.ids else []
+        texts = latest.documents[0] if latest.documents else []
+        metadatas = latest.metadatas[0] if latest.metadatas else []
+
+        added = [idx for idx, id in enumerate(ids) if id not in built_ids]
+        deleted = built_ids.difference(ids)
+        if not added and not deleted:
+            return
+
+        conn = self._connect(self._get_path(collection_name))
+        try:
+            with conn:
+                conn.executemany(
+                    "DELETE FROM chunks WHERE rowid = ?",
+                    [(self._get_rowid(id),) for id in deleted],
+                )
+                self._insert(
+                    conn,
+                    self._rows(
+                        [ids[idx] for idx in added],
+                        [texts[idx] for idx in added],
+                        [metadatas[idx] for idx in added] if metadatas else [],
+                    ),
+                )
+        finally:
+            conn.close()
+        log.debug(f"bm25:reconcile {collection_name} +{len(added)} -{len(deleted)}")
+
+    def search(self, collection_name: str, query: str, k: int) -> list[Document]:
+        tokens = TOKEN_PATTERN.findall(query.lower())
+        if not tokens:
+            return []
+
+        match = " OR ".join(f'"{token}"' for token in dict.fromkeys(tokens))
+
+        conn = self._connect(self._get_path(collection_name))
+        try:
+            rows = conn.execute(
+                "SELECT text, metadata FROM chunks WHERE chunks MATCH ? "
+                "ORDER BY bm25(chunks) LIMIT ?",
+                (match, k),
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return [
+            Document(page_content=text, metadata=json.loads(metadata))
+            for text, metadata in rows
+        ]
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        if not self.has_index(collection_name):
+            return
+
+        path = self._get_path(collection_name)
+        try:
+            conn = self._connect(path)
+            try:
+                with conn:
+                    if ids:
+                        conn.executemany(
+                            "DELETE FROM chunks WHERE rowid = ?",
+                            [(self._get_rowid(id),) for id in ids],
+                        )
+                    elif filter:
+                        clauses = " AND ".join(
+                            "json_extract(metadata, ?) = ?" for _ in filter
+                        )
+                        params = []
+                        for key, value in filter.items():
+                            params.extend([f'$."{key}"', value])
+                        conn.execute(f"DELETE FROM chunks WHERE {clauses}", params)
+            finally:
+                conn.close()
+        except Exception as e:
+            # A stale index is worse than none, drop it to force a rebuild
+            log.warning(
+                f"bm25:delete failed for {collection_name}, dropping index: {e}"
+            )
+            self._remove(path)
+
+    def delete_collection(self, collection_name: str):
+        if self.enabled:
+            self._remove(self._get_path(collection_name))
+
+    def reset(self):
+        if self.enabled:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            os.makedirs(self.directory, exist_ok=True)
+
+
+BM25_INDEX = BM25Index(RAG_BM25_INDEX_DIR, enabled=ENABLE_RAG_BM25_INDEX)
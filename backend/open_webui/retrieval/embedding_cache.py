@@ -0,0 +1,324 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from open_webui.config import (
+    ENABLE_RAG_EMBEDDING_CACHE,
+    RAG_EMBEDDING_CACHE_BACKEND,
+    RAG_EMBEDDING_CACHE_DIR,
+    RAG_EMBEDDING_CACHE_SIZE,
+    RAG_EMBEDDING_CACHE_TTL,
+)
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    REDIS_URL,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def _pack(vector: list[float]) -> bytes:
+    return array("d", vector).tobytes()
+
+
+def _unpack(data: bytes) -> list[float]:
+    return array("d", data).tolist()
+
+
+class RedisEmbeddingStore:
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.redis = get_redis_connection(
+            REDIS_URL,
+            get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+            decode_responses=False,
+        )
+
+    def _key(self, key: str) -> str:
+        return f"open-webui:embedding:{key}"
+
+    def get_many(self, keys: list[str]) -> list[Optional[list[float]]]:
+        values = self.redis.mget([self._key(key) for key in keys])
+        return [_unpack(value) if value is not None else None for value in values]
+
+    def set_many(self, items: dict[str, list[float]]):
+        pipe = self.redis.pipeline(transaction=False)
+        for key, vector in items.items():
+            pipe.set(self._key(key), _pack(vector), ex=self.ttl or None)
+        pipe.execute()
+
+
+class DiskEmbeddingStore:
+    PURGE_INTERVAL = 1000
+
+    def __init__(self, directory: str, ttl: int):
+        self.ttl = ttl
+        self.path = os.path.join(directory, "embeddings.db")
+        self._writes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB, created_at REAL)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get_many(self, keys: list[str]) -> list[Optional[list[float]]]:
+        min_created_at = time.time() - self.ttl if self.ttl else 0
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT key, vector FROM embeddings "
+                f"WHERE key IN ({','.join('?' * len(keys))}) AND created_at >= ?",
+                [*keys, min_created_at],
+            ).fetchall()
+        finally:
+            conn.close()
+
+        found = {key: _unpack(vector) for key, vector in rows}
+        return [found.get(key) for key in keys]
+
+    def set_many(self, items: dict[str, list[float]]):
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, created_at) "
+                    "VALUES (?, ?, ?)",
+                    [(key, _pack(vector), now) for key, vector in items.items()],
+                )
+
+                self._writes += len(items)
+                if self.ttl and self._writes >= self.PURGE_INTERVAL:
+                    self._writes = 0
+                    conn.execute(
+                        "DELETE FROM embeddings WHERE created_at < ?",
+                        (now - self.ttl,),
+                    )
+        finally:
+            conn.close()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of embeddings.
+
+    Entries are keyed by a hash of the embedding engine, endpoint, model,
+    model format, prefix and text, so identical chunks and repeated queries are only
+    embedded once. The first tier is an in-process LRU with a TTL, holding
+    the vectors packed like the store tiers do. An optional shared second
+    tier (Redis or a local SQLite file) survives restarts and is shared
+    between workers. Errors in the second tier are logged and treated as
+    misses.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        size: int = 10000,
+        ttl: int = 0,
+        backend: str = "",
+        directory: Optional[str] = None,
+    ):
+        self.enabled = enabled and size > 0
+        self.size = size
+        self.ttl = ttl
+
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "store_hits": 0,
+            "misses": 0,
+            "store_errors": 0,
+        }
+
+        self.store = None
+        if self.enabled:
+            try:
+                if backend == "redis":
+                    self.store = RedisEmbeddingStore(ttl)
+                elif backend == "disk":
+                    self.store = DiskEmbeddingStore(directory, ttl)
+            except Exception as e:
+                log.warning(f"Embedding cache {backend} tier unavailable: {e}")
+
+    @staticmethod
+    def get_key(
+        engine: str,
+        model: str,
+        prefix: Optional[str],
+        text: str,
+        url: Optional[str] = None,
+        api_version: Optional[str] = None,
+        model_format: Optional[str] = None,
+    ) -> str:
+        return hashlib.sha256(
+            "\0".join(
+                [
+                    engine,
+                    url or "",
+                    api_version or "",
+                    model or "",
+                    model_format or "",
+                    prefix or "",
+                    text,
+                ]
+            ).encode()
+        ).hexdigest()
+
+    def _get_local(self, key: str) -> Optional[list[float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, data = entry
+        if expires_at and expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return _unpack(data)
+
+    def _set_local(self, key: str, vector: list[float]):
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0
+        self._entries[key] = (expires_at, _pack(vector))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> list[Optional[list[float]]]:
+        with self._lock:
+            vectors = [self._get_local(key) for key in keys]
+            self._stats["hits"] += sum(vector is not None for vector in vectors)
+
+        missing = [idx for idx, vector in enumerate(vectors) if vector is None]
+        if missing and self.store:
+            try:
+                stored = self.store.get_many([keys[idx] for idx in missing])
+            except Exception as e:
+                log.warning(f"Embedding cache read failed: {e}")
+                stored = [None] * len(missing)
+                with self._lock:
+                    self._stats["store_errors"] += 1
+
+            with self._lock:
+                for idx, vector in zip(missing, stored):
+                    if vector is not None:
+                        vectors[idx] = vector
+                        self._set_local(keys[idx], vector)
+                        self._stats["store_hits"] += 1
+
+        with self._lock:
+            self._stats["misses"] += sum(vector is None for vector in vectors)
+        return vectors
+
+    def set_many(self, items: dict[str, list[float]]):
+        with self._lock:
+            for key, vector in items.items():
+                self._set_local(key, vector)
+
+        if self.store:
+            try:
+                self.store.set_many(items)
+            except Exception as e:
+                log.warning(f"Embedding cache write failed: {e}")
+                with self._lock:
+                    self._stats["store_errors"] += 1
+
+    def wrap(
+        self,
+        func: Callable,
+        engine: str,
+        model: str,
+        url: Optional[str] = None,
+        api_version: Optional[str] = None,
+        model_format: Optional[str] = None,
+    ) -> Callable:
+        """
+        Wrap an embedding function returned by `get_embedding_function` so
+        that only texts missing from the cache are passed to it. `url` and
+        `api_version` identify the endpoint of remote engines, which may
+        serve different models under the same name. `model_format`
+        identifies how a local model was loaded (backend, quantization,
+        model kwargs), as the formats produce different vectors.
+        """
+        if not self.enabled:
+            return func
+
+        def cached_func(query, prefix=None, user=None):
+            texts = query if isinstance(query, list) else [query]
+            keys = [
+                self.get_key(
+                    engine, model, prefix, text, url, api_version, model_format
+                )
+                for text in texts
+            ]
+            vectors = self.get_many(keys)
+
+            # Identical texts within one call are only embedded once
+            pending = {}
+            for idx, vector in enumerate(vectors):
+                if vector is None:
+                    pending.setdefault(keys[idx], texts[idx])
+
+            if pending:
+                embeddings = func(list(pending.values()), prefix=prefix, user=user)
+                if embeddings is None:
+                    return None
+
+                computed = dict(zip(pending.keys(), embeddings))
+                self.set_many(computed)
+                vectors = [
+                    vector if vector is not None else computed[key]
+                    for key, vector in zip(keys, vectors)
+                ]
+
+            return vectors if isinstance(query, list) else vectors[0]
+
+        return cached_func
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["store_hits"]
+            total = lookups + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "size": self.size,
+                "ttl": self.ttl,
+                "backend": type(self.store).__name__ if self.store else None,
+                "hit_rate": lookups / total if total else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+EMBEDDING_CACHE = EmbeddingCache(
+    enabled=ENABLE_RAG_EMBEDDING_CACHE,
+    size=RAG_EMBEDDING_CACHE_SIZE,
+    ttl=RAG_EMBEDDING_CACHE_TTL,
+    backend=RAG_EMBEDDING_CACHE_BACKEND,
+    directory=RAG_EMBEDDING_CACHE_DIR,
+)
@@ -0,0 +1,352 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import aiohttp
+
+from open_webui.models.users import UserModel
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    AIOHTTP_CLIENT_SESSION_SSL,
+    ENABLE_FORWARD_USER_INFO_HEADERS,
+    EMBEDDING_REQUEST_TIMEOUT,
+    EMBEDDING_CONNECT_TIMEOUT,
+    EMBEDDING_MAX_RETRIES,
+    EMBEDDING_MAX_RATE_LIMIT_RETRIES,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MAX_CONCURRENT_REQUESTS,
+    EMBEDDING_BATCH_MAX_TOKENS,
+    EMBEDDING_REQUESTS_PER_MINUTE,
+    EMBEDDING_TOKENS_PER_MINUTE,
+)
+from open_webui.config import RAG_EMBEDDING_PREFIX_FIELD_NAME
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Seconds to wait from a `Retry-After` header, in seconds or as an HTTP date."""
+    if not value:
+        return default
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for BPE tokenizers on English text
+    return max(1, math.ceil(len(text) / 4))
+
+
+def split_batches(
+    texts: list[str], max_items: int, max_tokens: int
+) -> list[tuple[int, int]]:
+    """Split texts into (start, end) ranges bounded by item and token count."""
+    batches = []
+    start, tokens = 0, 0
+    for idx, text in enumerate(texts):
+        text_tokens = estimate_tokens(text)
+        if idx > start and (
+            idx - start >= max_items or tokens + text_tokens > max_tokens
+        ):
+            batches.append((start, idx))
+            start, tokens = idx, 0
+        tokens += text_tokens
+
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate_per_minute`. Waiting callers are also held
+    back while the upstream asked us to pause through `Retry-After`.
+    """
+
+    def __init__(self, rate_per_minute: int):
+        self.rate = rate_per_minute / 60
+        self.capacity = rate_per_minute
+        self.tokens = float(rate_per_minute)
+        self.updated_at = time.monotonic()
+
+    async def acquire(self, amount: int = 1):
+        if self.rate <= 0:
+            return
+
+        # Requests larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        while True:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class EmbeddingEndpoint:
+    def __init__(self):
+        self.semaphore = asyncio.Semaphore(max(1, EMBEDDING_MAX_CONCURRENT_REQUESTS))
+        self.requests = TokenBucket(EMBEDDING_REQUESTS_PER_MINUTE)
+        self.tokens = TokenBucket(EMBEDDING_TOKENS_PER_MINUTE)
+        self.paused_until = 0.0
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self, tokens: int):
+        await self.requests.acquire()
+        await self.tokens.acquire(tokens)
+        while (delay := self.paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+
+class BatchTooLargeError(Exception):
+    pass
+
+
+class EmbeddingClient:
+    """
+    Sends embedding batches to OpenAI, Azure OpenAI and Ollama concurrently.
+
+    The client owns an event loop in a background thread with one pooled
+    aiohttp session, so the synchronous retrieval code can submit work from
+    any thread. Inputs are split into batches bounded by item count and
+    estimated token count. Up to `EMBEDDING_MAX_CONCURRENT_REQUESTS` batches
+    per endpoint are in flight at once, subject to the optional request and
+    token rate limits. A 429 pauses the whole endpoint for `Retry-After`
+    seconds. A batch rejected as too large is split in half and retried.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._endpoints: dict[str, EmbeddingEndpoint] = {}
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="embedding-client",
+                    daemon=True,
+                ).start()
+            return self._loop
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=max(1, EMBEDDING_MAX_CONCURRENT_REQUESTS),
+                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=EMBEDDING_REQUEST_TIMEOUT,
+                    sock_connect=EMBEDDING_CONNECT_TIMEOUT,
+                ),
+                trust_env=True,
+            )
+        return self._session
+
+    def _get_endpoint(self, url: str) -> EmbeddingEndpoint:
+        if url not in self._endpoints:
+            self._endpoints[url] = EmbeddingEndpoint()
+        return self._endpoints[url]
+
+    @staticmethod
+    def _build_request(
+        engine: str,
+        model: str,
+        texts: list[str],
+        url: str,
+        key: str,
+        prefix: Optional[str],
+        user: Optional[UserModel],
+        azure_api_version: Optional[str],
+    ) -> tuple[str, dict, dict]:
+        headers = {"Content-Type": "application/json"}
+        if engine == "azure_openai":
+            api_url = f"{url}/openai/deployments/{model}/embeddings?api-version={azure_api_version}"
+            headers["api-key"] = key
+            json_data = {"input": texts}
+        else:
+            api_url = f"{url}/api/embed" if engine == "ollama" else f"{url}/embeddings"
+            headers["Authorization"] = f"Bearer {key}"
+            json_data = {"input": texts, "model": model}
+
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers.update(
+                {
+                    "X-OpenWebUI-User-Name": user.name,
+                    "X-OpenWebUI-User-Id": user.id,
+                    "X-OpenWebUI-User-Email": user.email,
+                    "X-OpenWebUI-User-Role": user.role,
+                }
+            )
+
+        if isinstance(RAG_EMBEDDING_PREFIX_FIELD_NAME, str) and isinstance(prefix, str):
+            json_data[RAG_EMBEDDING_PREFIX_FIELD_NAME] = prefix
+
+        return api_url, headers, json_data
+
+    @staticmethod
+    def _parse_response(engine: str, data: dict) -> list[list[float]]:
+        if engine == "ollama":
+            if "embeddings" in data:
+                return data["embeddings"]
+            raise Exception("Invalid response format from Ollama embedding API")
+
+        if "data" in data:
+            return [elem["embedding"] for elem in data["data"]]
+        raise Exception("Invalid response format from embedding API")
+
+    async def _embed_batch(self, engine: str, texts: list[str], **kwargs):
+        api_url, headers, json_data = self._build_request(engine, texts=texts, **kwargs)
+        endpoint = self._get_endpoint(kwargs["url"])
+        tokens = sum(estimate_tokens(text) for text in texts)
+
+        # Rate limited responses are counted separately, waiting them out is
+        # expected under load and shouldn't use up the retries for errors
+        attempt = 0
+        rate_limited = 0
+        while attempt < EMBEDDING_MAX_RETRIES:
+            await endpoint.acquire(tokens)
+            try:
+                async with endpoint.semaphore:
+                    async with self._get_session().post(
+                        api_url, headers=headers, json=json_data
+                    ) as r:
+                        if r.status == 429:
+                            rate_limited += 1
+                            if rate_limited > EMBEDDING_MAX_RATE_LIMIT_RETRIES:
+                                log.error(
+                                    f"Still rate limited by {api_url} after {EMBEDDING_MAX_RATE_LIMIT_RETRIES} retries"
+                                )
+                                return None
+
+                            retry_after = parse_retry_after(
+                                r.headers.get("Retry-After")
+                            )
+                            log.warning(
+                                f"Rate limit hit, pausing {api_url} for {retry_after} seconds"
+                            )
+                            endpoint.pause(retry_after)
+                            continue
+
+                        if r.status == 413 or (
+                            r.status == 400
+                            and len(texts) > 1
+                            and "token" in (await r.text()).lower()
+                        ):
+                            raise BatchTooLargeError()
+
+                        r.raise_for_status()
+                        embeddings = self._parse_response(engine, await r.json())
+                        if len(embeddings) != len(texts):
+                            raise Exception(
+                                f"Expected {len(texts)} embeddings, got {len(embeddings)}"
+                            )
+                        return embeddings
+            except BatchTooLargeError:
+                if len(texts) == 1:
+                    log.error(f"Input is too large for {api_url}")
+                    return None
+
+                # The upstream limit is lower than our estimate, split the batch
+                log.info(f"Batch of {len(texts)} rejected as too large, splitting")
+                middle = len(texts) // 2
+                first, second = await asyncio.gather(
+                    self._embed_batch(engine, texts[:middle], **kwargs),
+                    self._embed_batch(engine, texts[middle:], **kwargs),
+                )
+                if first is None or second is None:
+                    return None
+                return first + second
+            except Exception as e:
+                log.warning(
+                    f"Embedding request failed on attempt {attempt + 1}/{EMBEDDING_MAX_RETRIES}: {e}"
+                )
+                if attempt < EMBEDDING_MAX_RETRIES - 1:
+                    # Exponential backoff: 2^attempt seconds
+                    await asyncio.sleep(2**attempt)
+                attempt += 1
+
+        log.error(
+            f"All {EMBEDDING_MAX_RETRIES} embedding attempts failed for {api_url}"
+        )
+        return None
+
+    async def embed(
+        self,
+        engine: str,
+        model: str,
+        texts: list[str],
+        url: str,
+        key: str = "",
+        prefix: Optional[str] = None,
+        user: Optional[UserModel] = None,
+        azure_api_version: Optional[str] = None,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+    ) -> Optional[list[list[float]]]:
+        batches = split_batches(
+            texts, max(1, batch_size), max(1, EMBEDDING_BATCH_MAX_TOKENS)
+        )
+        log.debug(
+            f"embedding_client:{engine} {model} {len(texts)} texts in {len(batches)} batches"
+        )
+
+        results = await asyncio.gather(
+            *[
+                self._embed_batch(
+                    engine,
+                    texts[start:end],
+                    model=model,
+                    url=url,
+                    key=key,
+                    prefix=prefix,
+                    user=user,
+                    azure_api_version=azure_api_version,
+                )
+                for start, end in batches
+            ]
+        )
+
+        embeddings = []
+        for idx, result in enumerate(results):
+            if result is None:
+                log.error(f"Failed to generate embeddings for batch {idx + 1}")
+                return None
+            embeddings.extend(result)
+        return embeddings
+
+    def embed_sync(self, *args, **kwargs) -> Optional[list[list[float]]]:
+        """Run `embed` on the client loop and block until it completes."""
+        return asyncio.run_coroutine_threadsafe(
+            self.embed(*args, **kwargs), self._get_loop()
+        ).result()
+
+
+EMBEDDING_CLIENT = EmbeddingClient()
@@ -0,0 +1,244 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class _BatchRequest:
+    __slots__ = ("items", "kwargs", "future", "queued_at")
+
+    def __init__(self, items: list, kwargs: dict):
+        self.items = items
+        self.kwargs = kwargs
+        self.future = Future()
+        self.queued_at = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    Merges concurrent calls of a local model into one forward pass.
+
+    Callers block while their inputs wait in a queue. A worker thread
+    collects queued requests for up to `max_wait` seconds or until
+    `max_batch_size` inputs are waiting, runs `func` once over the inputs
+    sorted by length, so padding within a batch is minimal, and hands every
+    caller its slice of the results. Only requests with the same keyword
+    arguments (e.g. the prompt prefix) are merged. Calls with at least
+    `max_batch_size` inputs run directly in the calling thread.
+
+    The worker is started on demand and exits after being idle for a while,
+    so batchers of replaced models don't leave threads behind.
+    """
+
+    IDLE_TIMEOUT = 60.0
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        max_batch_size: int,
+        max_wait: float,
+        length: Callable[[Any], int] = len,
+        name: str = "batcher",
+    ):
+        self.func = func
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.length = length
+        self.name = name
+
+        self._queue: deque[_BatchRequest] = deque()
+        self._queued_items = 0
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+        self._stats = {
+            "requests": 0,
+            "direct_requests": 0,
+            "batches": 0,
+            "items": 0,
+            "max_queue_depth": 0,
+            "wait_seconds": 0.0,
+            "run_seconds": 0.0,
+        }
+
+    def __call__(self, items: list, **kwargs) -> list:
+        if len(items) == 0:
+            return []
+        if len(items) >= self.max_batch_size:
+            with self._cond:
+                self._stats["direct_requests"] += 1
+            return list(self.func(items, **kwargs))
+
+        request = _BatchRequest(items, kwargs)
+        with self._cond:
+            self._queue.append(request)
+            self._queued_items += len(items)
+            self._stats["requests"] += 1
+            self._stats["max_queue_depth"] = max(
+                self._stats["max_queue_depth"], len(self._queue)
+            )
+
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name=self.name, daemon=True
+                )
+                self._worker.start()
+            self._cond.notify_all()
+
+        return request.future.result()
+
+    def _take_batch(self) -> List[_BatchRequest]:
+        kwargs = self._queue[0].kwargs
+        batch, size, remaining = [], 0, deque()
+        while self._queue:
+            request = self._queue.popleft()
+            if request.kwargs == kwargs and (
+                not batch or size + len(request.items) <= self.max_batch_size
+            ):
+                batch.append(request)
+                size += len(request.items)
+            else:
+                remaining.append(request)
+        self._queue.extendleft(reversed(remaining))
+        self._queued_items -= size
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._queue:
+                    self._cond.wait(self.IDLE_TIMEOUT)
+                    if not self._queue:
+                        self._worker = None
+                        return
+
+                # Give concurrent callers a moment to join the batch
+                deadline = self._queue[0].queued_at + self.max_wait
+                while self._queued_items < self.max_batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+
+                batch = self._take_batch()
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_BatchRequest]):
+        # Any error fails the callers of the batch instead of the worker,
+        # which would leave them and every later caller waiting forever
+        try:
+            self._process_batch(batch)
+        except BaseException as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+
+    def _process_batch(self, batch: List[_BatchRequest]):
+        items = [item for request in batch for item in request.items]
+        order = sorted(range(len(items)), key=lambda idx: self.length(items[idx]))
+
+        started_at = time.monotonic()
+        results = list(self.func([items[idx] for idx in order], **batch[0].kwargs))
+        if len(results) != len(items):
+            raise ValueError(f"Expected {len(items)} results, got {len(results)}")
+
+        unsorted = [None] * len(items)
+        for position, idx in enumerate(order):
+            unsorted[idx] = results[position]
+
+        with self._cond:
+            self._stats["batches"] += 1
+            self._stats["items"] += len(items)
+            self._stats["run_seconds"] += time.monotonic() - started_at
+            self._stats["wait_seconds"] += sum(
+                started_at - request.queued_at for request in batch
+            )
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(unsorted[offset : offset + len(request.items)])
+            offset += len(request.items)
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["queue_depth"] = len(self._queue)
+            stats["queued_items"] = self._queued_items
+
+        batches = stats["batches"]
+        stats["avg_batch_size"] = stats["items"] / batches if batches else 0.0
+        stats["avg_wait_ms"] = (
+            1000 * stats.pop("wait_seconds") / stats["requests"]
+            if stats["requests"]
+            else 0.0
+        )
+        stats["avg_run_ms"] = (
+            1000 * stats.pop("run_seconds") / batches if batches else 0.0
+        )
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_wait_ms"] = 1000 * self.max_wait
+        return stats
+
+
+class _BatchedModel:
+    """Proxy of a local model; attributes other than the batched call are forwarded."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def get_stats(self) -> dict:
+        return self.batcher.get_stats()
+
+
+class BatchedSentenceTransformer(_BatchedModel):
+    def __init__(self, model, max_batch_size: int, max_wait: float):
+        super().__init__(model)
+        self.batcher = MicroBatcher(
+            self._encode,
+            max_batch_size=max_batch_size,
+            max_wait=max_wait,
+            name="embedding-batcher",
+        )
+
+    def _encode(self, sentences: List[str], **kwargs):
+        return list(self.model.encode(sentences, **kwargs))
+
+    def encode(self, sentences: Union[str, List[str]], **kwargs):
+        import numpy as np
+
+        if isinstance(sentences, str):
+            return self.encode([sentences], **kwargs)[0]
+
+        embeddings = self.batcher(list(sentences), **kwargs)
+        return np.array(embeddings) if embeddings else np.empty((0,))
+
+
+class BatchedCrossEncoder(_BatchedModel):
+    def __init__(self, model, max_batch_size: int, max_wait: float):
+        super().__init__(model)
+        self.batcher = MicroBatcher(
+            self._predict,
+            max_batch_size=max_batch_size,
+            max_wait=max_wait,
+            length=lambda pair: len(pair[0]) + len(pair[1]),
+            name="reranking-batcher",
+        )
+
+    def _predict(self, sentences: List[Tuple[str, str]], **kwargs):
+        return list(self.model.predict(sentences, **kwargs))
+
+    def predict(self, sentences: List[Tuple[str, str]], **kwargs):
+        import numpy as np
+
+        return np.array(self.batcher(list(sentences), **kwargs))
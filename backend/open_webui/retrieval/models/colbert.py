@@ -8,14 +8,19 @@ from colbert.modeling.checkpoint import Checkpoint
 from open_webui.env import SRC_LOG_LEVELS
 
 from open_webui.retrieval.models.base_reranker import BaseReranker
+from open_webui.retrieval.reranking_cache import COLBERT_CACHE, get_content_hash
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class ColBERT(BaseReranker):
+    # Scores are normalized over the candidates of a call
+    cacheable_scores = False
+
     def __init__(self, name, **kwargs) -> None:
         log.info("ColBERT: Loading model", name)
+        self.name = name
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
 
         DOCKER = kwargs.get("env") == "docker"
@@ -76,7 +81,7 @@ class ColBERT(BaseReranker):
         docs = [i[1] for i in sentences]
 
         # Embedding the documents
-        embedded_docs = self.ckpt.docFromText(docs, bsize=32)[0]
+        embedded_docs = self.embed_documents(docs)
         # Embedding the queries
         embedded_queries = self.ckpt.queryFromText([query], bsize=32)
         embedded_query = embedded_queries[0]
@@ -87,3 +92,31 @@ class ColBERT(BaseReranker):
         )
 
         return scores
+
+    def embed_documents(self, docs):
+        """Token embeddings of the documents, reusing those of known chunks."""
+        keys = [f"{self.name}:{get_content_hash(doc)}" for doc in docs]
+        embeddings = (
+            COLBERT_CACHE.get_many(keys)
+            if COLBERT_CACHE.enabled
+            else [None] * len(docs)
+        )
+
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            embedded_docs = self.ckpt.docFromText(
+                [docs[idx] for idx in missing], bsize=32
+            )[0]
+
+            computed = {}
+            for idx, embedding in zip(missing, embedded_docs):
+                # Drop the padding, batches are padded again below
+                tokens = embedding.abs().sum(dim=-1).nonzero()
+                length = int(tokens.max()) + 1 if len(tokens) else 1
+                embeddings[idx] = embedding[:length].detach().cpu()
+                computed[keys[idx]] = embeddings[idx]
+
+            if COLBERT_CACHE.enabled:
+                COLBERT_CACHE.set_many(computed)
+
+        return torch.nn.utils.rnn.pad_sequence(embeddings, batch_first=True)
@@ -0,0 +1,211 @@
+import json
+import logging
+import platform
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Literal, Optional
+
+from open_webui.config import CACHE_DIR
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+OPTIMIZED_MODELS_DIR = CACHE_DIR / "optimized_models"
+
+QUANTIZATIONS = ["arm64", "avx2", "avx512", "avx512_vnni"]
+
+ModelKind = Literal["embedding", "reranking"]
+
+
+def detect_quantization() -> str:
+    """Best quantization target for the CPU we run on."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "arm64"
+
+    flags = set()
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags.update(line.split(":", 1)[1].split())
+                    break
+    except OSError:
+        pass
+
+    if "avx512_vnni" in flags or "avx512vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags:
+        return "avx512"
+    # Supported by every x86-64 CPU of the last decade
+    return "avx2"
+
+
+def _get_model_class(kind: ModelKind):
+    from sentence_transformers import CrossEncoder, SentenceTransformer
+
+    return SentenceTransformer if kind == "embedding" else CrossEncoder
+
+
+def get_optimized_model_dir(model: str, kind: ModelKind) -> Path:
+    return OPTIMIZED_MODELS_DIR / kind / re.sub(r"[^\w.-]+", "--", model)
+
+
+def get_optimized_model_manifest(model: str, kind: ModelKind) -> Optional[dict]:
+    """Manifest of the int8 ONNX export of `model`, if there is a complete one."""
+    model_dir = get_optimized_model_dir(model, kind)
+    try:
+        manifest = json.loads((model_dir / "manifest.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+    if (
+        manifest.get("model") != model
+        or not (model_dir / manifest["file_name"]).exists()
+    ):
+        return None
+    return manifest
+
+
+def load_optimized_model(model: str, kind: ModelKind, **kwargs):
+    """Load the int8 ONNX export of `model` for CPU inference, or None."""
+    manifest = get_optimized_model_manifest(model, kind)
+    if manifest is None:
+        return None
+
+    log.info(f"Loading int8 ONNX export of {model} ({manifest['quantization']})")
+    return _get_model_class(kind)(
+        str(get_optimized_model_dir(model, kind)),
+        device="cpu",
+        backend="onnx",
+        model_kwargs={"file_name": manifest["file_name"]},
+        **kwargs,
+    )
+
+
+def _benchmark(kind: ModelKind, reference, quantized, samples: list[str]) -> dict:
+    import numpy as np
+
+    if kind == "embedding":
+        inputs = samples
+        run = lambda model, inputs: model.encode(
+            inputs, batch_size=32, normalize_embeddings=True, convert_to_numpy=True
+        )
+    else:
+        # Score every chunk against the start of the previous one as query
+        inputs = [
+            (samples[idx - 1][:200], sample) for idx, sample in enumerate(samples)
+        ]
+        run = lambda model, inputs: np.asarray(model.predict(inputs, batch_size=32))
+
+    timings = {}
+    outputs = {}
+    for name, model in [("fp32", reference), ("int8", quantized)]:
+        run(model, inputs[:4])  # warm up
+        started_at = time.perf_counter()
+        outputs[name] = run(model, inputs)
+        timings[name] = time.perf_counter() - started_at
+
+    result = {
+        "samples": len(inputs),
+        "fp32_ms": round(1000 * timings["fp32"], 2),
+        "int8_ms": round(1000 * timings["int8"], 2),
+        "speedup": round(timings["fp32"] / timings["int8"], 2),
+    }
+    if kind == "embedding":
+        # Both are normalized, so this is the mean cosine similarity
+        result["cosine_similarity"] = round(
+            float(np.mean(np.sum(outputs["fp32"] * outputs["int8"], axis=1))), 4
+        )
+    elif len(inputs) > 1:
+        result["score_correlation"] = round(
+            float(np.corrcoef(outputs["fp32"], outputs["int8"])[0, 1]), 4
+        )
+    return result
+
+
+def optimize_model(
+    model: str,
+    model_path: str,
+    kind: ModelKind,
+    quantization: str,
+    samples: list[str],
+    **kwargs,
+) -> dict:
+    """
+    Export `model` (loaded from `model_path`) to ONNX, quantize it to int8
+    with dynamic quantization and store it under the model cache dir, where
+    `get_ef`/`get_rf` pick it up. The export is benchmarked against the fp32
+    model on `samples`, and the result is kept in its manifest.
+    """
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization: {quantization}")
+
+    try:
+        import optimum.onnxruntime  # noqa: F401
+        from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+    except ImportError:
+        raise ValueError(
+            "Optimizing models requires optimum, install it with "
+            "`pip install optimum[onnxruntime]`"
+        )
+
+    model_class = _get_model_class(kind)
+    model_dir = get_optimized_model_dir(model, kind)
+    build_dir = model_dir.with_name(f"{model_dir.name}.build")
+    shutil.rmtree(build_dir, ignore_errors=True)
+
+    try:
+        log.info(f"Exporting {model} to ONNX")
+        onnx_model = model_class(model_path, device="cpu", backend="onnx", **kwargs)
+        onnx_model.save(str(build_dir))
+
+        log.info(f"Quantizing {model} for {quantization}")
+        export_dynamic_quantized_onnx_model(
+            onnx_model,
+            quantization,
+            str(build_dir),
+            file_suffix=f"qint8_{quantization}",
+        )
+        file_name = f"onnx/model_qint8_{quantization}.onnx"
+        del onnx_model
+
+        quantized = model_class(
+            str(build_dir),
+            device="cpu",
+            backend="onnx",
+            model_kwargs={"file_name": file_name},
+            **kwargs,
+        )
+
+        benchmark = None
+        if samples:
+            reference = model_class(model_path, device="cpu", **kwargs)
+            benchmark = _benchmark(kind, reference, quantized, samples)
+            log.info(f"Benchmark of {model}: {benchmark}")
+
+        manifest = {
+            "model": model,
+            "kind": kind,
+            "quantization": quantization,
+            "file_name": file_name,
+            "benchmark": benchmark,
+            "created_at": int(time.time()),
+        }
+        (build_dir / "manifest.json").write_text(json.dumps(manifest))
+
+        shutil.rmtree(model_dir, ignore_errors=True)
+        build_dir.rename(model_dir)
+        return manifest
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+
+def delete_optimized_model(model: str, kind: ModelKind) -> bool:
+    model_dir = get_optimized_model_dir(model, kind)
+    if not model_dir.exists():
+        return False
+    shutil.rmtree(model_dir)
+    return True
@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from open_webui.config import (
+    ENABLE_RAG_RERANKING_CACHE,
+    RAG_RERANKING_CACHE_SIZE,
+    RAG_RERANKING_CACHE_TTL,
+    RAG_COLBERT_CACHE_SIZE,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with an optional TTL, and hit/miss counters."""
+
+    def __init__(self, enabled: bool = True, size: int = 10000, ttl: int = 0):
+        self.enabled = enabled and size > 0
+        self.size = size
+        self.ttl = ttl
+
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get_many(self, keys: list[str]) -> list[Optional[Any]]:
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] and entry[0] < now:
+                    del self._entries[key]
+                    entry = None
+
+                if entry is None:
+                    values.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    values.append(entry[1])
+
+            hits = sum(value is not None for value in values)
+            self._stats["hits"] += hits
+            self._stats["misses"] += len(values) - hits
+        return values
+
+    def set_many(self, items: dict[str, Any]):
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            total = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "size": self.size,
+                "ttl": self.ttl,
+                "hit_rate": self._stats["hits"] / total if total else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class RerankingCache(LRUCache):
+    """
+    Reranking scores keyed by reranker model, query and chunk content.
+
+    Follow-up questions, regenerations and the several generated queries of
+    a request rerank mostly the same (query, chunk) pairs, so only the pairs
+    missing from the cache are scored.
+    """
+
+    @staticmethod
+    def get_key(model_id: str, query: str, text: str) -> str:
+        # Whitespace doesn't change what the query asks for
+        query = " ".join(query.split())
+        return hashlib.sha256(
+            "\0".join([model_id, query, get_content_hash(text)]).encode()
+        ).hexdigest()
+
+    def wrap(self, reranking_function) -> Callable[[str, list[str]], Any]:
+        """
+        Score `texts` against `query` with `reranking_function.predict`,
+        reusing cached scores. Rerankers without a `model_id`, or whose
+        scores depend on the other candidates (`cacheable_scores = False`),
+        are called directly.
+        """
+        model_id = getattr(reranking_function, "model_id", None)
+
+        def predict(query: str, texts: list[str]):
+            if (
+                not self.enabled
+                or not isinstance(model_id, str)
+                or not getattr(reranking_function, "cacheable_scores", True)
+            ):
+                return reranking_function.predict([(query, text) for text in texts])
+
+            keys = [self.get_key(model_id, query, text) for text in texts]
+            scores = self.get_many(keys)
+
+            pending = {}
+            for key, text, score in zip(keys, texts, scores):
+                if score is None:
+                    pending.setdefault(key, text)
+
+            if pending:
+                computed = reranking_function.predict(
+                    [(query, text) for text in pending.values()]
+                )
+                if computed is None:
+                    return None
+
+                computed = dict(zip(pending.keys(), map(float, computed)))
+                self.set_many(computed)
+                scores = [
+                    score if score is not None else computed[key]
+                    for key, score in zip(keys, scores)
+                ]
+
+            return scores
+
+        return predict
+
+
+RERANKING_CACHE = RerankingCache(
+    enabled=ENABLE_RAG_RERANKING_CACHE,
+    size=RAG_RERANKING_CACHE_SIZE,
+    ttl=RAG_RERANKING_CACHE_TTL,
+)
+
+# Token embeddings of chunks, keyed by ColBERT model and chunk content
+COLBERT_CACHE = LRUCache(
+    enabled=ENABLE_RAG_RERANKING_CACHE,
+    size=RAG_COLBERT_CACHE_SIZE,
+)
@@ -2,10 +2,8 @@ import logging
 import os
 from typing import Optional, Union
 
-import requests
 import hashlib
 from concurrent.futures import ThreadPoolExecutor
-import time
 
 from huggingface_hub import snapshot_download
 from langchain.retrievers import ContextualCompressionRetriever, EnsembleRetriever
@@ -14,17 +12,21 @@ from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
+from open_webui.retrieval.reranking_cache import RERANKING_CACHE
+from open_webui.retrieval.embedding_client import EMBEDDING_CLIENT
 
 from open_webui.models.users import UserModel
 from open_webui.models.files import Files
 
-from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.vector.main import GetResult, SearchResult
 
 
 from open_webui.env import (
     SRC_LOG_LEVELS,
     OFFLINE_MODE,
-    ENABLE_FORWARD_USER_INFO_HEADERS,
+    EMBEDDING_BATCH_SIZE,
 )
 from open_webui.config import (
     RAG_EMBEDDING_QUERY_PREFIX,
@@ -41,11 +43,6 @@ from typing import Any
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_core.retrievers import BaseRetriever
 
-# Add timeout configuration for embedding requests
-EMBEDDING_REQUEST_TIMEOUT = int(os.environ.get("EMBEDDING_REQUEST_TIMEOUT", "300"))  # 5 minutes default
-EMBEDDING_CONNECT_TIMEOUT = int(os.environ.get("EMBEDDING_CONNECT_TIMEOUT", "60"))   # 1 minute default
-EMBEDDING_MAX_RETRIES = int(os.environ.get("EMBEDDING_MAX_RETRIES", "3"))
-EMBEDDING_BATCH_SIZE = int(os.environ.get("EMBEDDING_BATCH_SIZE", "100"))  # Smaller batches for large files
 
 
 class VectorSearchRetriever(BaseRetriever):
@@ -80,6 +77,21 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
+class BM25IndexRetriever(BaseRetriever):
+    collection_name: Any
+    top_k: int
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        return BM25_INDEX.search(
+            collection_name=self.collection_name, query=query, k=self.top_k
+        )
+
+
 def query_doc(
     collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
 ):
@@ -100,6 +112,27 @@ def query_doc(
         raise e
 
 
+def query_doc_batch(
+    collection_name: str, query_embeddings: list[list[float]], k: int
+) -> list[Optional[SearchResult]]:
+    try:
+        log.debug(f"query_doc_batch:doc {collection_name} ({len(query_embeddings)})")
+        results = VECTOR_DB_CLIENT.search_batch(
+            collection_name=collection_name,
+            vectors=query_embeddings,
+            limit=k,
+        )
+
+        for result in results:
+            if result:
+                log.info(f"query_doc:result {result.ids} {result.metadatas}")
+
+        return results
+    except Exception as e:
+        log.exception(f"Error querying doc {collection_name} with limit {k}: {e}")
+        raise e
+
+
 def get_doc(collection_name: str, user: UserModel = None):
     try:
         log.debug(f"get_doc:doc {collection_name}")
@@ -114,9 +147,35 @@ def get_doc(collection_name: str, user: UserModel = None):
         raise e
 
 
+def ensure_bm25_index(collection_name: str) -> bool:
+    """
+    Make sure the persistent BM25 index of a collection exists, backfilling it
+    from the vector DB once for collections that predate the index.
+    """
+    if not BM25_INDEX.enabled:
+        return False
+
+    if BM25_INDEX.has_index(collection_name):
+        return True
+
+    log.info(f"ensure_bm25_index: backfilling BM25 index for {collection_name}")
+    result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+    if result is None:
+        return False
+
+    BM25_INDEX.build(collection_name, result)
+
+    # Chunks added or deleted during the backfill skipped the index, as it
+    # didn't exist yet, catch up with them
+    latest = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+    if latest is not None:
+        BM25_INDEX.reconcile(collection_name, result, latest)
+    return True
+
+
 def query_doc_with_hybrid_search(
     collection_name: str,
-    collection_result: GetResult,
+    collection_result: Optional[GetResult],
     query: str,
     embedding_function,
     k: int,
@@ -127,11 +186,23 @@ def query_doc_with_hybrid_search(
 ) -> dict:
     try:
         log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=collection_result.documents[0],
-            metadatas=collection_result.metadatas[0],
-        )
-        bm25_retriever.k = k
+        bm25_retriever = None
+        if hybrid_bm25_weight <= 0:
+            pass
+        elif collection_result is None and ensure_bm25_index(collection_name):
+            bm25_retriever = BM25IndexRetriever(
+                collection_name=collection_name, top_k=k
+            )
+        else:
+            if collection_result is None:
+                collection_result = VECTOR_DB_CLIENT.get(
+                    collection_name=collection_name
+                )
+            bm25_retriever = BM25Retriever.from_texts(
+                texts=collection_result.documents[0],
+                metadatas=collection_result.metadatas[0],
+            )
+            bm25_retriever.k = k
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
@@ -281,20 +352,22 @@ def query_collection(
     results = []
     error = False
 
-    def process_query_collection(collection_name, query_embedding):
+    def process_query_collection(collection_name, query_embeddings):
         try:
             if collection_name:
-                result = query_doc(
+                # All queries for a collection go out in a single search
+                results = query_doc_batch(
                     collection_name=collection_name,
+                    query_embeddings=query_embeddings,
                     k=k,
-                    query_embedding=query_embedding,
                 )
-                if result is not None:
-                    return result.model_dump(), None
-            return None, None
+                return [
+                    result.model_dump() for result in results if result is not None
+                ], None
+            return [], None
         except Exception as e:
             log.exception(f"Error when querying the collection: {e}")
-            return None, e
+            return [], e
 
     # Generate all query embeddings (in one call)
     query_embeddings = embedding_function(queries, prefix=RAG_EMBEDDING_QUERY_PREFIX)
@@ -303,20 +376,17 @@ def query_collection(
     )
 
     with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(
-                    process_query_collection, collection_name, query_embedding
-                )
-                future_results.append(result)
+        future_results = [
+            executor.submit(process_query_collection, collection_name, query_embeddings)
+            for collection_name in collection_names
+        ]
         task_results = [future.result() for future in future_results]
 
-    for result, err in task_results:
+    for collection_results, err in task_results:
         if err is not None:
             error = True
-        elif result is not None:
-            results.append(result)
+        else:
+            results.extend(collection_results)
 
     if error and not results:
         log.warning("All collection queries failed. No results returned.")
@@ -336,20 +406,27 @@ def query_collection_with_hybrid_search(
 ) -> dict:
     results = []
     error = False
-    # Fetch collection data once per collection sequentially
-    # Avoid fetching the same data multiple times later
+    # Resolve the lexical side once per collection. With the persistent BM25
+    # index the documents are never pulled from the vector DB (except for a
+    # one-off backfill); otherwise fall back to fetching the whole collection.
     collection_results = {}
+    valid_collection_names = []
     for collection_name in collection_names:
         try:
-            log.debug(
-                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
-            )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
-            )
+            if hybrid_bm25_weight <= 0 or ensure_bm25_index(collection_name):
+                collection_results[collection_name] = None
+            else:
+                log.debug(
+                    f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
+                )
+                collection_results[collection_name] = VECTOR_DB_CLIENT.get(
+                    collection_name=collection_name
+                )
+                if collection_results[collection_name] is None:
+                    continue
+            valid_collection_names.append(collection_name)
         except Exception as e:
             log.exception(f"Failed to fetch collection {collection_name}: {e}")
-            collection_results[collection_name] = None
 
     log.info(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
@@ -374,13 +451,8 @@ def query_collection_with_hybrid_search(
             return None, e
 
     # Prepare tasks for all collections and queries
-    # Avoid running any tasks for collections that failed to fetch data (have assigned None)
-    tasks = [
-        (cn, q)
-        for cn in collection_names
-        if collection_results[cn] is not None
-        for q in queries
-    ]
+    # Avoid running any tasks for collections that failed to fetch data
+    tasks = [(cn, q) for cn in valid_collection_names for q in queries]
 
     with ThreadPoolExecutor() as executor:
         future_results = [executor.submit(process_query, cn, q) for cn, q in tasks]
@@ -410,10 +482,18 @@ def get_embedding_function(
     azure_api_version=None,
 ):
     if embedding_engine == "":
-        return lambda query, prefix=None, user=None: embedding_function.encode(
+        func = lambda query, prefix=None, user=None: embedding_function.encode(
             query, **({"prompt": prefix} if prefix else {})
         ).tolist()
+        return EMBEDDING_CACHE.wrap(
+            func,
+            embedding_engine,
+            embedding_model,
+            model_format=getattr(embedding_function, "model_format", None),
+        )
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
+        # Batches of `embedding_batch_size` are sent concurrently by the
+        # embedding client
         func = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
             model=embedding_model,
@@ -423,25 +503,15 @@ def get_embedding_function(
             key=key,
             user=user,
             azure_api_version=azure_api_version,
+            batch_size=embedding_batch_size,
         )
 
-        def generate_multiple(query, prefix, user, func):
-            if isinstance(query, list):
-                embeddings = []
-                for i in range(0, len(query), embedding_batch_size):
-                    embeddings.extend(
-                        func(
-                            query[i : i + embedding_batch_size],
-                            prefix=prefix,
-                            user=user,
-                        )
-                    )
-                return embeddings
-            else:
-                return func(query, prefix, user)
-
-        return lambda query, prefix=None, user=None: generate_multiple(
-            query, prefix, user, func
+        return EMBEDDING_CACHE.wrap(
+            func,
+            embedding_engine,
+            embedding_model,
+            url=url,
+            api_version=azure_api_version,
         )
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
@@ -678,113 +748,27 @@ def generate_openai_batch_embeddings(
     key: str = "",
     prefix: str = None,
     user: UserModel = None,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
 ) -> Optional[list[list[float]]]:
-    """
-    Generate embeddings with improved timeout handling and retry logic.
-    For large files, this will automatically chunk the requests.
-    """
     try:
         log.debug(
             f"generate_openai_batch_embeddings:model {model} batch size: {len(texts)}"
         )
-        
-        # For large batches, chunk them to avoid timeouts
-        if len(texts) > EMBEDDING_BATCH_SIZE:
-            log.info(f"Large batch detected ({len(texts)} texts), chunking into batches of {EMBEDDING_BATCH_SIZE}")
-            all_embeddings = []
-            for i in range(0, len(texts), EMBEDDING_BATCH_SIZE):
-                chunk = texts[i:i + EMBEDDING_BATCH_SIZE]
-                chunk_embeddings = _generate_openai_embeddings_chunk(
-                    model, chunk, url, key, prefix, user
-                )
-                if chunk_embeddings is None:
-                    log.error(f"Failed to generate embeddings for chunk {i//EMBEDDING_BATCH_SIZE + 1}")
-                    return None
-                all_embeddings.extend(chunk_embeddings)
-            return all_embeddings
-        else:
-            return _generate_openai_embeddings_chunk(model, texts, url, key, prefix, user)
-            
+        return EMBEDDING_CLIENT.embed_sync(
+            "openai",
+            model,
+            texts,
+            url,
+            key,
+            prefix=prefix,
+            user=user,
+            batch_size=batch_size,
+        )
     except Exception as e:
         log.exception(f"Error generating openai batch embeddings: {e}")
         return None
 
 
-def _generate_openai_embeddings_chunk(
-    model: str,
-    texts: list[str],
-    url: str,
-    key: str,
-    prefix: str,
-    user: UserModel,
-) -> Optional[list[list[float]]]:
-    """Helper function to generate embeddings for a single chunk with retry logic."""
-    json_data = {"input": texts, "model": model}
-    if isinstance(RAG_EMBEDDING_PREFIX_FIELD_NAME, str) and isinstance(prefix, str):
-        json_data[RAG_EMBEDDING_PREFIX_FIELD_NAME] = prefix
-
-    for attempt in range(EMBEDDING_MAX_RETRIES):
-        try:
-            r = requests.post(
-                f"{url}/embeddings",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {key}",
-                    **(
-                        {
-                            "X-OpenWebUI-User-Name": user.name,
-                            "X-OpenWebUI-User-Id": user.id,
-                            "X-OpenWebUI-User-Email": user.email,
-                            "X-OpenWebUI-User-Role": user.role,
-                        }
-                        if ENABLE_FORWARD_USER_INFO_HEADERS and user
-                        else {}
-                    ),
-                },
-                json=json_data,
-                timeout=(EMBEDDING_CONNECT_TIMEOUT, EMBEDDING_REQUEST_TIMEOUT),
-            )
-            r.raise_for_status()
-            data = r.json()
-            if "data" in data:
-                return [elem["embedding"] for elem in data["data"]]
-            else:
-                raise Exception("Invalid response format from embedding API")
-                
-        except requests.exceptions.Timeout as e:
-            log.warning(f"Timeout on attempt {attempt + 1}/{EMBEDDING_MAX_RETRIES}: {e}")
-            if attempt < EMBEDDING_MAX_RETRIES - 1:
-                # Exponential backoff: 2^attempt seconds
-                backoff_time = 2 ** attempt
-                log.info(f"Retrying in {backoff_time} seconds...")
-                time.sleep(backoff_time)
-            else:
-                log.error(f"All {EMBEDDING_MAX_RETRIES} attempts timed out")
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response and e.response.status_code == 429:  # Rate limit
-                retry_after = float(e.response.headers.get("Retry-After", "1"))
-                log.warning(f"Rate limit hit, retrying in {retry_after} seconds")
-                time.sleep(retry_after)
-                continue
-            else:
-                log.error(f"Request failed on attempt {attempt + 1}: {e}")
-                if attempt < EMBEDDING_MAX_RETRIES - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    return None
-                    
-        except Exception as e:
-            log.error(f"Unexpected error on attempt {attempt + 1}: {e}")
-            if attempt < EMBEDDING_MAX_RETRIES - 1:
-                time.sleep(2 ** attempt)
-            else:
-                return None
-    
-    return None
-
-
 def generate_azure_openai_batch_embeddings(
     model: str,
     texts: list[str],
@@ -793,116 +777,28 @@ def generate_azure_openai_batch_embeddings(
     version: str = "",
     prefix: str = None,
     user: UserModel = None,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
 ) -> Optional[list[list[float]]]:
-    """
-    Generate Azure OpenAI embeddings with improved timeout handling and retry logic.
-    For large files, this will automatically chunk the requests.
-    """
     try:
         log.debug(
             f"generate_azure_openai_batch_embeddings:deployment {model} batch size: {len(texts)}"
         )
-        
-        # For large batches, chunk them to avoid timeouts
-        if len(texts) > EMBEDDING_BATCH_SIZE:
-            log.info(f"Large batch detected ({len(texts)} texts), chunking into batches of {EMBEDDING_BATCH_SIZE}")
-            all_embeddings = []
-            for i in range(0, len(texts), EMBEDDING_BATCH_SIZE):
-                chunk = texts[i:i + EMBEDDING_BATCH_SIZE]
-                chunk_embeddings = _generate_azure_openai_embeddings_chunk(
-                    model, chunk, url, key, version, prefix, user
-                )
-                if chunk_embeddings is None:
-                    log.error(f"Failed to generate embeddings for chunk {i//EMBEDDING_BATCH_SIZE + 1}")
-                    return None
-                all_embeddings.extend(chunk_embeddings)
-            return all_embeddings
-        else:
-            return _generate_azure_openai_embeddings_chunk(model, texts, url, key, version, prefix, user)
-            
+        return EMBEDDING_CLIENT.embed_sync(
+            "azure_openai",
+            model,
+            texts,
+            url,
+            key,
+            prefix=prefix,
+            user=user,
+            azure_api_version=version,
+            batch_size=batch_size,
+        )
     except Exception as e:
         log.exception(f"Error generating azure openai batch embeddings: {e}")
         return None
 
 
-def _generate_azure_openai_embeddings_chunk(
-    model: str,
-    texts: list[str],
-    url: str,
-    key: str,
-    version: str,
-    prefix: str,
-    user: UserModel,
-) -> Optional[list[list[float]]]:
-    """Helper function to generate Azure OpenAI embeddings for a single chunk with retry logic."""
-    json_data = {"input": texts}
-    if isinstance(RAG_EMBEDDING_PREFIX_FIELD_NAME, str) and isinstance(prefix, str):
-        json_data[RAG_EMBEDDING_PREFIX_FIELD_NAME] = prefix
-
-    api_url = f"{url}/openai/deployments/{model}/embeddings?api-version={version}"
-
-    for attempt in range(EMBEDDING_MAX_RETRIES):
-        try:
-            r = requests.post(
-                api_url,
-                headers={
-                    "Content-Type": "application/json",
-                    "api-key": key,
-                    **(
-                        {
-                            "X-OpenWebUI-User-Name": user.name,
-                            "X-OpenWebUI-User-Id": user.id,
-                            "X-OpenWebUI-User-Email": user.email,
-                            "X-OpenWebUI-User-Role": user.role,
-                        }
-                        if ENABLE_FORWARD_USER_INFO_HEADERS and user
-                        else {}
-                    ),
-                },
-                json=json_data,
-                timeout=(EMBEDDING_CONNECT_TIMEOUT, EMBEDDING_REQUEST_TIMEOUT),
-            )
-            r.raise_for_status()
-            data = r.json()
-            if "data" in data:
-                return [elem["embedding"] for elem in data["data"]]
-            else:
-                raise Exception("Invalid response format from Azure embedding API")
-                
-        except requests.exceptions.Timeout as e:
-            log.warning(f"Timeout on attempt {attempt + 1}/{EMBEDDING_MAX_RETRIES}: {e}")
-            if attempt < EMBEDDING_MAX_RETRIES - 1:
-                # Exponential backoff: 2^attempt seconds
-                backoff_time = 2 ** attempt
-                log.info(f"Retrying in {backoff_time} seconds...")
-                time.sleep(backoff_time)
-            else:
-                log.error(f"All {EMBEDDING_MAX_RETRIES} attempts timed out")
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response and e.response.status_code == 429:  # Rate limit
-                retry_after = float(e.response.headers.get("Retry-After", "1"))
-                log.warning(f"Azure API rate limit hit, retrying in {retry_after} seconds")
-                time.sleep(retry_after)
-                continue
-            else:
-                log.error(f"Azure API request failed on attempt {attempt + 1}: {e}")
-                if attempt < EMBEDDING_MAX_RETRIES - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    return None
-                    
-        except Exception as e:
-            log.error(f"Unexpected error on attempt {attempt + 1}: {e}")
-            if attempt < EMBEDDING_MAX_RETRIES - 1:
-                time.sleep(2 ** attempt)
-            else:
-                return None
-    
-    return None
-
-
 def generate_ollama_batch_embeddings(
     model: str,
     texts: list[str],
@@ -910,108 +806,27 @@ def generate_ollama_batch_embeddings(
     key: str = "",
     prefix: str = None,
     user: UserModel = None,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
 ) -> Optional[list[list[float]]]:
-    """
-    Generate Ollama embeddings with improved timeout handling and retry logic.
-    For large files, this will automatically chunk the requests.
-    """
     try:
         log.debug(
             f"generate_ollama_batch_embeddings:model {model} batch size: {len(texts)}"
         )
-        
-        # For large batches, chunk them to avoid timeouts
-        if len(texts) > EMBEDDING_BATCH_SIZE:
-            log.info(f"Large batch detected ({len(texts)} texts), chunking into batches of {EMBEDDING_BATCH_SIZE}")
-            all_embeddings = []
-            for i in range(0, len(texts), EMBEDDING_BATCH_SIZE):
-                chunk = texts[i:i + EMBEDDING_BATCH_SIZE]
-                chunk_embeddings = _generate_ollama_embeddings_chunk(
-                    model, chunk, url, key, prefix, user
-                )
-                if chunk_embeddings is None:
-                    log.error(f"Failed to generate embeddings for chunk {i//EMBEDDING_BATCH_SIZE + 1}")
-                    return None
-                all_embeddings.extend(chunk_embeddings)
-            return all_embeddings
-        else:
-            return _generate_ollama_embeddings_chunk(model, texts, url, key, prefix, user)
-            
+        return EMBEDDING_CLIENT.embed_sync(
+            "ollama",
+            model,
+            texts,
+            url,
+            key,
+            prefix=prefix,
+            user=user,
+            batch_size=batch_size,
+        )
     except Exception as e:
         log.exception(f"Error generating ollama batch embeddings: {e}")
         return None
 
 
-def _generate_ollama_embeddings_chunk(
-    model: str,
-    texts: list[str],
-    url: str,
-    key: str,
-    prefix: str,
-    user: UserModel,
-) -> Optional[list[list[float]]]:
-    """Helper function to generate Ollama embeddings for a single chunk with retry logic."""
-    json_data = {"input": texts, "model": model}
-    if isinstance(RAG_EMBEDDING_PREFIX_FIELD_NAME, str) and isinstance(prefix, str):
-        json_data[RAG_EMBEDDING_PREFIX_FIELD_NAME] = prefix
-
-    for attempt in range(EMBEDDING_MAX_RETRIES):
-        try:
-            r = requests.post(
-                f"{url}/api/embed",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {key}",
-                    **(
-                        {
-                            "X-OpenWebUI-User-Name": user.name,
-                            "X-OpenWebUI-User-Id": user.id,
-                            "X-OpenWebUI-User-Email": user.email,
-                            "X-OpenWebUI-User-Role": user.role,
-                        }
-                        if ENABLE_FORWARD_USER_INFO_HEADERS
-                        else {}
-                    ),
-                },
-                json=json_data,
-                timeout=(EMBEDDING_CONNECT_TIMEOUT, EMBEDDING_REQUEST_TIMEOUT),
-            )
-            r.raise_for_status()
-            data = r.json()
-
-            if "embeddings" in data:
-                return data["embeddings"]
-            else:
-                raise Exception("Invalid response format from Ollama embedding API")
-                
-        except requests.exceptions.Timeout as e:
-            log.warning(f"Timeout on attempt {attempt + 1}/{EMBEDDING_MAX_RETRIES}: {e}")
-            if attempt < EMBEDDING_MAX_RETRIES - 1:
-                # Exponential backoff: 2^attempt seconds
-                backoff_time = 2 ** attempt
-                log.info(f"Retrying in {backoff_time} seconds...")
-                time.sleep(backoff_time)
-            else:
-                log.error(f"All {EMBEDDING_MAX_RETRIES} attempts timed out")
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            log.error(f"Ollama API request failed on attempt {attempt + 1}: {e}")
-            if attempt < EMBEDDING_MAX_RETRIES - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-            else:
-                return None
-                
-        except Exception as e:
-            log.error(f"Unexpected error on attempt {attempt + 1}: {e}")
-            if attempt < EMBEDDING_MAX_RETRIES - 1:
-                time.sleep(2 ** attempt)
-            else:
-                return None
-    
-    return None
-
-
 def generate_embeddings(
     engine: str,
     model: str,
@@ -1022,6 +837,7 @@ def generate_embeddings(
     url = kwargs.get("url", "")
     key = kwargs.get("key", "")
     user = kwargs.get("user")
+    batch_size = kwargs.get("batch_size", EMBEDDING_BATCH_SIZE)
 
     if prefix is not None and RAG_EMBEDDING_PREFIX_FIELD_NAME is None:
         if isinstance(text, list):
@@ -1038,12 +854,19 @@ def generate_embeddings(
                 "key": key,
                 "prefix": prefix,
                 "user": user,
+                "batch_size": batch_size,
             }
         )
         return embeddings[0] if isinstance(text, str) else embeddings
     elif engine == "openai":
         embeddings = generate_openai_batch_embeddings(
-            model, text if isinstance(text, list) else [text], url, key, prefix, user
+            model,
+            text if isinstance(text, list) else [text],
+            url,
+            key,
+            prefix,
+            user,
+            batch_size,
         )
         return embeddings[0] if isinstance(text, str) else embeddings
     elif engine == "azure_openai":
@@ -1056,6 +879,7 @@ def generate_embeddings(
             azure_api_version,
             prefix,
             user,
+            batch_size,
         )
         return embeddings[0] if isinstance(text, str) else embeddings
 
@@ -1086,8 +910,8 @@ class RerankCompressor(BaseDocumentCompressor):
         reranking = self.reranking_function is not None
 
         if reranking:
-            scores = self.reranking_function.predict(
-                [(query, doc.page_content) for doc in documents]
+            scores = RERANKING_CACHE.wrap(self.reranking_function)(
+                query, [doc.page_content for doc in documents]
             )
         else:
             from sentence_transformers import util
@@ -29,6 +29,8 @@ log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class ChromaClient(VectorDBBase):
+    supports_batch_search = True
+
     def __init__(self):
         settings_dict = {
             "allow_reset": True,
@@ -82,9 +84,9 @@ class ChromaClient(VectorDBBase):
 
                 # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
                 # https://docs.trychroma.com/docs/collections/configure cosine equation
-                distances: list = result["distances"][0]
-                distances = [2 - dist for dist in distances]
-                distances = [[dist / 2 for dist in distances]]
+                distances = [
+                    [(2 - dist) / 2 for dist in row] for row in result["distances"]
+                ]
 
                 return SearchResult(
                     **{
@@ -121,6 +123,33 @@ class ChromaClient(VectorDBBase):
         except:
             return None
 
+    def query_embeddings(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        try:
+            collection = self.client.get_collection(name=collection_name)
+            if collection:
+                result = collection.get(
+                    where=filter,
+                    limit=limit,
+                    include=["documents", "metadatas", "embeddings"],
+                )
+
+                return GetResult(
+                    **{
+                        "ids": [result["ids"]],
+                        "documents": [result["documents"]],
+                        "metadatas": [result["metadatas"]],
+                        "embeddings": [
+                            [list(map(float, e)) for e in result["embeddings"]]
+                        ],
+                    }
+                )
+            return None
+        except Exception as e:
+            log.debug(f"Error querying embeddings of '{collection_name}': {e}")
+            return None
+
     def get(self, collection_name: str) -> Optional[GetResult]:
         # Get all the items in the collection.
         collection = self.client.get_collection(name=collection_name)
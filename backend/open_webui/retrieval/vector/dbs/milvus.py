@@ -26,6 +26,8 @@ log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class MilvusClient(VectorDBBase):
+    supports_batch_search = True
+
     def __init__(self):
         self.collection_prefix = "open_webui"
         if MILVUS_TOKEN is None:
@@ -72,6 +72,8 @@ class DocumentChunk(Base):
 
 
 class PgvectorClient(VectorDBBase):
+    supports_batch_search = True
+
     def __init__(self) -> None:
 
         # if no pgvector uri, use the existing database connection
@@ -462,6 +464,49 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during query: {e}")
             return None
 
+    def query_embeddings(
+        self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        try:
+            where_clauses = [DocumentChunk.collection_name == collection_name]
+            if PGVECTOR_PGCRYPTO:
+                text_column = pgcrypto_decrypt(
+                    DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
+                )
+                metadata_column = pgcrypto_decrypt(
+                    DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                )
+            else:
+                text_column = DocumentChunk.text
+                metadata_column = DocumentChunk.vmetadata
+
+            for key, value in filter.items():
+                where_clauses.append(metadata_column[key].astext == str(value))
+
+            stmt = select(
+                DocumentChunk.id,
+                DocumentChunk.vector,
+                text_column.label("text"),
+                metadata_column.label("vmetadata"),
+            ).where(*where_clauses)
+            if limit is not None:
+                stmt = stmt.limit(limit)
+            results = self.session.execute(stmt).all()
+
+            if not results:
+                return None
+
+            return GetResult(
+                ids=[[result.id for result in results]],
+                documents=[[result.text for result in results]],
+                metadatas=[[result.vmetadata for result in results]],
+                embeddings=[[list(map(float, result.vector)) for result in results]],
+            )
+        except Exception as e:
+            log.exception(f"Error during query: {e}")
+            self.session.rollback()
+            return None
+
     def get(
         self, collection_name: str, limit: Optional[int] = None
     ) -> Optional[GetResult]:
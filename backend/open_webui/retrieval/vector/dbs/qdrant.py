@@ -28,6 +28,8 @@ log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class QdrantClient(VectorDBBase):
+    supports_batch_search = True
+
     def __init__(self):
         self.collection_prefix = "open-webui"
         self.QDRANT_URI = QDRANT_URI
@@ -121,18 +123,31 @@ class QdrantClient(VectorDBBase):
         if limit is None:
             limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
 
-        query_response = self.client.query_points(
+        # All query vectors are answered in a single request
+        query_responses = self.client.query_batch_points(
             collection_name=f"{self.collection_prefix}_{collection_name}",
-            query=vectors[0],
-            limit=limit,
+            requests=[
+                models.QueryRequest(query=vector, limit=limit, with_payload=True)
+                for vector in vectors
+            ],
         )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
+
+        ids, documents, metadatas, distances = [], [], [], []
+        for query_response in query_responses:
+            get_result = self._result_to_get_result(query_response.points)
+            ids.extend(get_result.ids)
+            documents.extend(get_result.documents)
+            metadatas.extend(get_result.metadatas)
             # qdrant distance is [-1, 1], normalize to [0, 1]
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
+            distances.append(
+                [(point.score + 1.0) / 2.0 for point in query_response.points]
+            )
+
+        return SearchResult(
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            distances=distances,
         )
 
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None):
@@ -161,6 +176,33 @@ class QdrantClient(VectorDBBase):
             log.exception(f"Error querying a collection '{collection_name}': {e}")
             return None
 
+    def query_embeddings(
+        self, collection_name: str, filter: dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not self.has_collection(collection_name):
+            return None
+        try:
+            points = self.client.query_points(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                query_filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key=f"metadata.{key}", match=models.MatchValue(value=value)
+                        )
+                        for key, value in filter.items()
+                    ]
+                ),
+                limit=limit or NO_LIMIT,
+                with_vectors=True,
+            ).points
+
+            result = self._result_to_get_result(points)
+            result.embeddings = [[point.vector for point in points]]
+            return result
+        except Exception as e:
+            log.debug(f"Error querying embeddings of '{collection_name}': {e}")
+            return None
+
     def get(self, collection_name: str) -> Optional[GetResult]:
         # Get all the items in the collection.
         points = self.client.query_points(
@@ -14,6 +14,8 @@ class GetResult(BaseModel):
     ids: Optional[List[List[str]]]
     documents: Optional[List[List[str]]]
     metadatas: Optional[List[List[Any]]]
+    # Only set by `query_embeddings`
+    embeddings: Optional[List[List[List[float | int]]]] = None
 
 
 class SearchResult(GetResult):
@@ -58,6 +60,32 @@ class VectorDBBase(ABC):
         """Search for similar vectors in a collection."""
         pass
 
+    # Set by backends whose `search` answers several query vectors in a single
+    # request, returning one row of results per vector.
+    supports_batch_search: bool = False
+
+    def search_batch(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> List[Optional[SearchResult]]:
+        """Search with several query vectors, returning one result per vector."""
+        if self.supports_batch_search and len(vectors) > 1:
+            result = self.search(collection_name, vectors, limit)
+            if result is None:
+                return [None] * len(vectors)
+
+            if len(result.ids) == len(vectors):
+                return [
+                    SearchResult(
+                        ids=[result.ids[idx]],
+                        documents=[result.documents[idx]],
+                        metadatas=[result.metadatas[idx]],
+                        distances=[result.distances[idx]],
+                    )
+                    for idx in range(len(vectors))
+                ]
+
+        return [self.search(collection_name, [vector], limit) for vector in vectors]
+
     @abstractmethod
     def query(
         self, collection_name: str, filter: Dict, limit: Optional[int] = None
@@ -65,6 +93,15 @@ class VectorDBBase(ABC):
         """Query vectors from a collection using metadata filter."""
         pass
 
+    def query_embeddings(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        """
+        Query vectors from a collection using metadata filter, including the
+        stored embeddings. Backends that can't return embeddings return None.
+        """
+        return None
+
     @abstractmethod
     def get(self, collection_name: str) -> Optional[GetResult]:
         """Retrieve all vectors from a collection."""
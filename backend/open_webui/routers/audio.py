@@ -1,17 +1,21 @@
-import hashlib
+import asyncio
+import glob
 import json
 import logging
 import os
+import subprocess
+import threading
 import uuid
-from functools import lru_cache
+from functools import lru_cache, partial
 from pathlib import Path
 from pydub import AudioSegment
 from pydub.silence import split_on_silence
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from typing import Callable, Optional
 
 from fnmatch import fnmatch
 import aiohttp
+import anyio.from_thread
 import aiofiles
 import requests
 import mimetypes
@@ -28,7 +32,7 @@ from fastapi import (
     APIRouter,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
 
@@ -38,9 +42,13 @@ from open_webui.config import (
     WHISPER_MODEL_DIR,
     CACHE_DIR,
     WHISPER_LANGUAGE,
+    AUDIO_STT_CHUNK_DURATION,
+    AUDIO_STT_CHUNK_WORKERS,
+    ENABLE_AUDIO_TTS_STREAMING,
 )
 
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.utils.speech_cache import SPEECH_CACHE
 from open_webui.env import (
     AIOHTTP_CLIENT_SESSION_SSL,
     AIOHTTP_CLIENT_TIMEOUT,
@@ -62,8 +70,7 @@ AZURE_MAX_FILE_SIZE = AZURE_MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to byte
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["AUDIO"])
 
-SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
-SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+FASTER_WHISPER_MODEL_LOCK = threading.Lock()
 
 
 ##########################################
@@ -106,17 +113,82 @@ def is_audio_conversion_required(file_path):
         return False
 
 
-def convert_audio_to_mp3(file_path):
-    """Convert audio file to mp3 format."""
+def segment_audio(file_path, max_bytes, segment_time, bitrate="32k"):
+    """
+    Re-encode the audio of `file_path` to mono 16 kHz mp3 chunks of up to
+    `segment_time` seconds with ffmpeg's segment muxer. The recording is
+    streamed through ffmpeg rather than loaded into memory, and the path of
+    every chunk is yielded as soon as ffmpeg has finished writing it.
+    If the audio fits in `max_bytes` and needs no conversion, `file_path`
+    itself is the only chunk.
+    """
+    if os.path.getsize(file_path) <= max_bytes and not is_audio_conversion_required(
+        file_path
+    ):
+        yield file_path
+        return
+
+    # Keep chunks within max_bytes at the (constant) target bitrate
+    bytes_per_second = int(bitrate.rstrip("k")) * 1000 // 8
+    segment_time = max(min(segment_time, int(0.9 * max_bytes / bytes_per_second)), 1)
+
+    file_dir = os.path.dirname(file_path)
+    base = os.path.splitext(os.path.basename(file_path))[0]
+
+    process = subprocess.Popen(
+        [
+            AudioSegment.converter,
+            "-nostdin",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-i",
+            file_path,
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            "16000",
+            "-c:a",
+            "libmp3lame",
+            "-b:a",
+            bitrate,
+            "-f",
+            "segment",
+            "-segment_time",
+            str(segment_time),
+            "-reset_timestamps",
+            "1",
+            "-segment_list",
+            "pipe:1",
+            "-segment_list_type",
+            "flat",
+            os.path.join(file_dir, f"{base}_chunk_%04d.mp3"),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
     try:
-        output_path = os.path.splitext(file_path)[0] + ".mp3"
-        audio = AudioSegment.from_file(file_path)
-        audio.export(output_path, format="mp3")
-        log.info(f"Converted {file_path} to {output_path}")
-        return output_path
-    except Exception as e:
-        log.error(f"Error converting audio file: {e}")
-        return None
+        # ffmpeg lists every chunk once it's complete
+        for line in process.stdout:
+            if not line.strip():
+                continue
+
+            chunk_path = os.path.join(file_dir, os.path.basename(line.strip()))
+            if os.path.getsize(chunk_path) > max_bytes:
+                raise Exception("Audio chunk cannot be reduced below max file size.")
+            yield chunk_path
+
+        _, stderr = process.communicate()
+        if process.returncode != 0:
+            raise Exception(f"Error splitting audio: {stderr.strip()}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
 
 
 def set_faster_whisper_model(model: str, auto_update: bool = False):
@@ -130,6 +202,8 @@ def set_faster_whisper_model(model: str, auto_update: bool = False):
             "compute_type": "int8",
             "download_root": WHISPER_MODEL_DIR,
             "local_files_only": not auto_update,
+            # Lets the chunks of a recording be transcribed in parallel
+            "num_workers": AUDIO_STT_CHUNK_WORKERS,
         }
 
         try:
@@ -143,6 +217,17 @@ def set_faster_whisper_model(model: str, auto_update: bool = False):
     return whisper_model
 
 
+def get_faster_whisper_model(request):
+    """The loaded faster-whisper model, shared by all transcription workers."""
+    if request.app.state.faster_whisper_model is None:
+        with FASTER_WHISPER_MODEL_LOCK:
+            if request.app.state.faster_whisper_model is None:
+                request.app.state.faster_whisper_model = set_faster_whisper_model(
+                    request.app.state.config.WHISPER_MODEL
+                )
+    return request.app.state.faster_whisper_model
+
+
 ##########################################
 #
 # Audio API
@@ -304,20 +389,89 @@ def load_speech_pipeline(request):
         )
 
 
+async def send_speech_request(name: str, payload: dict, url: str, **kwargs) -> Response:
+    """
+    Send a speech request to the TTS engine and add the clip to the speech
+    cache. With ENABLE_AUDIO_TTS_STREAMING, the audio is forwarded to the
+    client as it arrives and only cached once complete, so the response
+    starts with the first chunk from the engine rather than after the whole
+    clip was received.
+    """
+    r = None
+    session = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT), trust_env=True
+    )
+    try:
+        r = await session.post(url, ssl=AIOHTTP_CLIENT_SESSION_SSL, **kwargs)
+        r.raise_for_status()
+    except Exception as e:
+        log.exception(e)
+        detail = None
+
+        try:
+            if r.status != 200:
+                res = await r.json()
+                if "error" in res:
+                    detail = f"External: {res['error'].get('message', '')}"
+        except Exception:
+            detail = f"External: {e}"
+
+        if r is not None:
+            r.close()
+        await session.close()
+
+        raise HTTPException(
+            status_code=getattr(r, "status", 500) if r else 500,
+            detail=detail if detail else "Open WebUI: Server Connection Error",
+        )
+
+    temp_path = SPEECH_CACHE.create_temp_path(name)
+
+    async def stream_and_cache():
+        completed = False
+        try:
+            async with aiofiles.open(temp_path, "wb") as f:
+                async for chunk in r.content.iter_any():
+                    await f.write(chunk)
+                    yield chunk
+
+            async with aiofiles.open(SPEECH_CACHE.get_payload_path(name), "w") as f:
+                await f.write(json.dumps(payload))
+
+            SPEECH_CACHE.add(name, temp_path)
+            completed = True
+        finally:
+            r.close()
+            await session.close()
+            if not completed:
+                temp_path.unlink(missing_ok=True)
+
+    if ENABLE_AUDIO_TTS_STREAMING:
+        return StreamingResponse(stream_and_cache(), media_type="audio/mpeg")
+
+    try:
+        async for _ in stream_and_cache():
+            pass
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=500, detail="Open WebUI: Server Connection Error"
+        )
+    return FileResponse(SPEECH_CACHE.get_path(name))
+
+
 @router.post("/speech")
 async def speech(request: Request, user=Depends(get_verified_user)):
     body = await request.body()
-    name = hashlib.sha256(
-        body
-        + str(request.app.state.config.TTS_ENGINE).encode("utf-8")
-        + str(request.app.state.config.TTS_MODEL).encode("utf-8")
-    ).hexdigest()
-
-    file_path = SPEECH_CACHE_DIR.joinpath(f"{name}.mp3")
-    file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
+    name = SPEECH_CACHE.get_key(
+        body,
+        request.app.state.config.TTS_ENGINE,
+        request.app.state.config.TTS_MODEL,
+    )
 
     # Check if the file already exists in the cache
-    if file_path.is_file():
+    file_path = SPEECH_CACHE.get(name)
+    if file_path is not None:
         return FileResponse(file_path)
 
     payload = None
@@ -330,57 +484,26 @@ async def speech(request: Request, user=Depends(get_verified_user)):
     if request.app.state.config.TTS_ENGINE == "openai":
         payload["model"] = request.app.state.config.TTS_MODEL
 
-        try:
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    url=f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech",
-                    json=payload,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {request.app.state.config.TTS_OPENAI_API_KEY}",
-                        **(
-                            {
-                                "X-OpenWebUI-User-Name": user.name,
-                                "X-OpenWebUI-User-Id": user.id,
-                                "X-OpenWebUI-User-Email": user.email,
-                                "X-OpenWebUI-User-Role": user.role,
-                            }
-                            if ENABLE_FORWARD_USER_INFO_HEADERS
-                            else {}
-                        ),
-                    },
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
-
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
-
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
-
-            return FileResponse(file_path)
-
-        except Exception as e:
-            log.exception(e)
-            detail = None
-
-            try:
-                if r.status != 200:
-                    res = await r.json()
-
-                    if "error" in res:
-                        detail = f"External: {res['error'].get('message', '')}"
-            except Exception:
-                detail = f"External: {e}"
-
-            raise HTTPException(
-                status_code=getattr(r, "status", 500) if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
-            )
+        return await send_speech_request(
+            name,
+            payload,
+            f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/speech",
+            json=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {request.app.state.config.TTS_OPENAI_API_KEY}",
+                **(
+                    {
+                        "X-OpenWebUI-User-Name": user.name,
+                        "X-OpenWebUI-User-Id": user.id,
+                        "X-OpenWebUI-User-Email": user.email,
+                        "X-OpenWebUI-User-Role": user.role,
+                    }
+                    if ENABLE_FORWARD_USER_INFO_HEADERS
+                    else {}
+                ),
+            },
+        )
 
     elif request.app.state.config.TTS_ENGINE == "elevenlabs":
         voice_id = payload.get("voice", "")
@@ -391,119 +514,47 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                 detail="Invalid voice id",
             )
 
-        try:
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
-                    json={
-                        "text": payload["input"],
-                        "model_id": request.app.state.config.TTS_MODEL,
-                        "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
-                    },
-                    headers={
-                        "Accept": "audio/mpeg",
-                        "Content-Type": "application/json",
-                        "xi-api-key": request.app.state.config.TTS_API_KEY,
-                    },
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
-
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
-
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
-
-            return FileResponse(file_path)
-
-        except Exception as e:
-            log.exception(e)
-            detail = None
-
-            try:
-                if r.status != 200:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error'].get('message', '')}"
-            except Exception:
-                detail = f"External: {e}"
-
-            raise HTTPException(
-                status_code=getattr(r, "status", 500) if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
-            )
+        return await send_speech_request(
+            name,
+            payload,
+            f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream",
+            json={
+                "text": payload["input"],
+                "model_id": request.app.state.config.TTS_MODEL,
+                "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
+            },
+            headers={
+                "Accept": "audio/mpeg",
+                "Content-Type": "application/json",
+                "xi-api-key": request.app.state.config.TTS_API_KEY,
+            },
+        )
 
     elif request.app.state.config.TTS_ENGINE == "azure":
-        try:
-            payload = json.loads(body.decode("utf-8"))
-        except Exception as e:
-            log.exception(e)
-            raise HTTPException(status_code=400, detail="Invalid JSON payload")
-
         region = request.app.state.config.TTS_AZURE_SPEECH_REGION or "eastus"
         base_url = request.app.state.config.TTS_AZURE_SPEECH_BASE_URL
         language = request.app.state.config.TTS_VOICE
         locale = "-".join(request.app.state.config.TTS_VOICE.split("-")[:1])
         output_format = request.app.state.config.TTS_AZURE_SPEECH_OUTPUT_FORMAT
 
-        try:
-            data = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{locale}">
+        data = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{locale}">
                 <voice name="{language}">{payload["input"]}</voice>
             </speak>"""
-            timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
-                async with session.post(
-                    (base_url or f"https://{region}.tts.speech.microsoft.com")
-                    + "/cognitiveservices/v1",
-                    headers={
-                        "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
-                        "Content-Type": "application/ssml+xml",
-                        "X-Microsoft-OutputFormat": output_format,
-                    },
-                    data=data,
-                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
-                ) as r:
-                    r.raise_for_status()
-
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await r.read())
-
-                    async with aiofiles.open(file_body_path, "w") as f:
-                        await f.write(json.dumps(payload))
-
-                    return FileResponse(file_path)
-
-        except Exception as e:
-            log.exception(e)
-            detail = None
 
-            try:
-                if r.status != 200:
-                    res = await r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error'].get('message', '')}"
-            except Exception:
-                detail = f"External: {e}"
-
-            raise HTTPException(
-                status_code=getattr(r, "status", 500) if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
-            )
+        return await send_speech_request(
+            name,
+            payload,
+            (base_url or f"https://{region}.tts.speech.microsoft.com")
+            + "/cognitiveservices/v1",
+            headers={
+                "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
+                "Content-Type": "application/ssml+xml",
+                "X-Microsoft-OutputFormat": output_format,
+            },
+            data=data,
+        )
 
     elif request.app.state.config.TTS_ENGINE == "transformers":
-        payload = None
-        try:
-            payload = json.loads(body.decode("utf-8"))
-        except Exception as e:
-            log.exception(e)
-            raise HTTPException(status_code=400, detail="Invalid JSON payload")
-
         import torch
         import soundfile as sf
 
@@ -528,12 +579,28 @@ async def speech(request: Request, user=Depends(get_verified_user)):
             forward_params={"speaker_embeddings": speaker_embedding},
         )
 
-        sf.write(file_path, speech["audio"], samplerate=speech["sampling_rate"])
+        temp_path = SPEECH_CACHE.create_temp_path(name)
+        sf.write(
+            temp_path,
+            speech["audio"],
+            samplerate=speech["sampling_rate"],
+            format="MP3",
+        )
 
-        async with aiofiles.open(file_body_path, "w") as f:
+        async with aiofiles.open(SPEECH_CACHE.get_payload_path(name), "w") as f:
             await f.write(json.dumps(payload))
 
-        return FileResponse(file_path)
+        return FileResponse(SPEECH_CACHE.add(name, temp_path))
+
+
+@router.get("/speech/cache")
+async def get_speech_cache_stats(user=Depends(get_admin_user)):
+    return SPEECH_CACHE.get_stats()
+
+
+@router.post("/speech/cache/reset")
+async def reset_speech_cache(user=Depends(get_admin_user)):
+    return {"status": True, "removed": SPEECH_CACHE.clear()}
 
 
 def transcription_handler(request, file_path, metadata):
@@ -544,12 +611,7 @@ def transcription_handler(request, file_path, metadata):
     metadata = metadata or {}
 
     if request.app.state.config.STT_ENGINE == "":
-        if request.app.state.faster_whisper_model is None:
-            request.app.state.faster_whisper_model = set_faster_whisper_model(
-                request.app.state.config.WHISPER_MODEL
-            )
-
-        model = request.app.state.faster_whisper_model
+        model = get_faster_whisper_model(request)
         segments, info = model.transcribe(
             file_path,
             beam_size=5,
@@ -795,119 +857,127 @@ def transcription_handler(request, file_path, metadata):
             )
 
 
-def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None):
-    log.info(f"transcribe: {file_path} {metadata}")
-
-    if is_audio_conversion_required(file_path):
-        file_path = convert_audio_to_mp3(file_path)
-
+def get_transcription_event_emitter(
+    user_id: str, id: str
+) -> Optional[Callable[[dict], None]]:
+    """
+    Emitter of "transcription-events" about the transcription `id` to the
+    sessions of `user_id`, callable from any thread. Only available in the
+    worker threads of sync endpoints, None elsewhere.
+    """
     try:
-        file_path = compress_audio(file_path)
-    except Exception as e:
-        log.exception(e)
+        loop = anyio.from_thread.run_sync(asyncio.get_running_loop)
+    except Exception:
+        return None
 
-    # Always produce a list of chunk paths (could be one entry if small)
-    try:
-        chunk_paths = split_audio(file_path, MAX_FILE_SIZE)
-        print(f"Chunk paths: {chunk_paths}")
-    except Exception as e:
-        log.exception(e)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ERROR_MESSAGES.DEFAULT(e),
-        )
+    async def emit(data: dict):
+        from open_webui.socket.main import sio, USER_POOL
 
-    results = []
-    try:
-        with ThreadPoolExecutor() as executor:
-            # Submit tasks for each chunk_path
-            futures = [
-                executor.submit(transcription_handler, request, chunk_path, metadata)
-                for chunk_path in chunk_paths
+        await asyncio.gather(
+            *[
+                sio.emit("transcription-events", {"id": id, **data}, to=session_id)
+                for session_id in await USER_POOL.get(user_id, [])
             ]
-            # Gather results as they complete
-            for future in futures:
-                try:
-                    results.append(future.result())
-                except Exception as transcribe_exc:
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Error transcribing chunk: {transcribe_exc}",
-                    )
-    finally:
-        # Clean up only the temporary chunks, never the original file
-        for chunk_path in chunk_paths:
-            if chunk_path != file_path and os.path.isfile(chunk_path):
-                try:
-                    os.remove(chunk_path)
-                except Exception:
-                    pass
-
-    return {
-        "text": " ".join([result["text"] for result in results]),
-    }
-
-
-def compress_audio(file_path):
-    if os.path.getsize(file_path) > MAX_FILE_SIZE:
-        id = os.path.splitext(os.path.basename(file_path))[
-            0
-        ]  # Handles names with multiple dots
-        file_dir = os.path.dirname(file_path)
+        )
 
-        audio = AudioSegment.from_file(file_path)
-        audio = audio.set_frame_rate(16000).set_channels(1)  # Compress audio
+    def on_emitted(future):
+        if future.exception():
+            log.debug(
+                f"Failed to emit progress of transcription {id}: {future.exception()}"
+            )
 
-        compressed_path = os.path.join(file_dir, f"{id}_compressed.mp3")
-        audio.export(compressed_path, format="mp3", bitrate="32k")
-        # log.debug(f"Compressed audio to {compressed_path}")  # Uncomment if log is defined
+    def event_emitter(data: dict):
+        asyncio.run_coroutine_threadsafe(emit(data), loop).add_done_callback(on_emitted)
 
-        return compressed_path
-    else:
-        return file_path
+    return event_emitter
 
 
-def split_audio(file_path, max_bytes, format="mp3", bitrate="32k"):
+def transcribe(
+    request: Request,
+    file_path: str,
+    metadata: Optional[dict] = None,
+    event_emitter: Optional[Callable[[dict], None]] = None,
+):
     """
-    Splits audio into chunks not exceeding max_bytes.
-    Returns a list of chunk file paths. If audio fits, returns list with original path.
+    Transcribe `file_path`, split into chunks that are handed to a pool of
+    AUDIO_STT_CHUNK_WORKERS workers as soon as they are split off. Every
+    transcribed chunk is reported to `event_emitter`, and the transcripts are
+    joined in the order of the chunks.
     """
-    file_size = os.path.getsize(file_path)
-    if file_size <= max_bytes:
-        return [file_path]  # Nothing to split
+    log.info(f"transcribe: {file_path} {metadata}")
 
-    audio = AudioSegment.from_file(file_path)
-    duration_ms = len(audio)
-    orig_size = file_size
+    chunk_paths = segment_audio(file_path, MAX_FILE_SIZE, AUDIO_STT_CHUNK_DURATION)
+    futures = []
+    progress = {"completed": 0, "total": None}
+    progress_lock = threading.Lock()
 
-    approx_chunk_ms = max(int(duration_ms * (max_bytes / orig_size)) - 1000, 1000)
-    chunks = []
-    start = 0
-    i = 0
+    def remove_chunk(chunk_path):
+        # Clean up only the temporary chunks, never the original file
+        if chunk_path != file_path and os.path.isfile(chunk_path):
+            try:
+                os.remove(chunk_path)
+            except Exception:
+                pass
 
-    base, _ = os.path.splitext(file_path)
+    def on_chunk_done(index, chunk_path, future):
+        remove_chunk(chunk_path)
+        if future.cancelled() or future.exception() is not None:
+            return
 
-    while start < duration_ms:
-        end = min(start + approx_chunk_ms, duration_ms)
-        chunk = audio[start:end]
-        chunk_path = f"{base}_chunk_{i}.{format}"
-        chunk.export(chunk_path, format=format, bitrate=bitrate)
+        with progress_lock:
+            progress["completed"] += 1
+            event = {"status": "transcribing", "chunk": index, **progress}
+        if event_emitter:
+            event_emitter({**event, "text": future.result()["text"]})
 
-        # Reduce chunk duration if still too large
-        while os.path.getsize(chunk_path) > max_bytes and (end - start) > 5000:
-            end = start + ((end - start) // 2)
-            chunk = audio[start:end]
-            chunk.export(chunk_path, format=format, bitrate=bitrate)
+    try:
+        with ThreadPoolExecutor(max_workers=AUDIO_STT_CHUNK_WORKERS) as executor:
+            try:
+                for index, chunk_path in enumerate(chunk_paths):
+                    future = executor.submit(
+                        transcription_handler, request, chunk_path, metadata
+                    )
+                    future.add_done_callback(partial(on_chunk_done, index, chunk_path))
+                    futures.append(future)
+            except Exception as e:
+                log.exception(e)
+                for future in futures:
+                    future.cancel()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=ERROR_MESSAGES.DEFAULT(e),
+                )
 
-        if os.path.getsize(chunk_path) > max_bytes:
-            os.remove(chunk_path)
-            raise Exception("Audio chunk cannot be reduced below max file size.")
+            with progress_lock:
+                progress["total"] = len(futures)
 
-        chunks.append(chunk_path)
-        start = end
-        i += 1
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as transcribe_exc:
+                    for pending in futures:
+                        pending.cancel()
+                    raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail=f"Error transcribing chunk: {transcribe_exc}",
+                    )
+    except Exception as e:
+        if event_emitter:
+            event_emitter({"status": "failed", "error": str(getattr(e, "detail", e))})
+        raise
+    finally:
+        chunk_paths.close()
+        base = os.path.splitext(file_path)[0]
+        for chunk_path in glob.glob(f"{glob.escape(base)}_chunk_*.mp3"):
+            remove_chunk(chunk_path)
+
+    if event_emitter:
+        event_emitter({"status": "completed", **progress})
 
-    return chunks
+    return {
+        "text": " ".join([result["text"] for result in results]),
+    }
 
 
 @router.post("/transcriptions")
@@ -953,7 +1023,12 @@ def transcription(
             if language:
                 metadata = {"language": language}
 
-            result = transcribe(request, file_path, metadata)
+            result = transcribe(
+                request,
+                file_path,
+                metadata,
+                event_emitter=get_transcription_event_emitter(user.id, str(id)),
+            )
 
             return {
                 **result,
@@ -159,7 +159,10 @@ async def import_chat(form_data: ChatImportForm, user=Depends(get_verified_user)
 
 @router.get("/search", response_model=list[ChatTitleIdResponse])
 async def search_user_chats(
-    text: str, page: Optional[int] = None, user=Depends(get_verified_user)
+    text: str,
+    page: Optional[int] = None,
+    order_by: str = "updated_at",
+    user=Depends(get_verified_user),
 ):
     if page is None:
         page = 1
@@ -170,7 +173,7 @@ async def search_user_chats(
     chat_list = [
         ChatTitleIdResponse(**chat.model_dump())
         for chat in Chats.get_chats_by_user_id_and_search_text(
-            user.id, text, skip=skip, limit=limit
+            user.id, text, skip=skip, limit=limit, order_by=order_by
         )
     ]
 
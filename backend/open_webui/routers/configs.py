@@ -7,7 +7,11 @@ from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.config import get_config, save_config
 from open_webui.config import BannerModel
 
-from open_webui.utils.tools import get_tool_server_data, get_tool_servers_data
+from open_webui.utils.tools import (
+    get_tool_server_data,
+    get_tool_servers_data,
+    invalidate_tool_servers_data,
+)
 import random
 
 
@@ -101,9 +105,11 @@ async def set_tool_servers_config(
     form_data: ToolServersConfigForm,
     user=Depends(get_admin_user),
 ):
+    await invalidate_tool_servers_data(request.app.state.config.TOOL_SERVER_CONNECTIONS)
     request.app.state.config.TOOL_SERVER_CONNECTIONS = [
         connection.model_dump() for connection in form_data.TOOL_SERVER_CONNECTIONS
     ]
+    await invalidate_tool_servers_data(request.app.state.config.TOOL_SERVER_CONNECTIONS)
 
     request.app.state.TOOL_SERVERS = await get_tool_servers_data(
         request.app.state.config.TOOL_SERVER_CONNECTIONS
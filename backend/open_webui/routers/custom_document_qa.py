@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 
 from open_webui.utils.auth import get_verified_user, get_admin_user
+from open_webui.utils.http_client import get_http_session
 from open_webui.models.users import Users
 from open_webui.models.files import Files
 from open_webui.retrieval.utils import get_sources_from_files
@@ -150,62 +151,62 @@ async def call_custom_qa_api(
         start_time = time.time()
 
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=900)) as session:
-            async with session.post(
-                GOVGPT_FILE_SEARCH_API_URL,
-                headers={
-                    "Content-Type": "application/json",
-                    "X-API-Key": GOVGPT_API_KEY
-                },
-                json=payload
-            ) as response:
-                response_text = await response.text()
-                
-                # Log the response details
-                log.info(f"{SERVICE_NAME} RESPONSE status: {response.status}")
-                log.info(f"{SERVICE_NAME} RESPONSE headers: {dict(response.headers)}")
-                log.info(f"{SERVICE_NAME} RESPONSE body length: {len(response_text)} characters")
-                log.info(f"{SERVICE_NAME} RESPONSE body: {response_text}")
-                
-                # Log response timing (aiohttp doesn't have elapsed attribute)
-                log.info(f"{SERVICE_NAME} RESPONSE received successfully")
-                
-                if response.status == 200:
-                    try:
-                        result = json.loads(response_text)
-                        log.info(f"{SERVICE_NAME} RESPONSE parsed successfully for user {user_id}")
-                        log.info(f"{SERVICE_NAME} RESPONSE keys: {list(result.keys())}")
-                        
-                        # Log specific response fields if they exist
-                        if "response" in result:
-                            response_length = len(result["response"])
-                            log.info(f"{SERVICE_NAME} RESPONSE response length: {response_length} characters")
-                            log.info(f"{SERVICE_NAME} RESPONSE response preview: '{result['response'][:200]}...'")
-                        
-                        if "sources" in result:
-                            log.info(f"{SERVICE_NAME} RESPONSE sources count: {len(result['sources'])}")
-                        
-                        if "metadata" in result:
-                            log.info(f"{SERVICE_NAME} RESPONSE metadata: {result['metadata']}")
-                        
-                        # Log final summary
-                        total_time = time.time() - start_time
-                        log.info(f"{SERVICE_NAME} REQUEST completed successfully in {total_time:.3f} seconds for user {user_id}")
-                        
-                        return result
-                    except json.JSONDecodeError as e:
-                        log.error(f"{SERVICE_NAME} RESPONSE JSON decode error: {e}")
-                        log.error(f"{SERVICE_NAME} RESPONSE raw text: {response_text}")
-                        raise HTTPException(
-                            status_code=status.HTTP_502_BAD_GATEWAY,
-                            detail=f"{SERVICE_NAME} invalid JSON response"
-                        )
-                else:
-                    log.error(f"{SERVICE_NAME} RESPONSE error: {response.status} - {response_text}")
+        async with get_http_session(GOVGPT_FILE_SEARCH_API_URL).post(
+            GOVGPT_FILE_SEARCH_API_URL,
+            headers={
+                "Content-Type": "application/json",
+                "X-API-Key": GOVGPT_API_KEY
+            },
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=900),
+        ) as response:
+            response_text = await response.text()
+            
+            # Log the response details
+            log.info(f"{SERVICE_NAME} RESPONSE status: {response.status}")
+            log.info(f"{SERVICE_NAME} RESPONSE headers: {dict(response.headers)}")
+            log.info(f"{SERVICE_NAME} RESPONSE body length: {len(response_text)} characters")
+            log.info(f"{SERVICE_NAME} RESPONSE body: {response_text}")
+            
+            # Log response timing (aiohttp doesn't have elapsed attribute)
+            log.info(f"{SERVICE_NAME} RESPONSE received successfully")
+            
+            if response.status == 200:
+                try:
+                    result = json.loads(response_text)
+                    log.info(f"{SERVICE_NAME} RESPONSE parsed successfully for user {user_id}")
+                    log.info(f"{SERVICE_NAME} RESPONSE keys: {list(result.keys())}")
+                    
+                    # Log specific response fields if they exist
+                    if "response" in result:
+                        response_length = len(result["response"])
+                        log.info(f"{SERVICE_NAME} RESPONSE response length: {response_length} characters")
+                        log.info(f"{SERVICE_NAME} RESPONSE response preview: '{result['response'][:200]}...'")
+                    
+                    if "sources" in result:
+                        log.info(f"{SERVICE_NAME} RESPONSE sources count: {len(result['sources'])}")
+                    
+                    if "metadata" in result:
+                        log.info(f"{SERVICE_NAME} RESPONSE metadata: {result['metadata']}")
+                    
+                    # Log final summary
+                    total_time = time.time() - start_time
+                    log.info(f"{SERVICE_NAME} REQUEST completed successfully in {total_time:.3f} seconds for user {user_id}")
+                    
+                    return result
+                except json.JSONDecodeError as e:
+                    log.error(f"{SERVICE_NAME} RESPONSE JSON decode error: {e}")
+                    log.error(f"{SERVICE_NAME} RESPONSE raw text: {response_text}")
                     raise HTTPException(
                         status_code=status.HTTP_502_BAD_GATEWAY,
-                        detail=f"{SERVICE_NAME} error: {response.status}"
+                        detail=f"{SERVICE_NAME} invalid JSON response"
                     )
+            else:
+                log.error(f"{SERVICE_NAME} RESPONSE error: {response.status} - {response_text}")
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail=f"{SERVICE_NAME} error: {response.status}"
+                )
     except aiohttp.ClientError as e:
         log.error(f"{SERVICE_NAME} REQUEST connection error: {e}")
         raise HTTPException(
@@ -33,7 +33,7 @@ from open_webui.models.knowledge import Knowledges
 
 from open_webui.routers.knowledge import get_knowledge, get_knowledge_list
 from open_webui.routers.retrieval import ProcessFileForm, process_file
-from open_webui.routers.audio import transcribe
+from open_webui.routers.audio import transcribe, get_transcription_event_emitter
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from pydantic import BaseModel
@@ -168,7 +168,12 @@ def upload_file(
                         for content_type in stt_supported_content_types
                     ):
                         file_path = Storage.get_file(file_path)
-                        result = transcribe(request, file_path, file_metadata)
+                        result = transcribe(
+                            request,
+                            file_path,
+                            file_metadata,
+                            event_emitter=get_transcription_event_emitter(user.id, id),
+                        )
 
                         process_file(
                             request,
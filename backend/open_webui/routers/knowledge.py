@@ -10,7 +10,13 @@ from open_webui.models.knowledge import (
     KnowledgeUserResponse,
 )
 from open_webui.models.files import Files, FileModel, FileMetadataResponse
+from open_webui.models.ingestion import (
+    Ingestions,
+    IngestionJobModel,
+    IngestionJobResponse,
+)
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
 from open_webui.routers.retrieval import (
     process_file,
     ProcessFileForm,
@@ -18,6 +24,7 @@ from open_webui.routers.retrieval import (
     BatchProcessFilesForm,
 )
 from open_webui.storage.provider import Storage
+from open_webui.utils.ingestion import INGESTION_QUEUE
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_verified_user
@@ -166,8 +173,41 @@ async def create_new_knowledge(
 ############################
 
 
-@router.post("/reindex", response_model=bool)
-async def reindex_knowledge_files(request: Request, user=Depends(get_verified_user)):
+def prune_removed_files(collection_name: str, file_ids: list[str]) -> int:
+    """
+    Delete the chunks of files that are no longer part of the knowledge base
+    from its collection. Returns the number of files pruned.
+    """
+    if not VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        return 0
+
+    result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+    if not result or not result.metadatas:
+        return 0
+
+    stale_file_ids = {
+        (metadata or {}).get("file_id") for metadata in result.metadatas[0]
+    } - set(file_ids)
+    stale_file_ids.discard(None)
+
+    for file_id in stale_file_ids:
+        VECTOR_DB_CLIENT.delete(
+            collection_name=collection_name, filter={"file_id": file_id}
+        )
+        BM25_INDEX.delete(collection_name=collection_name, filter={"file_id": file_id})
+    return len(stale_file_ids)
+
+
+@router.post("/reindex", response_model=IngestionJobResponse)
+async def reindex_knowledge_files(
+    request: Request, force: bool = False, user=Depends(get_verified_user)
+):
+    """
+    Queue every file of every knowledge base for reindexing. Files whose
+    chunks are up to date are skipped and the chunks of files removed from
+    a knowledge base are pruned, unless `force` is set, which drops the
+    collections first.
+    """
     if user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -179,6 +219,7 @@ async def reindex_knowledge_files(request: Request, user=Depends(get_verified_us
     log.info(f"Starting reindexing for {len(knowledge_bases)} knowledge bases")
 
     deleted_knowledge_bases = []
+    items = []
 
     for knowledge_base in knowledge_bases:
         # -- Robust error handling for missing or invalid data
@@ -195,51 +236,80 @@ async def reindex_knowledge_files(request: Request, user=Depends(get_verified_us
                 )
             continue
 
-        try:
-            file_ids = knowledge_base.data.get("file_ids", [])
-            files = Files.get_files_by_ids(file_ids)
+        if force:
             try:
                 if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_base.id):
                     VECTOR_DB_CLIENT.delete_collection(
                         collection_name=knowledge_base.id
                     )
+                    BM25_INDEX.delete_collection(collection_name=knowledge_base.id)
             except Exception as e:
                 log.error(f"Error deleting collection {knowledge_base.id}: {str(e)}")
                 continue  # Skip, don't raise
 
-            failed_files = []
-            for file in files:
-                try:
-                    process_file(
-                        request,
-                        ProcessFileForm(
-                            file_id=file.id, collection_name=knowledge_base.id
-                        ),
-                        user=user,
-                    )
-                except Exception as e:
-                    log.error(
-                        f"Error processing file {file.filename} (ID: {file.id}): {str(e)}"
+        files = Files.get_files_by_ids(knowledge_base.data.get("file_ids", []))
+
+        if not force:
+            try:
+                pruned = prune_removed_files(
+                    knowledge_base.id, [file.id for file in files]
+                )
+                if pruned:
+                    log.info(
+                        f"Pruned the chunks of {pruned} removed files from {knowledge_base.id}"
                     )
-                    failed_files.append({"file_id": file.id, "error": str(e)})
-                    continue
+            except Exception as e:
+                log.error(f"Error pruning collection {knowledge_base.id}: {str(e)}")
 
-        except Exception as e:
-            log.error(f"Error processing knowledge base {knowledge_base.id}: {str(e)}")
-            # Don't raise, just continue
-            continue
+        items.extend((file.id, knowledge_base.id) for file in files)
 
-        if failed_files:
-            log.warning(
-                f"Failed to process {len(failed_files)} files in knowledge base {knowledge_base.id}"
-            )
-            for failed in failed_files:
-                log.warning(f"File ID: {failed['file_id']}, Error: {failed['error']}")
+    job = Ingestions.insert_new_job(user.id, "reindex", items, meta={"force": force})
+    INGESTION_QUEUE.notify()
 
     log.info(
-        f"Reindexing completed. Deleted {len(deleted_knowledge_bases)} invalid knowledge bases: {deleted_knowledge_bases}"
+        f"Queued {len(items)} files for reindexing as job {job.id}. Deleted {len(deleted_knowledge_bases)} invalid knowledge bases: {deleted_knowledge_bases}"
     )
-    return True
+    return Ingestions.get_job_response_by_id(job.id)
+
+
+############################
+# IngestionJobs
+############################
+
+
+@router.get("/ingestion/jobs", response_model=list[IngestionJobModel])
+async def get_ingestion_jobs(user=Depends(get_verified_user)):
+    return Ingestions.get_jobs_by_user_id(user.id)
+
+
+def get_ingestion_job_or_raise(job_id: str, user) -> IngestionJobModel:
+    job = Ingestions.get_job_by_id(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    if job.user_id != user.id and user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
+        )
+    return job
+
+
+@router.get("/ingestion/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job_by_id(job_id: str, user=Depends(get_verified_user)):
+    get_ingestion_job_or_raise(job_id, user)
+    return Ingestions.get_job_response_by_id(job_id)
+
+
+@router.post("/ingestion/jobs/{job_id}/cancel", response_model=IngestionJobResponse)
+async def cancel_ingestion_job_by_id(job_id: str, user=Depends(get_verified_user)):
+    job = get_ingestion_job_or_raise(job_id, user)
+    if job.status in ("pending", "running"):
+        Ingestions.cancel_job_by_id(job_id)
+    return Ingestions.get_job_response_by_id(job_id)
 
 
 ############################
@@ -451,6 +521,9 @@ def update_file_from_knowledge_by_id(
     VECTOR_DB_CLIENT.delete(
         collection_name=knowledge.id, filter={"file_id": form_data.file_id}
     )
+    BM25_INDEX.delete(
+        collection_name=knowledge.id, filter={"file_id": form_data.file_id}
+    )
 
     # Add content to the vector database
     try:
@@ -522,6 +595,9 @@ def remove_file_from_knowledge_by_id(
         VECTOR_DB_CLIENT.delete(
             collection_name=knowledge.id, filter={"file_id": form_data.file_id}
         )
+        BM25_INDEX.delete(
+            collection_name=knowledge.id, filter={"file_id": form_data.file_id}
+        )
     except Exception as e:
         log.debug("This was most likely caused by bypassing embedding processing")
         log.debug(e)
@@ -532,6 +608,7 @@ def remove_file_from_knowledge_by_id(
         file_collection = f"file-{form_data.file_id}"
         if VECTOR_DB_CLIENT.has_collection(collection_name=file_collection):
             VECTOR_DB_CLIENT.delete_collection(collection_name=file_collection)
+            BM25_INDEX.delete_collection(collection_name=file_collection)
     except Exception as e:
         log.debug("This was most likely caused by bypassing embedding processing")
         log.debug(e)
@@ -630,6 +707,7 @@ async def delete_knowledge_by_id(id: str, user=Depends(get_verified_user)):
     # Clean up vector DB
     try:
         VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        BM25_INDEX.delete_collection(collection_name=id)
     except Exception as e:
         log.debug(e)
         pass
@@ -663,6 +741,7 @@ async def reset_knowledge_by_id(id: str, user=Depends(get_verified_user)):
 
     try:
         VECTOR_DB_CLIENT.delete_collection(collection_name=id)
+        BM25_INDEX.delete_collection(collection_name=id)
     except Exception as e:
         log.debug(e)
         pass
@@ -672,6 +751,59 @@ async def reset_knowledge_by_id(id: str, user=Depends(get_verified_user)):
     return knowledge
 
 
+############################
+# IngestFilesToKnowledge
+############################
+
+
+@router.post("/{id}/files/batch/ingest", response_model=IngestionJobResponse)
+def ingest_files_to_knowledge_batch(
+    id: str,
+    form_data: list[KnowledgeFileIdForm],
+    user=Depends(get_verified_user),
+):
+    """
+    Queue multiple files to be processed into a knowledge base in the
+    background. Files are added to the knowledge base once the job completes.
+    """
+    knowledge = Knowledges.get_knowledge_by_id(id=id)
+    if not knowledge:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    if (
+        knowledge.user_id != user.id
+        and not has_access(user.id, "write", knowledge.access_control)
+        and user.role != "admin"
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
+        )
+
+    file_ids = [form.file_id for form in form_data]
+    found_ids = {file.id for file in Files.get_files_by_ids(file_ids)}
+    for file_id in file_ids:
+        if file_id not in found_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File {file_id} not found",
+            )
+
+    job = Ingestions.insert_new_job(
+        user.id,
+        "add",
+        [(file_id, id) for file_id in file_ids],
+        meta={"knowledge_id": id},
+    )
+    INGESTION_QUEUE.notify()
+
+    log.info(f"files/batch/ingest - queued {len(file_ids)} files as job {job.id}")
+    return Ingestions.get_job_response_by_id(job.id)
+
+
 ############################
 # AddFilesToKnowledge
 ############################
@@ -5,6 +5,7 @@ from typing import Optional
 
 from open_webui.models.memories import Memories, MemoryModel
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
 from open_webui.utils.auth import get_verified_user
 from open_webui.env import SRC_LOG_LEVELS
 
@@ -64,6 +65,12 @@ async def add_memory(
             }
         ],
     )
+    BM25_INDEX.add(
+        collection_name=f"user-memory-{user.id}",
+        ids=[memory.id],
+        texts=[memory.content],
+        metadatas=[{"created_at": memory.created_at}],
+    )
 
     return memory
 
@@ -99,6 +106,7 @@ async def reset_memory_from_vector_db(
     request: Request, user=Depends(get_verified_user)
 ):
     VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
+    BM25_INDEX.delete_collection(f"user-memory-{user.id}")
 
     memories = Memories.get_memories_by_user_id(user.id)
     VECTOR_DB_CLIENT.upsert(
@@ -134,6 +142,7 @@ async def delete_memory_by_user_id(user=Depends(get_verified_user)):
     if result:
         try:
             VECTOR_DB_CLIENT.delete_collection(f"user-memory-{user.id}")
+            BM25_INDEX.delete_collection(f"user-memory-{user.id}")
         except Exception as e:
             log.error(e)
         return True
@@ -176,6 +185,15 @@ async def update_memory_by_id(
                 }
             ],
         )
+        BM25_INDEX.delete(collection_name=f"user-memory-{user.id}", ids=[memory.id])
+        BM25_INDEX.add(
+            collection_name=f"user-memory-{user.id}",
+            ids=[memory.id],
+            texts=[memory.content],
+            metadatas=[
+                {"created_at": memory.created_at, "updated_at": memory.updated_at}
+            ],
+        )
 
     return memory
 
@@ -193,6 +211,7 @@ async def delete_memory_by_id(memory_id: str, user=Depends(get_verified_user)):
         VECTOR_DB_CLIENT.delete(
             collection_name=f"user-memory-{user.id}", ids=[memory_id]
         )
+        BM25_INDEX.delete(collection_name=f"user-memory-{user.id}", ids=[memory_id])
         return True
 
     return False
@@ -1,12 +1,7 @@
-# TODO: Implement a more intelligent load balancing mechanism for distributing requests among multiple backend instances.
-# Current implementation uses a simple round-robin approach (random.choice). Consider incorporating algorithms like weighted round-robin,
-# least connections, or least response time for better resource utilization and performance optimization.
-
 import asyncio
 import json
 import logging
 import os
-import random
 import re
 import time
 from datetime import datetime
@@ -14,7 +9,6 @@ from datetime import datetime
 from typing import Optional, Union
 from urllib.parse import urlparse
 import aiohttp
-from aiocache import cached
 import requests
 
 from open_webui.models.chats import Chats
@@ -36,7 +30,6 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, validator
-from starlette.background import BackgroundTask
 
 
 from open_webui.models.models import Models
@@ -49,7 +42,10 @@ from open_webui.utils.payload import (
     apply_model_system_prompt_to_body,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import has_access, has_access_batch
+from open_webui.utils.http_client import get_http_session
+from open_webui.utils.upstream_cache import MODEL_LIST_CACHE
+from open_webui.utils.load_balancer import LoadBalancer, NodeRequest
 
 
 from open_webui.config import (
@@ -62,12 +58,23 @@ from open_webui.env import (
     AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST,
     BYPASS_MODEL_ACCESS_CONTROL,
+    OLLAMA_LOAD_BALANCER_STRATEGY,
+    OLLAMA_LOAD_BALANCER_FAILURE_THRESHOLD,
+    OLLAMA_LOAD_BALANCER_COOLDOWN,
+    OLLAMA_LOAD_BALANCER_PS_INTERVAL,
 )
 from open_webui.constants import ERROR_MESSAGES
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["OLLAMA"])
 
+# Spreads requests for a model across the Ollama nodes serving it
+OLLAMA_LOAD_BALANCER = LoadBalancer(
+    strategy=OLLAMA_LOAD_BALANCER_STRATEGY,
+    failure_threshold=OLLAMA_LOAD_BALANCER_FAILURE_THRESHOLD,
+    cooldown=OLLAMA_LOAD_BALANCER_COOLDOWN,
+)
+
 
 ##########################################
 #
@@ -79,40 +86,72 @@ log.setLevel(SRC_LOG_LEVELS["OLLAMA"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url,
-                headers={
-                    "Content-Type": "application/json",
-                    **({"Authorization": f"Bearer {key}"} if key else {}),
-                    **(
-                        {
-                            "X-OpenWebUI-User-Name": user.name,
-                            "X-OpenWebUI-User-Id": user.id,
-                            "X-OpenWebUI-User-Email": user.email,
-                            "X-OpenWebUI-User-Role": user.role,
-                        }
-                        if ENABLE_FORWARD_USER_INFO_HEADERS and user
-                        else {}
-                    ),
-                },
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        async with get_http_session(url).get(
+            url,
+            headers={
+                "Content-Type": "application/json",
+                **({"Authorization": f"Bearer {key}"} if key else {}),
+                **(
+                    {
+                        "X-OpenWebUI-User-Name": user.name,
+                        "X-OpenWebUI-User-Id": user.id,
+                        "X-OpenWebUI-User-Email": user.email,
+                        "X-OpenWebUI-User-Role": user.role,
+                    }
+                    if ENABLE_FORWARD_USER_INFO_HEADERS and user
+                    else {}
+                ),
+            },
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=timeout,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
         return None
 
 
+async def send_cached_get_request(
+    url, key=None, user: UserModel = None, ttl: Optional[float] = None
+):
+    # User info headers may change what the upstream returns
+    cache_key = MODEL_LIST_CACHE.get_key(
+        url, key or "", user.id if ENABLE_FORWARD_USER_INFO_HEADERS and user else ""
+    )
+    return await MODEL_LIST_CACHE.get(
+        cache_key, lambda: send_get_request(url, key, user=user), ttl=ttl
+    )
+
+
 async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
+    node_request: Optional[NodeRequest] = None,
 ):
+    # Hand the connection back to the shared pool
     if response:
-        response.close()
-    if session:
-        await session.close()
+        response.release()
+    if node_request:
+        node_request.finish(success=True)
+
+
+async def stream_response(
+    response: aiohttp.ClientResponse,
+    node_request: Optional[NodeRequest] = None,
+):
+    # Background tasks are skipped when the client disconnects, so the
+    # request is finished here to keep the in-flight count of the node right
+    success = True
+    try:
+        async for chunk in response.content:
+            yield chunk
+    except aiohttp.ClientError:
+        success = False
+        raise
+    finally:
+        response.release()
+        if node_request:
+            node_request.finish(success=success)
 
 
 async def send_post_request(
@@ -122,15 +161,14 @@ async def send_post_request(
     key: Optional[str] = None,
     content_type: Optional[str] = None,
     user: UserModel = None,
+    base_url: Optional[str] = None,
 ):
+    # Requests to a load balanced node pass its base url to be tracked
+    node_request = OLLAMA_LOAD_BALANCER.start(base_url) if base_url else None
 
     r = None
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
-        r = await session.post(
+        r = await get_http_session(url).post(
             url,
             data=payload,
             headers={
@@ -148,12 +186,18 @@ async def send_post_request(
                 ),
             },
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
+        if node_request:
+            node_request.respond()
+
         if r.ok is False:
             try:
                 res = await r.json()
-                await cleanup_response(r, session)
+                await cleanup_response(r)
+                if node_request:
+                    node_request.finish(success=r.status < 500)
                 if "error" in res:
                     raise HTTPException(status_code=r.status, detail=res["error"])
             except HTTPException as e:
@@ -173,21 +217,22 @@ async def send_post_request(
                 response_headers["Content-Type"] = content_type
 
             return StreamingResponse(
-                r.content,
+                stream_response(r, node_request),
                 status_code=r.status,
                 headers=response_headers,
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
             )
         else:
             res = await r.json()
-            await cleanup_response(r, session)
+            await cleanup_response(r, node_request)
             return res
 
     except HTTPException as e:
+        if node_request:
+            node_request.finish(success=r is not None and r.status < 500)
         raise e  # Re-raise HTTPException to be handled by FastAPI
     except Exception as e:
+        if node_request:
+            node_request.finish(success=False)
         detail = f"Ollama: {e}"
 
         raise HTTPException(
@@ -196,6 +241,32 @@ async def send_post_request(
         )
 
 
+_loaded_models_refresh: Optional[asyncio.Task] = None
+
+
+def select_url_idx(request: Request, model: str, url_idxs: list[int]) -> int:
+    """Pick the node to send a request for `model` to among `url_idxs`."""
+    global _loaded_models_refresh
+
+    urls = {}
+    for url_idx in url_idxs:
+        urls.setdefault(request.app.state.config.OLLAMA_BASE_URLS[url_idx], url_idx)
+
+    if (
+        OLLAMA_LOAD_BALANCER.strategy == "affinity"
+        and len(urls) > 1
+        and OLLAMA_LOAD_BALANCER.loaded_models_age(list(urls))
+        >= OLLAMA_LOAD_BALANCER_PS_INTERVAL
+        and (_loaded_models_refresh is None or _loaded_models_refresh.done())
+    ):
+        # Refresh in the background, this request uses what is known so far
+        _loaded_models_refresh = asyncio.create_task(
+            get_loaded_models_responses(request)
+        )
+
+    return urls[OLLAMA_LOAD_BALANCER.select(list(urls), model)]
+
+
 def get_api_key(idx, url, configs):
     parsed_url = urlparse(url)
     base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
@@ -329,7 +400,6 @@ def merge_ollama_models_lists(model_lists):
     return list(merged_models.values())
 
 
-@cached(ttl=1)
 async def get_all_models(request: Request, user: UserModel = None):
     log.info("get_all_models()")
     if request.app.state.config.ENABLE_OLLAMA_API:
@@ -338,7 +408,9 @@ async def get_all_models(request: Request, user: UserModel = None):
             if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
                 url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
             ):
-                request_tasks.append(send_get_request(f"{url}/api/tags", user=user))
+                request_tasks.append(
+                    send_cached_get_request(f"{url}/api/tags", user=user)
+                )
             else:
                 api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
                     str(idx),
@@ -352,7 +424,12 @@ async def get_all_models(request: Request, user: UserModel = None):
 
                 if enable:
                     request_tasks.append(
-                        send_get_request(f"{url}/api/tags", key, user=user)
+                        send_cached_get_request(
+                            f"{url}/api/tags",
+                            key,
+                            user=user,
+                            ttl=api_config.get("cache_ttl", None),
+                        )
                     )
                 else:
                     request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
@@ -403,11 +480,16 @@ async def get_all_models(request: Request, user: UserModel = None):
         }
 
         try:
-            loaded_models = await get_ollama_loaded_models(request, user=user)
+            loaded_models = merge_ollama_models_lists(
+                map(
+                    lambda response: response.get("models", []) if response else None,
+                    await get_loaded_models_responses(
+                        request, user=user, use_cache=True
+                    ),
+                )
+            )
             expires_map = {
-                m["name"]: m["expires_at"]
-                for m in loaded_models["models"]
-                if "expires_at" in m
+                m["name"]: m["expires_at"] for m in loaded_models if "expires_at" in m
             }
 
             for m in models["models"]:
@@ -429,15 +511,26 @@ async def get_all_models(request: Request, user: UserModel = None):
 
 async def get_filtered_models(models, user):
     # Filter models based on user access control
-    filtered_models = []
-    for model in models.get("models", []):
-        model_info = Models.get_model_by_id(model["model"])
-        if model_info:
-            if user.id == model_info.user_id or has_access(
-                user.id, type="read", access_control=model_info.access_control
-            ):
-                filtered_models.append(model)
-    return filtered_models
+    model_infos = {
+        model_info.id: model_info
+        for model_info in Models.get_models_by_ids(
+            [model["model"] for model in models.get("models", [])]
+        )
+    }
+
+    candidates = [
+        (model, model_infos[model["model"]])
+        for model in models.get("models", [])
+        if model["model"] in model_infos
+    ]
+    access = has_access_batch(
+        user.id, "read", [model_info.access_control for _, model_info in candidates]
+    )
+    return [
+        model
+        for (model, model_info), allowed in zip(candidates, access)
+        if user.id == model_info.user_id or allowed
+    ]
 
 
 @router.get("/api/tags")
@@ -498,53 +591,66 @@ async def get_ollama_tags(
     return models
 
 
-@router.get("/api/ps")
-async def get_ollama_loaded_models(request: Request, user=Depends(get_admin_user)):
-    """
-    List models that are currently loaded into Ollama memory, and which node they are loaded on.
-    """
-    if request.app.state.config.ENABLE_OLLAMA_API:
-        request_tasks = []
-        for idx, url in enumerate(request.app.state.config.OLLAMA_BASE_URLS):
-            if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
-                url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
-            ):
-                request_tasks.append(send_get_request(f"{url}/api/ps", user=user))
+async def get_loaded_models_responses(
+    request: Request, user: UserModel = None, use_cache: bool = False
+):
+    get_request = send_cached_get_request if use_cache else send_get_request
+
+    request_tasks = []
+    for idx, url in enumerate(request.app.state.config.OLLAMA_BASE_URLS):
+        if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
+            url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
+        ):
+            request_tasks.append(get_request(f"{url}/api/ps", user=user))
+        else:
+            api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
+                str(idx),
+                request.app.state.config.OLLAMA_API_CONFIGS.get(
+                    url, {}
+                ),  # Legacy support
+            )
+
+            enable = api_config.get("enable", True)
+            key = api_config.get("key", None)
+
+            if enable:
+                request_tasks.append(get_request(f"{url}/api/ps", key, user=user))
             else:
-                api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
-                    str(idx),
-                    request.app.state.config.OLLAMA_API_CONFIGS.get(
-                        url, {}
-                    ),  # Legacy support
-                )
+                request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
 
-                enable = api_config.get("enable", True)
-                key = api_config.get("key", None)
+    responses = await asyncio.gather(*request_tasks)
 
-                if enable:
-                    request_tasks.append(
-                        send_get_request(f"{url}/api/ps", key, user=user)
-                    )
-                else:
-                    request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
+    for idx, response in enumerate(responses):
+        url = request.app.state.config.OLLAMA_BASE_URLS[idx]
+        if response:
+            api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
+                str(idx),
+                request.app.state.config.OLLAMA_API_CONFIGS.get(
+                    url, {}
+                ),  # Legacy support
+            )
 
-        responses = await asyncio.gather(*request_tasks)
+            prefix_id = api_config.get("prefix_id", None)
 
-        for idx, response in enumerate(responses):
-            if response:
-                url = request.app.state.config.OLLAMA_BASE_URLS[idx]
-                api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
-                    str(idx),
-                    request.app.state.config.OLLAMA_API_CONFIGS.get(
-                        url, {}
-                    ),  # Legacy support
-                )
+            for model in response.get("models", []):
+                if prefix_id:
+                    model["model"] = f"{prefix_id}.{model['model']}"
 
-                prefix_id = api_config.get("prefix_id", None)
+        OLLAMA_LOAD_BALANCER.update_loaded_models(
+            url,
+            [model["model"] for model in (response or {}).get("models", [])],
+        )
 
-                for model in response.get("models", []):
-                    if prefix_id:
-                        model["model"] = f"{prefix_id}.{model['model']}"
+    return responses
+
+
+@router.get("/api/ps")
+async def get_ollama_loaded_models(request: Request, user=Depends(get_admin_user)):
+    """
+    List models that are currently loaded into Ollama memory, and which node they are loaded on.
+    """
+    if request.app.state.config.ENABLE_OLLAMA_API:
+        responses = await get_loaded_models_responses(request, user=user)
 
         models = {
             "models": merge_ollama_models_lists(
@@ -560,6 +666,14 @@ async def get_ollama_loaded_models(request: Request, user=Depends(get_admin_user
     return models
 
 
+@router.get("/balancer")
+async def get_load_balancer_state(user=Depends(get_admin_user)):
+    """
+    In-flight requests, latency and circuit breaker state of every Ollama node.
+    """
+    return OLLAMA_LOAD_BALANCER.get_state()
+
+
 @router.get("/api/version")
 @router.get("/api/version/{url_idx}")
 async def get_ollama_versions(request: Request, url_idx: Optional[int] = None):
@@ -836,6 +950,7 @@ async def copy_model(
             data=form_data.model_dump_json(exclude_none=True).encode(),
         )
         r.raise_for_status()
+        await MODEL_LIST_CACHE.invalidate(f"{url}/api/tags")
 
         log.debug(f"r.text: {r.text}")
         return True
@@ -901,6 +1016,7 @@ async def delete_model(
             },
         )
         r.raise_for_status()
+        await MODEL_LIST_CACHE.invalidate(f"{url}/api/tags")
 
         log.debug(f"r.text: {r.text}")
         return True
@@ -935,11 +1051,12 @@ async def show_model_info(
             detail=ERROR_MESSAGES.MODEL_NOT_FOUND(form_data.name),
         )
 
-    url_idx = random.choice(models[form_data.name]["urls"])
+    url_idx = select_url_idx(request, form_data.name, models[form_data.name]["urls"])
 
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
 
+    node_request = OLLAMA_LOAD_BALANCER.start(url)
     try:
         r = requests.request(
             method="POST",
@@ -960,10 +1077,12 @@ async def show_model_info(
             },
             data=form_data.model_dump_json(exclude_none=True).encode(),
         )
+        node_request.finish(success=r.status_code < 500)
         r.raise_for_status()
 
         return r.json()
     except Exception as e:
+        node_request.finish(success=False)
         log.exception(e)
 
         detail = None
@@ -1009,7 +1128,7 @@ async def embed(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_url_idx(request, model, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1027,6 +1146,7 @@ async def embed(
     if prefix_id:
         form_data.model = form_data.model.replace(f"{prefix_id}.", "")
 
+    node_request = OLLAMA_LOAD_BALANCER.start(url)
     try:
         r = requests.request(
             method="POST",
@@ -1047,11 +1167,13 @@ async def embed(
             },
             data=form_data.model_dump_json(exclude_none=True).encode(),
         )
+        node_request.finish(success=r.status_code < 500)
         r.raise_for_status()
 
         data = r.json()
         return data
     except Exception as e:
+        node_request.finish(success=False)
         log.exception(e)
 
         detail = None
@@ -1096,7 +1218,7 @@ async def embeddings(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_url_idx(request, model, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1114,6 +1236,7 @@ async def embeddings(
     if prefix_id:
         form_data.model = form_data.model.replace(f"{prefix_id}.", "")
 
+    node_request = OLLAMA_LOAD_BALANCER.start(url)
     try:
         r = requests.request(
             method="POST",
@@ -1134,11 +1257,13 @@ async def embeddings(
             },
             data=form_data.model_dump_json(exclude_none=True).encode(),
         )
+        node_request.finish(success=r.status_code < 500)
         r.raise_for_status()
 
         data = r.json()
         return data
     except Exception as e:
+        node_request.finish(success=False)
         log.exception(e)
 
         detail = None
@@ -1189,7 +1314,7 @@ async def generate_completion(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = select_url_idx(request, model, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1211,6 +1336,7 @@ async def generate_completion(
         payload=form_data.model_dump_json(exclude_none=True).encode(),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
+        base_url=url,
     )
 
 
@@ -1256,7 +1382,7 @@ async def get_ollama_url(request: Request, model: str, url_idx: Optional[int] =
                 status_code=400,
                 detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
             )
-        url_idx = random.choice(models[model].get("urls", []))
+        url_idx = select_url_idx(request, model, models[model].get("urls", []))
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     return url, url_idx
 
@@ -1343,6 +1469,7 @@ async def generate_chat_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         content_type="application/x-ndjson",
         user=user,
+        base_url=url,
     )
 
 
@@ -1446,6 +1573,7 @@ async def generate_openai_completion(
         stream=payload.get("stream", False),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
+        base_url=url,
     )
 
 
@@ -1527,6 +1655,7 @@ async def generate_openai_chat_completion(
         stream=payload.get("stream", False),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
+        base_url=url,
     )
 
 
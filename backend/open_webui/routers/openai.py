@@ -1,12 +1,10 @@
 import asyncio
-import hashlib
 import json
 import logging
 from pathlib import Path
 from typing import Literal, Optional, overload
 
 import aiohttp
-from aiocache import cached
 import requests
 
 
@@ -17,9 +15,6 @@ from pydantic import BaseModel
 from starlette.background import BackgroundTask
 
 from open_webui.models.models import Models
-from open_webui.config import (
-    CACHE_DIR,
-)
 from open_webui.env import (
     AIOHTTP_CLIENT_SESSION_SSL,
     AIOHTTP_CLIENT_TIMEOUT,
@@ -42,7 +37,10 @@ from open_webui.utils.misc import (
 )
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import has_access, has_access_batch
+from open_webui.utils.http_client import get_http_session
+from open_webui.utils.upstream_cache import MODEL_LIST_CACHE
+from open_webui.utils.speech_cache import SPEECH_CACHE
 
 
 log = logging.getLogger(__name__)
@@ -59,39 +57,47 @@ log.setLevel(SRC_LOG_LEVELS["OPENAI"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url,
-                headers={
-                    **({"Authorization": f"Bearer {key}"} if key else {}),
-                    **(
-                        {
-                            "X-OpenWebUI-User-Name": user.name,
-                            "X-OpenWebUI-User-Id": user.id,
-                            "X-OpenWebUI-User-Email": user.email,
-                            "X-OpenWebUI-User-Role": user.role,
-                        }
-                        if ENABLE_FORWARD_USER_INFO_HEADERS and user
-                        else {}
-                    ),
-                },
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        async with get_http_session(url).get(
+            url,
+            headers={
+                **({"Authorization": f"Bearer {key}"} if key else {}),
+                **(
+                    {
+                        "X-OpenWebUI-User-Name": user.name,
+                        "X-OpenWebUI-User-Id": user.id,
+                        "X-OpenWebUI-User-Email": user.email,
+                        "X-OpenWebUI-User-Role": user.role,
+                    }
+                    if ENABLE_FORWARD_USER_INFO_HEADERS and user
+                    else {}
+                ),
+            },
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=timeout,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
+async def send_cached_get_request(
+    url, key=None, user: UserModel = None, ttl: Optional[float] = None
 ):
+    # User info headers may change what the upstream returns
+    cache_key = MODEL_LIST_CACHE.get_key(
+        url, key or "", user.id if ENABLE_FORWARD_USER_INFO_HEADERS and user else ""
+    )
+    return await MODEL_LIST_CACHE.get(
+        cache_key, lambda: send_get_request(url, key, user=user), ttl=ttl
+    )
+
+
+async def cleanup_response(response: Optional[aiohttp.ClientResponse]):
+    # Hand the connection back to the shared pool
     if response:
-        response.close()
-    if session:
-        await session.close()
+        response.release()
 
 
 def openai_o_series_handler(payload):
@@ -194,15 +200,11 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         )
 
         body = await request.body()
-        name = hashlib.sha256(body).hexdigest()
-
-        SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
-        SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        file_path = SPEECH_CACHE_DIR.joinpath(f"{name}.mp3")
-        file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
+        name = SPEECH_CACHE.get_key(body)
 
         # Check if the file already exists in the cache
-        if file_path.is_file():
+        file_path = SPEECH_CACHE.get(name)
+        if file_path is not None:
             return FileResponse(file_path)
 
         url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
@@ -240,12 +242,18 @@ async def speech(request: Request, user=Depends(get_verified_user)):
             r.raise_for_status()
 
             # Save the streaming content to a file
-            with open(file_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            temp_path = SPEECH_CACHE.create_temp_path(name)
+            try:
+                with open(temp_path, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=8192):
+                        f.write(chunk)
+
+                with open(SPEECH_CACHE.get_payload_path(name), "w") as f:
+                    json.dump(json.loads(body.decode("utf-8")), f)
 
-            with open(file_body_path, "w") as f:
-                json.dump(json.loads(body.decode("utf-8")), f)
+                file_path = SPEECH_CACHE.add(name, temp_path)
+            finally:
+                temp_path.unlink(missing_ok=True)
 
             # Return the saved file
             return FileResponse(file_path)
@@ -294,7 +302,7 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             url not in request.app.state.config.OPENAI_API_CONFIGS  # Legacy support
         ):
             request_tasks.append(
-                send_get_request(
+                send_cached_get_request(
                     f"{url}/models",
                     request.app.state.config.OPENAI_API_KEYS[idx],
                     user=user,
@@ -314,10 +322,11 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             if enable:
                 if len(model_ids) == 0:
                     request_tasks.append(
-                        send_get_request(
+                        send_cached_get_request(
                             f"{url}/models",
                             request.app.state.config.OPENAI_API_KEYS[idx],
                             user=user,
+                            ttl=api_config.get("cache_ttl", None),
                         )
                     )
                 else:
@@ -375,18 +384,28 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
 
 async def get_filtered_models(models, user):
     # Filter models based on user access control
-    filtered_models = []
-    for model in models.get("data", []):
-        model_info = Models.get_model_by_id(model["id"])
-        if model_info:
-            if user.id == model_info.user_id or has_access(
-                user.id, type="read", access_control=model_info.access_control
-            ):
-                filtered_models.append(model)
-    return filtered_models
+    model_infos = {
+        model_info.id: model_info
+        for model_info in Models.get_models_by_ids(
+            [model["id"] for model in models.get("data", [])]
+        )
+    }
+
+    candidates = [
+        (model, model_infos[model["id"]])
+        for model in models.get("data", [])
+        if model["id"] in model_infos
+    ]
+    access = has_access_batch(
+        user.id, "read", [model_info.access_control for _, model_info in candidates]
+    )
+    return [
+        model
+        for (model, model_info), allowed in zip(candidates, access)
+        if user.id == model_info.user_id or allowed
+    ]
 
 
-@cached(ttl=1)
 async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
     log.info("get_all_models()")
 
@@ -829,21 +848,17 @@ async def generate_chat_completion(
     payload = json.dumps(payload)
 
     r = None
-    session = None
     streaming = False
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
-        r = await session.request(
+        r = await get_http_session(request_url).request(
             method="POST",
             url=request_url,
             data=payload,
             headers=headers,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
         # Check if response is SSE
@@ -853,9 +868,7 @@ async def generate_chat_completion(
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -881,10 +894,8 @@ async def generate_chat_completion(
             detail=detail if detail else "Open WebUI: Server Connection Error",
         )
     finally:
-        if not streaming and session:
-            if r:
-                r.close()
-            await session.close()
+        if not streaming and r:
+            r.release()
 
 
 async def embeddings(request: Request, form_data: dict, user):
@@ -911,11 +922,9 @@ async def embeddings(request: Request, form_data: dict, user):
     url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
     key = request.app.state.config.OPENAI_API_KEYS[idx]
     r = None
-    session = None
     streaming = False
     try:
-        session = aiohttp.ClientSession(trust_env=True)
-        r = await session.request(
+        r = await get_http_session(url).request(
             method="POST",
             url=f"{url}/embeddings",
             data=body,
@@ -941,9 +950,7 @@ async def embeddings(request: Request, form_data: dict, user):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             response_data = await r.json()
@@ -963,10 +970,8 @@ async def embeddings(request: Request, form_data: dict, user):
             detail=detail if detail else "Open WebUI: Server Connection Error",
         )
     finally:
-        if not streaming and session:
-            if r:
-                r.close()
-            await session.close()
+        if not streaming and r:
+            r.release()
 
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
@@ -988,7 +993,6 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
     )
 
     r = None
-    session = None
     streaming = False
 
     try:
@@ -1021,8 +1025,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
             headers["Authorization"] = f"Bearer {key}"
             request_url = f"{url}/{path}"
 
-        session = aiohttp.ClientSession(trust_env=True)
-        r = await session.request(
+        r = await get_http_session(request_url).request(
             method=request.method,
             url=request_url,
             data=body,
@@ -1038,9 +1041,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             response_data = await r.json()
@@ -1063,7 +1064,5 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
             detail=detail if detail else "Open WebUI: Server Connection Error",
         )
     finally:
-        if not streaming and session:
-            if r:
-                r.close()
-            await session.close()
+        if not streaming and r:
+            r.release()
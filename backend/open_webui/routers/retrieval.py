@@ -37,6 +37,9 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
+from open_webui.retrieval.reranking_cache import RERANKING_CACHE, COLBERT_CACHE
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -99,6 +102,23 @@ from open_webui.env import (
     SENTENCE_TRANSFORMERS_MODEL_KWARGS,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS,
+    ENABLE_SENTENCE_TRANSFORMERS_BATCHING,
+    SENTENCE_TRANSFORMERS_BATCH_MAX_SIZE,
+    SENTENCE_TRANSFORMERS_BATCH_MAX_WAIT_MS,
+    ENABLE_SENTENCE_TRANSFORMERS_OPTIMIZED_MODELS,
+    SENTENCE_TRANSFORMERS_ONNX_QUANTIZATION,
+)
+from open_webui.retrieval.models.batching import (
+    BatchedSentenceTransformer,
+    BatchedCrossEncoder,
+)
+from open_webui.retrieval.models.quantize import (
+    QUANTIZATIONS,
+    detect_quantization,
+    delete_optimized_model,
+    get_optimized_model_manifest,
+    load_optimized_model,
+    optimize_model,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -123,20 +143,57 @@ def get_ef(
     auto_update: bool = False,
 ):
     ef = None
+    # Model format the local embedder was loaded in, part of the embedding
+    # cache key and of the embedding config stored with the chunks
+    model_format = None
     if embedding_model and engine == "":
         from sentence_transformers import SentenceTransformer
 
+        if ENABLE_SENTENCE_TRANSFORMERS_OPTIMIZED_MODELS and DEVICE_TYPE == "cpu":
+            try:
+                ef = load_optimized_model(
+                    embedding_model,
+                    "embedding",
+                    trust_remote_code=RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
+                )
+                manifest = get_optimized_model_manifest(embedding_model, "embedding")
+                if ef is not None and manifest is not None:
+                    model_format = (
+                        f"onnx-qint8-{manifest['quantization']}"
+                        f"-{manifest['created_at']}"
+                    )
+            except Exception as e:
+                log.warning(f"Error loading optimized {embedding_model}: {e}")
+
         try:
-            ef = SentenceTransformer(
-                get_model_path(embedding_model, auto_update),
-                device=DEVICE_TYPE,
-                trust_remote_code=RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
-                backend=SENTENCE_TRANSFORMERS_BACKEND,
-                model_kwargs=SENTENCE_TRANSFORMERS_MODEL_KWARGS,
-            )
+            if ef is None:
+                ef = SentenceTransformer(
+                    get_model_path(embedding_model, auto_update),
+                    device=DEVICE_TYPE,
+                    trust_remote_code=RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE,
+                    backend=SENTENCE_TRANSFORMERS_BACKEND,
+                    model_kwargs=SENTENCE_TRANSFORMERS_MODEL_KWARGS,
+                )
+                # The model kwargs (e.g. the dtype or the ONNX file) change
+                # the vectors as much as the backend does
+                model_format = SENTENCE_TRANSFORMERS_BACKEND
+                if SENTENCE_TRANSFORMERS_MODEL_KWARGS:
+                    model_format += ":" + json.dumps(
+                        SENTENCE_TRANSFORMERS_MODEL_KWARGS, sort_keys=True
+                    )
         except Exception as e:
             log.debug(f"Error loading SentenceTransformer: {e}")
 
+        if ef is not None and ENABLE_SENTENCE_TRANSFORMERS_BATCHING:
+            ef = BatchedSentenceTransformer(
+                ef,
+                max_batch_size=SENTENCE_TRANSFORMERS_BATCH_MAX_SIZE,
+                max_wait=SENTENCE_TRANSFORMERS_BATCH_MAX_WAIT_MS / 1000,
+            )
+
+        if ef is not None:
+            ef.model_format = model_format
+
     return ef
 
 
@@ -148,6 +205,9 @@ def get_rf(
     auto_update: bool = False,
 ):
     rf = None
+    # Model format the local reranker was loaded in, the int8 ONNX export
+    # scores differently from the original model
+    backend = None
     if reranking_model:
         if any(model in reranking_model for model in ["jinaai/jina-colbert-v2"]):
             try:
@@ -177,21 +237,77 @@ def get_rf(
             else:
                 import sentence_transformers
 
+                if (
+                    ENABLE_SENTENCE_TRANSFORMERS_OPTIMIZED_MODELS
+                    and DEVICE_TYPE == "cpu"
+                ):
+                    try:
+                        rf = load_optimized_model(
+                            reranking_model,
+                            "reranking",
+                            trust_remote_code=RAG_RERANKING_MODEL_TRUST_REMOTE_CODE,
+                        )
+                        manifest = get_optimized_model_manifest(
+                            reranking_model, "reranking"
+                        )
+                        if rf is not None and manifest is not None:
+                            backend = (
+                                f"onnx-qint8-{manifest['quantization']}"
+                                f"-{manifest['created_at']}"
+                            )
+                    except Exception as e:
+                        log.warning(f"Error loading optimized {reranking_model}: {e}")
+
                 try:
-                    rf = sentence_transformers.CrossEncoder(
-                        get_model_path(reranking_model, auto_update),
-                        device=DEVICE_TYPE,
-                        trust_remote_code=RAG_RERANKING_MODEL_TRUST_REMOTE_CODE,
-                        backend=SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
-                        model_kwargs=SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS,
-                    )
+                    if rf is None:
+                        rf = sentence_transformers.CrossEncoder(
+                            get_model_path(reranking_model, auto_update),
+                            device=DEVICE_TYPE,
+                            trust_remote_code=RAG_RERANKING_MODEL_TRUST_REMOTE_CODE,
+                            backend=SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
+                            model_kwargs=SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS,
+                        )
+                        backend = SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND
                 except Exception as e:
                     log.error(f"CrossEncoder: {e}")
                     raise Exception(ERROR_MESSAGES.DEFAULT("CrossEncoder error"))
 
+                if ENABLE_SENTENCE_TRANSFORMERS_BATCHING:
+                    rf = BatchedCrossEncoder(
+                        rf,
+                        max_batch_size=SENTENCE_TRANSFORMERS_BATCH_MAX_SIZE,
+                        max_wait=SENTENCE_TRANSFORMERS_BATCH_MAX_WAIT_MS / 1000,
+                    )
+
+    if rf is not None:
+        # Identifies the model in the reranking score cache
+        if engine == "external":
+            rf.model_id = f"{engine}:{external_reranker_url}:{reranking_model}"
+        elif backend:
+            rf.model_id = f"{engine}:{reranking_model}:{backend}"
+        else:
+            rf.model_id = f"{engine}:{reranking_model}"
+
     return rf
 
 
+def get_embedding_metadata(request: Request) -> str:
+    """
+    Identifies the embedding model in the metadata of the chunks, so chunks
+    embedded with another model or model format are embedded again.
+    """
+    config = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+    model_format = getattr(request.app.state.ef, "model_format", None)
+    # Chunks embedded with the default format keep matching the config they
+    # were stored with before the format was recorded
+    if config["engine"] == "" and model_format and model_format != "torch":
+        config["model_format"] = model_format
+    return json.dumps(config)
+
+
 ##########################################
 #
 # API routes
@@ -251,6 +367,179 @@ async def get_embedding_config(request: Request, user=Depends(get_admin_user)):
     }
 
 
+@router.get("/embedding/cache")
+async def get_embedding_cache_stats(user=Depends(get_admin_user)):
+    return {
+        "status": True,
+        "enabled": EMBEDDING_CACHE.enabled,
+        **EMBEDDING_CACHE.get_stats(),
+    }
+
+
+@router.post("/embedding/cache/reset")
+async def reset_embedding_cache(user=Depends(get_admin_user)):
+    EMBEDDING_CACHE.clear()
+    return {"status": True}
+
+
+@router.get("/reranking/cache")
+async def get_reranking_cache_stats(user=Depends(get_admin_user)):
+    return {
+        "status": True,
+        "enabled": RERANKING_CACHE.enabled,
+        **RERANKING_CACHE.get_stats(),
+        "colbert": COLBERT_CACHE.get_stats(),
+    }
+
+
+@router.post("/reranking/cache/reset")
+async def reset_reranking_cache(user=Depends(get_admin_user)):
+    RERANKING_CACHE.clear()
+    COLBERT_CACHE.clear()
+    return {"status": True}
+
+
+@router.get("/models/batching")
+async def get_model_batching_stats(request: Request, user=Depends(get_admin_user)):
+    return {
+        "status": True,
+        "enabled": ENABLE_SENTENCE_TRANSFORMERS_BATCHING,
+        "embedding": (
+            request.app.state.ef.get_stats()
+            if isinstance(request.app.state.ef, BatchedSentenceTransformer)
+            else None
+        ),
+        "reranking": (
+            request.app.state.rf.get_stats()
+            if isinstance(request.app.state.rf, BatchedCrossEncoder)
+            else None
+        ),
+    }
+
+
+class OptimizeModelsForm(BaseModel):
+    embedding: bool = True
+    reranking: bool = True
+    quantization: Optional[str] = None
+    sample_size: int = 64
+
+
+def get_local_models(request: Request) -> dict:
+    config = request.app.state.config
+    models = {}
+    if config.RAG_EMBEDDING_ENGINE == "" and config.RAG_EMBEDDING_MODEL:
+        models["embedding"] = config.RAG_EMBEDDING_MODEL
+    if (
+        config.RAG_RERANKING_ENGINE == ""
+        and config.RAG_RERANKING_MODEL
+        and "jinaai/jina-colbert-v2" not in config.RAG_RERANKING_MODEL
+    ):
+        models["reranking"] = config.RAG_RERANKING_MODEL
+    return models
+
+
+def get_sample_chunks(sample_size: int) -> list[str]:
+    """Chunks of the most recently updated files, for benchmarks."""
+    samples = []
+    for file_id in Files.get_recent_file_ids(limit=sample_size):
+        result = VECTOR_DB_CLIENT.query(
+            collection_name=f"file-{file_id}",
+            filter={"file_id": file_id},
+            limit=sample_size - len(samples),
+        )
+        if result is not None and result.documents:
+            samples.extend(doc for doc in result.documents[0] if doc)
+        if len(samples) >= sample_size:
+            break
+    return samples[:sample_size]
+
+
+@router.get("/models/optimize")
+async def get_optimized_models(request: Request, user=Depends(get_admin_user)):
+    return {
+        kind: get_optimized_model_manifest(model, kind)
+        for kind, model in get_local_models(request).items()
+    }
+
+
+@router.post("/models/optimize")
+def optimize_models(
+    request: Request, form_data: OptimizeModelsForm, user=Depends(get_admin_user)
+):
+    """
+    Export the local embedding and reranking models to int8 ONNX and
+    benchmark them against the original models on stored chunks. The
+    exports are used from the next start or model update on.
+    """
+    models = {
+        kind: model
+        for kind, model in get_local_models(request).items()
+        if getattr(form_data, kind)
+    }
+    if not models:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("No local model to optimize"),
+        )
+
+    quantization = (
+        form_data.quantization
+        or SENTENCE_TRANSFORMERS_ONNX_QUANTIZATION
+        or detect_quantization()
+    )
+    if quantization not in QUANTIZATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(
+                f"Quantization must be one of {', '.join(QUANTIZATIONS)}"
+            ),
+        )
+
+    samples = get_sample_chunks(max(0, form_data.sample_size))
+    if not samples:
+        samples = [
+            "Open WebUI is an extensible, self-hosted AI interface.",
+            "Retrieval augmented generation grounds answers in your documents.",
+        ]
+
+    results = {}
+    for kind, model in models.items():
+        try:
+            results[kind] = optimize_model(
+                model,
+                get_model_path(model),
+                kind,
+                quantization,
+                samples,
+                trust_remote_code=(
+                    RAG_EMBEDDING_MODEL_TRUST_REMOTE_CODE
+                    if kind == "embedding"
+                    else RAG_RERANKING_MODEL_TRUST_REMOTE_CODE
+                ),
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERROR_MESSAGES.DEFAULT(e),
+            )
+        except Exception as e:
+            log.exception(f"Error optimizing {model}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=ERROR_MESSAGES.DEFAULT(e),
+            )
+
+    return {"status": True, **results}
+
+
+@router.delete("/models/optimize")
+async def delete_optimized_models(request: Request, user=Depends(get_admin_user)):
+    return {
+        kind: delete_optimized_model(model, kind)
+        for kind, model in get_local_models(request).items()
+    }
+
+
 class OpenAIConfigForm(BaseModel):
     url: str
     key: str
@@ -1126,7 +1415,14 @@ def save_docs_to_vector_db(
     split: bool = True,
     add: bool = False,
     user=None,
+    vectors: Optional[dict[str, list[float]]] = None,
 ) -> bool:
+    """
+    `vectors` maps chunk texts to embeddings computed with the current
+    embedding config, e.g. copied from the file's own collection. Those
+    chunks are stored without being embedded again.
+    """
+
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
 
@@ -1192,12 +1488,7 @@ def save_docs_to_vector_db(
         {
             **doc.metadata,
             **(metadata if metadata else {}),
-            "embedding_config": json.dumps(
-                {
-                    "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-                    "model": request.app.state.config.RAG_EMBEDDING_MODEL,
-                }
-            ),
+            "embedding_config": get_embedding_metadata(request),
         }
         for doc in docs
     ]
@@ -1214,17 +1505,21 @@ def save_docs_to_vector_db(
                 metadata[key] = str(value)
 
     try:
+        new_collection = True
         if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
             log.info(f"collection {collection_name} already exists")
 
             if overwrite:
                 VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                BM25_INDEX.delete_collection(collection_name=collection_name)
                 log.info(f"deleting existing collection {collection_name}")
             elif add is False:
                 log.info(
                     f"collection {collection_name} already exists, overwrite is False and add is False"
                 )
                 return True
+            else:
+                new_collection = False
 
         log.info(f"adding to collection {collection_name}")
         
@@ -1269,11 +1564,21 @@ def save_docs_to_vector_db(
             ),
         )
 
-        embeddings = embedding_function(
-            list(map(lambda x: x.replace("\n", " "), texts)),
-            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-            user=user,
-        )
+        vectors = vectors or {}
+        pending = [text for text in dict.fromkeys(texts) if text not in vectors]
+        if pending:
+            computed = embedding_function(
+                list(map(lambda x: x.replace("\n", " "), pending)),
+                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                user=user,
+            )
+            vectors = {**vectors, **dict(zip(pending, computed))}
+
+        if len(pending) < len(texts):
+            log.info(
+                f"Reusing {len(texts) - len(pending)} of {len(texts)} embeddings for {collection_name}"
+            )
+        embeddings = [vectors[text] for text in texts]
 
         items = [
             {
@@ -1290,6 +1595,19 @@ def save_docs_to_vector_db(
             items=items,
         )
 
+        try:
+            BM25_INDEX.add(
+                collection_name=collection_name,
+                ids=[item["id"] for item in items],
+                texts=texts,
+                metadatas=metadatas,
+                create=new_collection,
+            )
+        except Exception as e:
+            # The index is rebuilt from the vector DB on next use
+            log.warning(f"Failed to update BM25 index for {collection_name}: {e}")
+            BM25_INDEX.delete_collection(collection_name=collection_name)
+
         return True
     except Exception as e:
         log.exception(e)
@@ -1331,6 +1649,8 @@ def process_file(
         else:
             log.debug(f"Using provided collection name: {collection_name}")
 
+        vectors = None
+
         if form_data.content:
             log.info(f"Processing file with provided content - file_id: {file.id}")
             # Update the content in the file
@@ -1340,6 +1660,7 @@ def process_file(
                 # /files/{file_id}/data/content/update
                 log.debug(f"Deleting existing collection: file-{file.id}")
                 VECTOR_DB_CLIENT.delete_collection(collection_name=f"file-{file.id}")
+                BM25_INDEX.delete_collection(collection_name=f"file-{file.id}")
                 log.debug(f"Successfully deleted collection: file-{file.id}")
             except Exception as e:
                 # Audio file upload pipeline
@@ -1368,7 +1689,9 @@ def process_file(
             # Usage: /knowledge/{id}/file/add, /knowledge/{id}/file/update
 
             log.debug(f"Querying existing collection: file-{file.id}")
-            result = VECTOR_DB_CLIENT.query(
+            result = VECTOR_DB_CLIENT.query_embeddings(
+                collection_name=f"file-{file.id}", filter={"file_id": file.id}
+            ) or VECTOR_DB_CLIENT.query(
                 collection_name=f"file-{file.id}", filter={"file_id": file.id}
             )
 
@@ -1381,6 +1704,17 @@ def process_file(
                     )
                     for idx, id in enumerate(result.ids[0])
                 ]
+
+                # Copy the vectors of the file collection instead of embedding
+                # the same chunks again, if they were made with the current
+                # embedding model
+                embedding_config = get_embedding_metadata(request)
+                vectors = {
+                    result.documents[0][idx]: embedding
+                    for idx, embedding in enumerate((result.embeddings or [[]])[0])
+                    if (result.metadatas[0][idx] or {}).get("embedding_config")
+                    == embedding_config
+                }
             else:
                 log.debug("No existing documents found, using file data content")
                 docs = [
@@ -1501,6 +1835,7 @@ def process_file(
                     },
                     add=(True if form_data.collection_name else False),
                     user=user,
+                    vectors=vectors,
                 )
 
                 if result:
@@ -2083,13 +2418,9 @@ def query_doc_handler(
 ):
     try:
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH:
-            collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
-            )
             return query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
-                collection_result=collection_results[form_data.collection_name],
+                collection_result=None,
                 query=form_data.query,
                 embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
                     query, prefix=prefix, user=user
@@ -2205,7 +2536,11 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
 
             VECTOR_DB_CLIENT.delete(
                 collection_name=form_data.collection_name,
-                metadata={"hash": hash},
+                filter={"hash": hash},
+            )
+            BM25_INDEX.delete(
+                collection_name=form_data.collection_name,
+                filter={"hash": hash},
             )
             return {"status": True}
         else:
@@ -2218,6 +2553,7 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
 @router.post("/reset/db")
 def reset_vector_db(user=Depends(get_admin_user)):
     VECTOR_DB_CLIENT.reset()
+    BM25_INDEX.reset()
     Knowledges.delete_all_knowledge()
 
 
@@ -20,9 +20,10 @@ from open_webui.env import (
     WEBSOCKET_REDIS_LOCK_TIMEOUT,
     WEBSOCKET_SENTINEL_PORT,
     WEBSOCKET_SENTINEL_HOSTS,
+    WEBSOCKET_POOL_CACHE_TTL,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock
+from open_webui.socket.utils import AsyncLocalDict, AsyncRedisDict, RedisLock
 
 from open_webui.env import (
     GLOBAL_LOG_LEVEL,
@@ -72,17 +73,19 @@ if WEBSOCKET_MANAGER == "redis":
     redis_sentinels = get_sentinels_from_env(
         WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
     )
-    SESSION_POOL = RedisDict(
+    SESSION_POOL = AsyncRedisDict(
         "open-webui:session_pool",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
+        cache_ttl=WEBSOCKET_POOL_CACHE_TTL,
     )
-    USER_POOL = RedisDict(
+    USER_POOL = AsyncRedisDict(
         "open-webui:user_pool",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
+        cache_ttl=WEBSOCKET_POOL_CACHE_TTL,
     )
-    USAGE_POOL = RedisDict(
+    USAGE_POOL = AsyncRedisDict(
         "open-webui:usage_pool",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
@@ -98,9 +101,9 @@ if WEBSOCKET_MANAGER == "redis":
     renew_func = clean_up_lock.renew_lock
     release_func = clean_up_lock.release_lock
 else:
-    SESSION_POOL = {}
-    USER_POOL = {}
-    USAGE_POOL = {}
+    SESSION_POOL = AsyncLocalDict()
+    USER_POOL = AsyncLocalDict()
+    USAGE_POOL = AsyncLocalDict()
     aquire_func = release_func = renew_func = lambda: True
 
 
@@ -116,8 +119,8 @@ async def periodic_usage_pool_cleanup():
                 raise Exception("Unable to renew usage pool cleanup lock.")
 
             now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
+            updated, removed = {}, []
+            for model_id, connections in await USAGE_POOL.items():
                 # Creating a list of sids to remove if they have timed out
                 expired_sids = [
                     sid
@@ -130,11 +133,12 @@ async def periodic_usage_pool_cleanup():
 
                 if not connections:
                     log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
+                    removed.append(model_id)
+                elif expired_sids:
+                    updated[model_id] = connections
 
-                send_usage = True
+            await USAGE_POOL.set_many(updated)
+            await USAGE_POOL.delete_many(removed)
             await asyncio.sleep(TIMEOUT_DURATION)
     finally:
         release_func()
@@ -146,61 +150,66 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
+    models_in_use = await USAGE_POOL.keys()
     return models_in_use
 
 
-def get_active_user_ids():
+async def get_active_user_ids():
     """Get the list of active user IDs."""
-    return list(USER_POOL.keys())
+    return await USER_POOL.keys()
 
 
-def get_user_active_status(user_id):
+async def get_user_active_status(user_id):
     """Check if a user is currently active."""
-    return user_id in USER_POOL
+    return await USER_POOL.contains(user_id)
 
 
-def get_user_id_from_session_pool(sid):
-    user = SESSION_POOL.get(sid)
+async def get_user_id_from_session_pool(sid):
+    user = await SESSION_POOL.get(sid)
     if user:
         return user["id"]
     return None
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = sio.manager.get_participants(
         namespace="/",
         room=room,
     )
 
-    active_user_ids = list(
-        set(
-            [SESSION_POOL.get(session_id[0])["id"] for session_id in active_session_ids]
-        )
+    users = await SESSION_POOL.get_many(
+        [session_id[0] for session_id in active_session_ids]
     )
+    active_user_ids = list(set([user["id"] for user in users if user]))
     return active_user_ids
 
 
-def get_active_status_by_user_id(user_id):
-    if user_id in USER_POOL:
-        return True
-    return False
+async def get_active_status_by_user_id(user_id):
+    return await USER_POOL.contains(user_id)
+
+
+async def add_session_to_pools(sid, user):
+    await SESSION_POOL.set(sid, user.model_dump())
+    await USER_POOL.set(user.id, (await USER_POOL.get(user.id, [])) + [sid])
 
 
 @sio.on("usage")
 async def usage(sid, data):
-    if sid in SESSION_POOL:
+    if await SESSION_POOL.contains(sid):
         model_id = data["model"]
         # Record the timestamp for the last update
         current_time = int(time.time())
 
         # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
+        await USAGE_POOL.set(
+            model_id,
+            {
+                **(await USAGE_POOL.get(model_id, {})),
+                sid: {"updated_at": current_time},
+            },
+        )
 
 
 @sio.event
@@ -213,11 +222,7 @@ async def connect(sid, environ, auth):
             user = Users.get_user_by_id(data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump()
-            if user.id in USER_POOL:
-                USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-            else:
-                USER_POOL[user.id] = [sid]
+            await add_session_to_pools(sid, user)
 
 
 @sio.on("user-join")
@@ -235,11 +240,7 @@ async def user_join(sid, data):
     if not user:
         return
 
-    SESSION_POOL[sid] = user.model_dump()
-    if user.id in USER_POOL:
-        USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-    else:
-        USER_POOL[user.id] = [sid]
+    await add_session_to_pools(sid, user)
 
     # Join all the channels
     channels = Channels.get_channels_by_user_id(user.id)
@@ -286,13 +287,14 @@ async def channel_events(sid, data):
     event_type = event_data["type"]
 
     if event_type == "typing":
+        user = await SESSION_POOL.get(sid)
         await sio.emit(
             "channel-events",
             {
                 "channel_id": data["channel_id"],
                 "message_id": data.get("message_id", None),
                 "data": event_data,
-                "user": UserNameResponse(**SESSION_POOL[sid]).model_dump(),
+                "user": UserNameResponse(**user).model_dump(),
             },
             room=room,
         )
@@ -300,15 +302,17 @@ async def channel_events(sid, data):
 
 @sio.event
 async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
+    user = await SESSION_POOL.get(sid)
+    if user:
+        await SESSION_POOL.delete(sid)
 
         user_id = user["id"]
-        USER_POOL[user_id] = [_sid for _sid in USER_POOL[user_id] if _sid != sid]
+        session_ids = [_sid for _sid in await USER_POOL.get(user_id, []) if _sid != sid]
 
-        if len(USER_POOL[user_id]) == 0:
-            del USER_POOL[user_id]
+        if len(session_ids) == 0:
+            await USER_POOL.delete(user_id)
+        else:
+            await USER_POOL.set(user_id, session_ids)
     else:
         pass
         # print(f"Unknown session ID {sid} disconnected")
@@ -320,7 +324,7 @@ def get_event_emitter(request_info, update_db=True):
 
         session_ids = list(
             set(
-                USER_POOL.get(user_id, [])
+                (await USER_POOL.get(user_id, []))
                 + (
                     [request_info.get("session_id")]
                     if request_info.get("session_id")
@@ -1,6 +1,15 @@
+import asyncio
 import json
+import logging
+import time
 import uuid
 from open_webui.utils.redis import get_redis_connection
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["SOCKET"])
+
+_MISSING = object()
 
 
 class RedisLock:
@@ -89,3 +98,196 @@ class RedisDict:
         if key not in self:
             self[key] = default
         return self[key]
+
+
+class AsyncRedisDict:
+    """
+    asyncio-native Redis hash used for the websocket pools.
+
+    Multi-key reads and writes are batched into a single HMGET or pipeline.
+    When `cache_ttl` is set, reads go through a short-lived local cache (which
+    also remembers missing keys). Every write publishes the changed keys on
+    `<name>:invalidate`, and each process subscribes to that channel to drop
+    stale entries. The cache is only used while the subscription is healthy.
+    """
+
+    def __init__(self, name, redis_url, redis_sentinels=[], cache_ttl=0):
+        self.name = name
+        self.channel = f"{name}:invalidate"
+        self.redis = get_redis_connection(
+            redis_url, redis_sentinels, async_mode=True, decode_responses=True
+        )
+        self.cache_ttl = cache_ttl
+
+        self._cache = {}
+        self._generation = 0
+        self._subscribed = False
+        self._listener = None
+
+    def _cache_enabled(self):
+        if not self.cache_ttl:
+            return False
+
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return self._subscribed
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                self._invalidate()
+                self._subscribed = True
+
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._invalidate(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"Lost invalidation subscription for {self.name}: {e}")
+            finally:
+                self._subscribed = False
+                self._invalidate()
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(1)
+
+    def _invalidate(self, keys=None):
+        self._generation += 1
+        if keys is None:
+            self._cache.clear()
+        else:
+            for key in keys:
+                self._cache.pop(key, None)
+
+    def _cache_get(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._cache.pop(key, None)
+            return _MISSING
+        return value
+
+    def _cache_set(self, generation, values):
+        # Skip filling the cache if an invalidation arrived while reading
+        if generation != self._generation:
+            return
+
+        expires_at = time.monotonic() + self.cache_ttl
+        for key, value in values.items():
+            self._cache[key] = (expires_at, value)
+
+    async def get_many(self, keys, default=None):
+        keys = list(keys)
+        if not keys:
+            return []
+
+        values = {}
+        cache_enabled = self._cache_enabled()
+        if cache_enabled:
+            for key in keys:
+                value = self._cache_get(key)
+                if value is not _MISSING:
+                    values[key] = value
+
+        missing = [key for key in dict.fromkeys(keys) if key not in values]
+        if missing:
+            generation = self._generation
+            results = await self.redis.hmget(self.name, missing)
+
+            fetched = {
+                key: json.loads(value) if value is not None else None
+                for key, value in zip(missing, results)
+            }
+            if cache_enabled:
+                self._cache_set(generation, fetched)
+            values.update(fetched)
+
+        return [values[key] if values[key] is not None else default for key in keys]
+
+    async def get(self, key, default=None):
+        return (await self.get_many([key], default))[0]
+
+    async def contains(self, key):
+        return (await self.get(key)) is not None
+
+    async def set_many(self, mapping):
+        if not mapping:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(
+                self.name,
+                mapping={key: json.dumps(value) for key, value in mapping.items()},
+            )
+            pipe.publish(self.channel, json.dumps(list(mapping.keys())))
+            await pipe.execute()
+        self._invalidate(mapping.keys())
+
+    async def set(self, key, value):
+        await self.set_many({key: value})
+
+    async def delete_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hdel(self.name, *keys)
+            pipe.publish(self.channel, json.dumps(keys))
+            await pipe.execute()
+        self._invalidate(keys)
+
+    async def delete(self, key):
+        await self.delete_many([key])
+
+    async def keys(self):
+        return await self.redis.hkeys(self.name)
+
+    async def items(self):
+        return [
+            (k, json.loads(v)) for k, v in (await self.redis.hgetall(self.name)).items()
+        ]
+
+
+class AsyncLocalDict:
+    """In-process counterpart of `AsyncRedisDict` with the same interface."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get_many(self, keys, default=None):
+        return [self.data.get(key, default) for key in keys]
+
+    async def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    async def contains(self, key):
+        return key in self.data
+
+    async def set_many(self, mapping):
+        self.data.update(mapping)
+
+    async def set(self, key, value):
+        self.data[key] = value
+
+    async def delete_many(self, keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def keys(self):
+        return list(self.data.keys())
+
+    async def items(self):
+        return list(self.data.items())
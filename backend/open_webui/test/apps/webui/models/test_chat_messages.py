@@ -0,0 +1,86 @@
+import pytest
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+
+class TestUpdateMessageByIdAndMessageId(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.chats import ChatForm, Chats
+
+        self.chats = Chats
+        self.chat = self.chats.insert_new_chat(
+            "test-user",
+            ChatForm(
+                chat={
+                    "title": "chat",
+                    "history": {"currentId": None, "messages": {}},
+                }
+            ),
+        )
+
+    def get_history(self) -> dict:
+        return self.chats.get_chat_by_id(self.chat.id).chat["history"]
+
+    def test_update_message(self):
+        assert self.chats.update_message_by_id_and_message_id(
+            self.chat.id, "m1", {"role": "assistant", "content": "Hello"}
+        )
+        assert self.chats.update_message_by_id_and_message_id(
+            self.chat.id, "m1", {"content": "Hello world", "done": True}
+        )
+
+        history = self.get_history()
+        assert history["currentId"] == "m1"
+        assert history["messages"]["m1"] == {
+            "role": "assistant",
+            "content": "Hello world",
+            "done": True,
+        }
+
+    @pytest.mark.parametrize(
+        "message_id",
+        [
+            "x' || (SELECT 'SECRET') || '",
+            "x'); UPDATE chat SET title = 'SECRET'; --",
+            "it's",
+        ],
+    )
+    def test_update_message_with_quote_in_message_id(self, message_id):
+        assert self.chats.update_message_by_id_and_message_id(
+            self.chat.id, message_id, {"content": "Hello"}
+        )
+
+        # The id is stored as is, nothing of it is run as SQL
+        chat = self.chats.get_chat_by_id(self.chat.id)
+        assert chat.title == "chat"
+        assert chat.chat["history"]["currentId"] == message_id
+        assert chat.chat["history"]["messages"] == {message_id: {"content": "Hello"}}
+
+    def test_update_message_with_quote_in_key(self):
+        assert self.chats.update_message_by_id_and_message_id(
+            self.chat.id, "m1", {"it's": "x' || (SELECT 'SECRET') || '"}
+        )
+
+        history = self.get_history()
+        assert history["messages"]["m1"] == {"it's": "x' || (SELECT 'SECRET') || '"}
+
+    @pytest.mark.parametrize("message_id", ['m"1', "m\\1"])
+    def test_update_message_falls_back_on_path_characters(self, message_id):
+        assert not self.chats.update_message_by_id_and_message_id(
+            self.chat.id, message_id, {"content": "Hello"}
+        )
+        assert self.get_history()["messages"] == {}
+
+    def test_update_message_without_history(self):
+        from open_webui.models.chats import ChatForm
+
+        chat = self.chats.insert_new_chat(
+            "test-user", ChatForm(chat={"title": "chat", "messages": []})
+        )
+
+        # Left to the upsert, like on every dialect
+        assert not self.chats.update_message_by_id_and_message_id(
+            chat.id, "m1", {"content": "Hello"}
+        )
+        assert "history" not in self.chats.get_chat_by_id(chat.id).chat
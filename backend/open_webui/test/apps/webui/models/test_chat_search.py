@@ -0,0 +1,163 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+MIGRATION_PATH = (
+    Path(__file__).parents[4]
+    / "migrations"
+    / "versions"
+    / "e8a2f6c1b7d4_add_chat_search_index.py"
+)
+
+
+def _chat(title: str, *contents: str) -> dict:
+    return {
+        "title": title,
+        "messages": [{"role": "user", "content": content} for content in contents],
+    }
+
+
+class TestChatSearch(AbstractPostgresTest):
+    user_id = "search-user"
+
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.chats import Chats
+
+        self.chats = Chats
+
+    def _insert(self, title: str, *contents: str, user_id: str = None):
+        from open_webui.models.chats import ChatForm
+
+        return self.chats.insert_new_chat(
+            user_id or self.user_id, ChatForm(chat=_chat(title, *contents))
+        )
+
+    def _search(self, search_text: str, **kwargs) -> list[str]:
+        return [
+            chat.title
+            for chat in self.chats.get_chats_by_user_id_and_search_text(
+                self.user_id, search_text, **kwargs
+            )
+        ]
+
+    def test_uses_search_index(self):
+        assert self.chats.has_search_index()
+
+    def test_matches_titles_and_messages(self):
+        self._insert("Quarterly report", "Summarise the numbers")
+        self._insert("Holiday plans", "Which quarterly flights are cheapest?")
+        self._insert("Recipes", "Something with lentils")
+        self._insert("Quarterly report", user_id="other-user")
+
+        assert sorted(self._search("quarterly")) == [
+            "Holiday plans",
+            "Quarterly report",
+        ]
+        assert self._search("lentils") == ["Recipes"]
+        assert self._search("missing") == []
+
+    def test_matches_words_as_prefixes(self):
+        self._insert("Deployment checklist", "Kubernetes manifests")
+
+        assert self._search("deploy") == ["Deployment checklist"]
+        assert self._search("kube manif") == ["Deployment checklist"]
+        assert self._search("kube other") == []
+
+    def test_order_by_rank(self):
+        self._insert("Notes", "mentions python once")
+        self._insert("Python tips", "list comprehensions")
+
+        assert self._search("python", order_by="rank") == ["Python tips", "Notes"]
+
+    def test_index_follows_updates_and_deletes(self):
+        chat = self._insert("Draft", "first version")
+
+        self.chats.update_chat_by_id(chat.id, _chat("Final", "second version"))
+        assert self._search("first") == []
+        assert self._search("second") == ["Final"]
+
+        self.chats.delete_chat_by_id(chat.id)
+        assert self._search("second") == []
+
+    def test_excludes_archived_chats(self):
+        chat = self._insert("Archived chat", "old")
+        self.chats.toggle_chat_archive_by_id(chat.id)
+
+        assert self._search("archived") == []
+        assert self._search("archived", include_archived=True) == ["Archived chat"]
+
+    def test_tolerates_malformed_chats(self):
+        from open_webui.models.chats import ChatForm
+
+        self.chats.insert_new_chat(
+            self.user_id, ChatForm(chat={"title": "Broken", "messages": "oops"})
+        )
+
+        assert self._search("broken") == ["Broken"]
+
+    def test_rebuild_search_index(self):
+        self._insert("Rebuilt", "content")
+
+        assert self.chats.rebuild_search_index() >= 1
+        assert self._search("rebuilt") == ["Rebuilt"]
+
+
+class TestChatSearchMigration:
+    def test_backfills_existing_chats(self, tmp_path):
+        spec = importlib.util.spec_from_file_location(
+            "chat_search_migration", MIGRATION_PATH
+        )
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+
+        engine = sa.create_engine(f"sqlite:///{tmp_path / 'webui.db'}")
+        with engine.begin() as conn:
+            conn.execute(
+                sa.text(
+                    "CREATE TABLE chat (id TEXT PRIMARY KEY, title TEXT, chat JSON)"
+                )
+            )
+            conn.execute(
+                sa.text(
+                    "INSERT INTO chat (id, title, chat) VALUES (:id, :title, :chat)"
+                ),
+                [
+                    {
+                        "id": "c1",
+                        "title": "Existing",
+                        "chat": json.dumps(_chat("Existing", "backfilled content")),
+                    },
+                    {"id": "c2", "title": "Malformed", "chat": "not json"},
+                ],
+            )
+
+            with Operations.context(MigrationContext.configure(conn)):
+                migration.upgrade()
+
+            def search(query: str) -> list[str]:
+                return [
+                    chat_id
+                    for (chat_id,) in conn.execute(
+                        sa.text(
+                            "SELECT chat_search.chat_id FROM chat_fts "
+                            "JOIN chat_search ON chat_search.id = chat_fts.rowid "
+                            "WHERE chat_fts MATCH :query ORDER BY chat_search.chat_id"
+                        ),
+                        {"query": query},
+                    )
+                ]
+
+            assert search("backfilled") == ["c1"]
+            assert search("malformed") == ["c2"]
+
+            # Chats written after the migration are indexed by the triggers
+            conn.execute(sa.text("UPDATE chat SET title = 'Renamed' WHERE id = 'c2'"))
+            assert search("malformed") == []
+            assert search("renamed") == ["c2"]
@@ -0,0 +1,143 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+MIGRATION_PATH = (
+    Path(__file__).parents[4]
+    / "migrations"
+    / "versions"
+    / "d31026856c01_add_group_member_table.py"
+)
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location(
+        "group_member_migration", MIGRATION_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestGroupMemberMigration:
+    def test_backfills_memberships_from_user_ids(self, tmp_path):
+        engine = sa.create_engine(f"sqlite:///{tmp_path / 'webui.db'}")
+        with engine.begin() as conn:
+            conn.execute(
+                sa.text('CREATE TABLE "group" (id TEXT PRIMARY KEY, user_ids JSON)')
+            )
+            conn.execute(
+                sa.text('INSERT INTO "group" (id, user_ids) VALUES (:id, :user_ids)'),
+                [
+                    {"id": "g1", "user_ids": json.dumps(["u1", "u2", "u1"])},
+                    {"id": "g2", "user_ids": json.dumps(["u2", "", None])},
+                    {"id": "g3", "user_ids": None},
+                    # A JSON encoded string
+                    {"id": "g4", "user_ids": json.dumps(json.dumps(["u3"]))},
+                ],
+            )
+
+            with Operations.context(MigrationContext.configure(conn)):
+                _load_migration().upgrade()
+
+            rows = conn.execute(
+                sa.text(
+                    "SELECT group_id, user_id FROM group_member "
+                    "ORDER BY group_id, user_id"
+                )
+            ).fetchall()
+
+        assert [tuple(row) for row in rows] == [
+            ("g1", "u1"),
+            ("g1", "u2"),
+            ("g2", "u2"),
+            ("g4", "u3"),
+        ]
+
+
+class TestGroupMembers(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.groups import Groups
+
+        self.groups = Groups
+
+    def _create_group(self, name: str, user_ids: list[str]):
+        from open_webui.models.groups import GroupForm
+
+        group = self.groups.insert_new_group(
+            "admin", GroupForm(name=name, description="")
+        )
+        return self._update_group(group.id, name, user_ids)
+
+    def _update_group(self, group_id: str, name: str, user_ids: list[str]):
+        from open_webui.models.groups import GroupUpdateForm
+
+        return self.groups.update_group_by_id(
+            group_id,
+            GroupUpdateForm(name=name, description="", user_ids=user_ids),
+        )
+
+    def _get_legacy_user_ids(self, group_id: str) -> list[str]:
+        from open_webui.internal.db import get_db
+        from open_webui.models.groups import Group
+
+        with get_db() as db:
+            return db.query(Group).filter_by(id=group_id).first().user_ids
+
+    def test_update_members(self):
+        group = self._create_group("group", ["u1", "u2", "u1"])
+        assert group.user_ids == ["u1", "u2"]
+
+        group = self._update_group(group.id, "group", ["u2", "u3"])
+        assert sorted(group.user_ids) == ["u2", "u3"]
+        assert sorted(self._get_legacy_user_ids(group.id)) == ["u2", "u3"]
+
+    def test_lookups_by_member(self):
+        first = self._create_group("first", ["u1", "u2"])
+        second = self._create_group("second", ["u2"])
+
+        assert [group.id for group in self.groups.get_groups_by_member_id("u1")] == [
+            first.id
+        ]
+        assert self.groups.get_group_ids_by_member_id("u2") == {first.id, second.id}
+        assert self.groups.get_group_ids_by_member_id("u3") == set()
+        assert self.groups.get_user_ids_by_group_ids([first.id, second.id]) == {
+            "u1",
+            "u2",
+        }
+
+    def test_remove_user_from_all_groups(self):
+        first = self._create_group("first", ["u1", "u2"])
+        second = self._create_group("second", ["u1"])
+
+        assert self.groups.remove_user_from_all_groups("u1")
+
+        assert self.groups.get_group_ids_by_member_id("u1") == set()
+        assert self.groups.get_group_user_ids_by_id(first.id) == ["u2"]
+        assert self.groups.get_group_user_ids_by_id(second.id) == []
+        assert self._get_legacy_user_ids(first.id) == ["u2"]
+
+    def test_sync_groups_by_group_names(self):
+        first = self._create_group("first", ["u1"])
+        second = self._create_group("second", [])
+
+        assert self.groups.sync_groups_by_group_names("u1", ["second"])
+
+        assert self.groups.get_group_ids_by_member_id("u1") == {second.id}
+        assert self._get_legacy_user_ids(first.id) == []
+        assert self._get_legacy_user_ids(second.id) == ["u1"]
+
+    def test_delete_group_removes_memberships(self):
+        group = self._create_group("group", ["u1"])
+
+        assert self.groups.delete_group_by_id(group.id)
+
+        assert self.groups.get_group_ids_by_member_id("u1") == set()
+        assert self.groups.get_user_ids_by_group_ids([group.id]) == set()
@@ -0,0 +1,94 @@
+import time
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+
+def set_task(id: str, **values):
+    from open_webui.internal.db import get_db
+    from open_webui.models.ingestion import IngestionTask
+
+    with get_db() as db:
+        db.query(IngestionTask).filter_by(id=id).update(values)
+        db.commit()
+
+
+def get_task(id: str):
+    from open_webui.internal.db import get_db
+    from open_webui.models.ingestion import IngestionTask
+
+    with get_db() as db:
+        return db.get(IngestionTask, id)
+
+
+class TestClaimTasksByJobId(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.ingestion import Ingestions
+
+        self.ingestions = Ingestions
+        self.job = self.ingestions.insert_new_job(
+            "test-user",
+            "reindex",
+            [("file-1", "collection"), ("file-2", "collection")],
+        )
+
+    def claim(self, limit: int = 2, stale_before: int = 0, max_attempts: int = 3):
+        return self.ingestions.claim_tasks_by_job_id(
+            self.job.id, limit, stale_before, max_attempts
+        )
+
+    def test_claim_pending_tasks(self):
+        first = self.claim(limit=1)
+        assert len(first) == 1
+        assert first[0].status == "processing"
+        assert first[0].attempts == 1
+
+        second = self.claim()
+        assert [task.file_id for task in second] != [first[0].file_id]
+        assert len(second) == 1
+
+        # Both are being processed
+        assert self.claim() == []
+        assert self.ingestions.get_job_progress(self.job.id) == {"processing": 2}
+
+    def test_reclaim_stale_task(self):
+        [task] = self.claim(limit=1)
+        set_task(task.id, updated_at=0)
+
+        claimed = self.claim(stale_before=int(time.time()))
+        assert task.id in [claimed_task.id for claimed_task in claimed]
+        assert get_task(task.id).attempts == 2
+
+    def test_heartbeat_keeps_task_claimed(self):
+        [task] = self.claim(limit=1)
+        set_task(task.id, updated_at=0)
+
+        assert self.ingestions.touch_tasks_by_ids([task.id]) == 1
+        claimed = self.claim(stale_before=int(time.time()) - 60)
+        assert task.id not in [claimed_task.id for claimed_task in claimed]
+        assert get_task(task.id).attempts == 1
+
+    def test_fail_task_after_max_attempts(self):
+        [task] = self.claim(limit=1)
+        set_task(task.id, updated_at=0, attempts=3)
+
+        claimed = self.claim(stale_before=int(time.time()))
+        assert task.id not in [claimed_task.id for claimed_task in claimed]
+
+        failed = get_task(task.id)
+        assert failed.status == "failed"
+        assert failed.error
+
+        response = self.ingestions.get_job_response_by_id(self.job.id)
+        assert [error.id for error in response.errors] == [task.id]
+
+    def test_cancel_job(self):
+        [task] = self.claim(limit=1)
+
+        job = self.ingestions.cancel_job_by_id(self.job.id)
+        assert job.status == "cancelled"
+        assert self.ingestions.get_job_progress(self.job.id) == {
+            "processing": 1,
+            "cancelled": 1,
+        }
+        assert self.claim() == []
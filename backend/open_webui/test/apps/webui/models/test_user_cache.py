@@ -0,0 +1,119 @@
+import uuid
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+
+class TestUserCache(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.users import Users
+
+        self.users = Users
+        id = str(uuid.uuid4())
+        self.user = self.users.insert_new_user(
+            id, "John Doe", f"{id}@openwebui.com", role="user"
+        )
+
+    def teardown_method(self):
+        super().teardown_method()
+        self.users.cache.invalidate(self.user.id)
+
+    def _update_behind_cache(self, id: str, **values):
+        from open_webui.internal.db import get_db
+        from open_webui.models.users import User
+
+        with get_db() as db:
+            db.query(User).filter_by(id=id).update(values)
+            db.commit()
+
+    def test_lookups_are_cached(self):
+        assert self.users.get_cached_user_by_id(self.user.id).name == "John Doe"
+
+        self._update_behind_cache(self.user.id, name="Jane Doe")
+
+        assert self.users.get_cached_user_by_id(self.user.id).name == "John Doe"
+        assert self.users.get_user_by_id(self.user.id).name == "Jane Doe"
+
+    def test_role_change_invalidates(self):
+        assert self.users.get_cached_user_by_id(self.user.id).role == "user"
+
+        self.users.update_user_role_by_id(self.user.id, "admin")
+
+        assert self.users.get_cached_user_by_id(self.user.id).role == "admin"
+
+    def test_delete_invalidates(self):
+        assert self.users.get_cached_user_by_id(self.user.id) is not None
+
+        assert self.users.delete_user_by_id(self.user.id)
+
+        assert self.users.get_cached_user_by_id(self.user.id) is None
+
+    def test_api_key_change_invalidates(self):
+        id = self.user.id
+        self.users.update_user_api_key_by_id(id, f"sk-{id}")
+        assert self.users.get_cached_user_by_api_key(f"sk-{id}").id == id
+
+        self.users.update_user_api_key_by_id(id, f"sk-new-{id}")
+
+        assert self.users.get_cached_user_by_api_key(f"sk-{id}") is None
+        assert self.users.get_cached_user_by_api_key(f"sk-new-{id}").id == id
+
+    def test_user_changed_while_loading_is_not_cached(self):
+        from open_webui.models.users import UserCache
+
+        id = self.user.id
+        cache = UserCache(ttl=60)
+
+        def load():
+            # Another request changes the user mid-lookup
+            cache.invalidate(id)
+            return self.users.get_user_by_id(id)
+
+        cache.get(id, load)
+        self._update_behind_cache(id, name="Jane Doe")
+
+        assert cache.get(id, lambda: self.users.get_user_by_id(id)).name == "Jane Doe"
+
+    def test_returned_users_are_copies(self):
+        self.users.get_cached_user_by_id(self.user.id).role = "admin"
+
+        assert self.users.get_cached_user_by_id(self.user.id).role == "user"
+
+
+class TestLastActiveTracker(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.users import LastActiveTracker, Users
+
+        self.users = Users
+        self.tracker = LastActiveTracker(granularity=60, interval=3600)
+
+    def test_touches_are_coalesced(self, monkeypatch):
+        flushed = []
+        monkeypatch.setattr(
+            self.tracker, "_flush_in_background", lambda: flushed.append(True)
+        )
+
+        self.tracker.touch("u1")
+        self.tracker.touch("u1")
+        self.tracker.touch("u2")
+
+        # Recorded once per user, and not flushed before the interval passed
+        assert self.tracker._pending == {"u1", "u2"}
+        assert flushed == []
+
+    def test_flush_writes_pending_users(self):
+        from open_webui.internal.db import get_db
+        from open_webui.models.users import User
+
+        id = str(uuid.uuid4())
+        self.users.insert_new_user(id, "John Doe", f"{id}@openwebui.com")
+        with get_db() as db:
+            db.query(User).filter_by(id=id).update({"last_active_at": 0})
+            db.commit()
+
+        self.tracker.touch(id)
+        self.tracker.flush()
+
+        assert self.tracker._pending == set()
+        assert self.users.get_user_by_id(id).last_active_at > 0
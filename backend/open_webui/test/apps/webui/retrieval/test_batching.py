@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from open_webui.retrieval.models.batching import MicroBatcher
+
+
+class Model:
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, items, suffix="!"):
+        with self.lock:
+            self.batches.append(list(items))
+        return [f"{item}{suffix}" for item in items]
+
+
+def _call_concurrently(batcher, calls):
+    results = [None] * len(calls)
+
+    def call(idx, items, kwargs):
+        results[idx] = batcher(items, **kwargs)
+
+    threads = [
+        threading.Thread(target=call, args=(idx, items, kwargs))
+        for idx, (items, kwargs) in enumerate(calls)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results
+
+
+class TestMicroBatcher:
+    def test_results_are_scattered_back_in_order(self):
+        model = Model()
+        # The batch runs as soon as all seven inputs are queued
+        batcher = MicroBatcher(model, max_batch_size=7, max_wait=5)
+
+        calls = [
+            (["ccc", "a", "bbbbb"], {}),
+            (["dddd", "ee"], {}),
+            (["ffffff", "g"], {}),
+        ]
+        results = _call_concurrently(batcher, calls)
+
+        assert results == [
+            ["ccc!", "a!", "bbbbb!"],
+            ["dddd!", "ee!"],
+            ["ffffff!", "g!"],
+        ]
+        assert len(model.batches) == 1
+        # Inputs are sorted by length within the batch
+        assert [len(item) for item in model.batches[0]] == [1, 1, 2, 3, 4, 5, 6]
+
+    def test_only_calls_with_the_same_kwargs_are_merged(self):
+        model = Model()
+        batcher = MicroBatcher(model, max_batch_size=10, max_wait=0.05)
+
+        results = _call_concurrently(
+            batcher,
+            [(["a"], {"suffix": "?"}), (["b"], {}), (["c"], {"suffix": "?"})],
+        )
+
+        assert results == [["a?"], ["b!"], ["c?"]]
+        # Calls with other kwargs never share a batch
+        assert not any("b" in batch and "a" in batch for batch in model.batches)
+        assert not any("b" in batch and "c" in batch for batch in model.batches)
+
+    def test_batches_are_bounded_by_size(self):
+        model = Model()
+        batcher = MicroBatcher(model, max_batch_size=4, max_wait=0.05)
+
+        results = _call_concurrently(
+            batcher, [([f"{idx}a", f"{idx}b"], {}) for idx in range(5)]
+        )
+
+        assert results == [[f"{idx}a!", f"{idx}b!"] for idx in range(5)]
+        assert all(len(batch) <= 4 for batch in model.batches)
+
+    def test_large_calls_run_directly(self):
+        model = Model()
+        batcher = MicroBatcher(model, max_batch_size=2, max_wait=5)
+
+        assert batcher(["a", "b", "c"]) == ["a!", "b!", "c!"]
+        assert batcher([]) == []
+        assert batcher.get_stats()["direct_requests"] == 1
+        assert batcher._worker is None
+
+    def test_errors_are_raised_in_every_caller(self):
+        def fail(items):
+            raise ValueError("model failed")
+
+        batcher = MicroBatcher(fail, max_batch_size=10, max_wait=0.05)
+        errors = []
+
+        def call(items):
+            try:
+                batcher(items)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call, args=([item],)) for item in "ab"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert len(errors) == 2
+
+    def test_result_count_mismatch_fails_the_callers(self):
+        results = [["a!"], ["b!"]]
+        batcher = MicroBatcher(
+            lambda items: results.pop(0), max_batch_size=10, max_wait=0.01
+        )
+
+        with pytest.raises(ValueError, match="Expected 2 results, got 1"):
+            batcher(["a", "b"])
+
+        # The worker is still running batches
+        assert batcher(["b"]) == ["b!"]
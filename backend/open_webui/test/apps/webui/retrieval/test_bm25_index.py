@@ -0,0 +1,133 @@
+import pytest
+
+from open_webui.retrieval import utils as retrieval_utils
+from open_webui.retrieval.bm25 import BM25Index
+from open_webui.retrieval.vector.main import GetResult
+
+
+def _result(chunks: dict[str, str]) -> GetResult:
+    ids = list(chunks.keys())
+    return GetResult(
+        ids=[ids],
+        documents=[[chunks[id] for id in ids]],
+        metadatas=[[{"file_id": id.split("-")[0], "chunk": id} for id in ids]],
+    )
+
+
+def _search(index: BM25Index, query: str) -> list[str]:
+    return sorted(
+        doc.metadata["chunk"] for doc in index.search("collection", query, k=10)
+    )
+
+
+class TestBM25Index:
+    @pytest.fixture
+    def index(self, tmp_path):
+        return BM25Index(str(tmp_path / "bm25"))
+
+    def test_build(self, index):
+        index.build(
+            "collection",
+            _result({"a-1": "the quick brown fox", "b-1": "a lazy dog"}),
+        )
+
+        assert index.has_index("collection")
+        assert _search(index, "fox") == ["a-1"]
+        assert _search(index, "dog fox") == ["a-1", "b-1"]
+        assert not index.has_index("other")
+
+    def test_build_replaces_index(self, index):
+        index.build("collection", _result({"a-1": "the quick brown fox"}))
+        index.build("collection", _result({"b-1": "a lazy dog"}))
+
+        assert _search(index, "fox") == []
+        assert _search(index, "dog") == ["b-1"]
+
+    def test_add(self, index):
+        index.add("collection", ["a-1"], ["the quick brown fox"], [{"chunk": "a-1"}])
+        # Without an index, chunks are left to the backfill
+        assert not index.has_index("collection")
+
+        index.add(
+            "collection",
+            ["a-1"],
+            ["the quick brown fox"],
+            [{"chunk": "a-1"}],
+            create=True,
+        )
+        index.add("collection", ["b-1"], ["a lazy dog"], [{"chunk": "b-1"}])
+
+        assert _search(index, "fox dog") == ["a-1", "b-1"]
+
+    def test_add_replaces_chunk(self, index):
+        index.build("collection", _result({"a-1": "the quick brown fox"}))
+        index.add("collection", ["a-1"], ["a lazy dog"], [{"chunk": "a-1"}])
+
+        assert _search(index, "fox") == []
+        assert _search(index, "dog") == ["a-1"]
+
+    def test_delete_by_ids(self, index):
+        index.build(
+            "collection",
+            _result({"a-1": "the quick brown fox", "b-1": "a quick dog"}),
+        )
+        index.delete("collection", ids=["a-1"])
+
+        assert _search(index, "quick") == ["b-1"]
+
+    def test_delete_by_filter(self, index):
+        index.build(
+            "collection",
+            _result(
+                {
+                    "a-1": "the quick brown fox",
+                    "a-2": "jumps quick",
+                    "b-1": "a quick dog",
+                }
+            ),
+        )
+        index.delete("collection", filter={"file_id": "a"})
+
+        assert _search(index, "quick") == ["b-1"]
+
+    def test_delete_collection(self, index):
+        index.build("collection", _result({"a-1": "the quick brown fox"}))
+        index.delete_collection("collection")
+
+        assert not index.has_index("collection")
+
+    def test_reconcile(self, index):
+        built = _result({"a-1": "the quick brown fox", "b-1": "a lazy dog"})
+        index.build("collection", built)
+
+        # b-1 was deleted and c-1 added while the index was built
+        latest = _result({"a-1": "the quick brown fox", "c-1": "a quick cat"})
+        index.reconcile("collection", built, latest)
+
+        assert _search(index, "dog") == []
+        assert _search(index, "quick") == ["a-1", "c-1"]
+
+
+class TestEnsureBM25Index:
+    def test_backfill_catches_up_with_concurrent_adds(self, tmp_path, monkeypatch):
+        index = BM25Index(str(tmp_path / "bm25"))
+        reads = [
+            _result({"a-1": "the quick brown fox"}),
+            _result({"a-1": "the quick brown fox", "b-1": "a quick dog"}),
+        ]
+
+        class VectorDBClient:
+            def get(self, collection_name):
+                result = reads.pop(0)
+                if not reads:
+                    return result
+                # A chunk is inserted while the index is being built, the add
+                # is skipped as the index doesn't exist yet
+                index.add("collection", ["b-1"], ["a quick dog"], [{"chunk": "b-1"}])
+                return result
+
+        monkeypatch.setattr(retrieval_utils, "BM25_INDEX", index)
+        monkeypatch.setattr(retrieval_utils, "VECTOR_DB_CLIENT", VectorDBClient())
+
+        assert retrieval_utils.ensure_bm25_index("collection")
+        assert _search(index, "quick") == ["a-1", "b-1"]
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import pytest
+
+from open_webui.routers import knowledge
+
+
+class VectorDB:
+    def __init__(self, metadatas: list[dict]):
+        self.metadatas = metadatas
+
+    def has_collection(self, collection_name: str) -> bool:
+        return True
+
+    def get(self, collection_name: str):
+        return SimpleNamespace(metadatas=[self.metadatas])
+
+    def delete(self, collection_name: str, filter: dict):
+        self.metadatas = [
+            metadata
+            for metadata in self.metadatas
+            if metadata.get("file_id") != filter["file_id"]
+        ]
+
+
+class TestPruneRemovedFiles:
+    @pytest.fixture
+    def vector_db(self, monkeypatch):
+        vector_db = VectorDB(
+            [
+                {"file_id": "kept"},
+                {"file_id": "removed"},
+                {"file_id": "removed"},
+                {"source": "no file"},
+            ]
+        )
+        monkeypatch.setattr(knowledge, "VECTOR_DB_CLIENT", vector_db)
+        monkeypatch.setattr(
+            knowledge, "BM25_INDEX", SimpleNamespace(delete=vector_db.delete)
+        )
+        return vector_db
+
+    def test_prunes_chunks_of_removed_files(self, vector_db):
+        assert knowledge.prune_removed_files("collection", ["kept"]) == 1
+
+        assert vector_db.metadatas == [{"file_id": "kept"}, {"source": "no file"}]
+
+    def test_keeps_chunks_of_current_files(self, vector_db):
+        assert knowledge.prune_removed_files("collection", ["kept", "removed"]) == 0
+
+        assert len(vector_db.metadatas) == 4
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from test.util.abstract_integration_test import AbstractPostgresTest
+
+
+class TestIngestionQueue(AbstractPostgresTest):
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.ingestion import Ingestions
+
+        self.ingestions = Ingestions
+        self.job = self.ingestions.insert_new_job(
+            "test-user",
+            "reindex",
+            [("file-1", "collection"), ("file-2", "collection")],
+        )
+        self.ingested = Counter()
+        self.lock = threading.Lock()
+
+    def create_queue(self, workers: int, task_timeout: float):
+        from open_webui.utils.ingestion import IngestionQueue
+
+        return IngestionQueue(
+            workers=workers, task_timeout=task_timeout, max_attempts=3, poll_interval=5
+        )
+
+    def run_job(self, monkeypatch, queue, duration: float = 0.0):
+        from open_webui.utils import ingestion
+
+        def ingest_file(request, task, user):
+            with self.lock:
+                self.ingested[task.file_id] += 1
+            time.sleep(duration)
+            return "completed"
+
+        monkeypatch.setattr(
+            ingestion.Users, "get_user_by_id", lambda id: SimpleNamespace(id=id)
+        )
+        monkeypatch.setattr(queue, "_ingest_file", ingest_file)
+        monkeypatch.setattr(queue, "_emit", lambda job: asyncio.sleep(0))
+
+        queue._app = SimpleNamespace(state=SimpleNamespace())
+        queue._executor = ThreadPoolExecutor(max_workers=queue.workers)
+        try:
+            asyncio.run(queue._run_job(self.job))
+        finally:
+            queue._executor.shutdown()
+
+    def test_run_job(self, monkeypatch):
+        queue = self.create_queue(workers=2, task_timeout=900)
+        self.run_job(monkeypatch, queue)
+
+        assert self.ingested == {"file-1": 1, "file-2": 1}
+        assert self.ingestions.get_job_progress(self.job.id) == {"completed": 2}
+        assert self.ingestions.get_job_by_id(self.job.id).status == "completed"
+
+    def test_resume_task_of_dead_worker(self, monkeypatch):
+        # Claimed by a worker that died mid-file
+        from open_webui.internal.db import get_db
+        from open_webui.models.ingestion import IngestionTask
+
+        [task] = self.ingestions.claim_tasks_by_job_id(self.job.id, 1, 0, 3)
+        with get_db() as db:
+            db.query(IngestionTask).filter_by(id=task.id).update({"updated_at": 0})
+            db.commit()
+
+        queue = self.create_queue(workers=2, task_timeout=900)
+        self.run_job(monkeypatch, queue)
+
+        assert self.ingested == {"file-1": 1, "file-2": 1}
+        assert self.ingestions.get_job_progress(self.job.id) == {"completed": 2}
+
+    def test_long_task_is_not_claimed_twice(self, monkeypatch):
+        # Processing a file takes longer than the task timeout
+        queue = self.create_queue(workers=4, task_timeout=1.5)
+        self.run_job(monkeypatch, queue, duration=3.0)
+
+        assert self.ingested == {"file-1": 1, "file-2": 1}
+        assert self.ingestions.get_job_progress(self.job.id) == {"completed": 2}
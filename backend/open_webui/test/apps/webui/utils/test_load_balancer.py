@@ -0,0 +1,114 @@
+import pytest
+
+from open_webui.utils import load_balancer
+from open_webui.utils.load_balancer import LoadBalancer
+
+URLS = ["http://a", "http://b", "http://c"]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class TestLoadBalancer:
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = Clock()
+        monkeypatch.setattr(load_balancer.time, "monotonic", clock.monotonic)
+        return clock
+
+    def _fail(self, balancer: LoadBalancer, url: str, times: int = 1):
+        for _ in range(times):
+            balancer.start(url).finish(success=False)
+
+    def test_unknown_strategy_falls_back_to_random(self):
+        assert LoadBalancer(strategy="unknown").strategy == "random"
+
+    def test_single_url_is_returned_as_is(self):
+        assert LoadBalancer().select(["http://a"]) == "http://a"
+
+    def test_least_outstanding(self, clock):
+        balancer = LoadBalancer(strategy="least_outstanding")
+        balancer.start("http://a")
+        balancer.start("http://a")
+        balancer.start("http://b")
+
+        assert balancer.select(URLS) == "http://c"
+
+    def test_ewma_prefers_the_fastest_node(self, clock):
+        balancer = LoadBalancer(strategy="ewma")
+        for url, latency in [("http://a", 2.0), ("http://b", 0.5), ("http://c", 1.0)]:
+            request = balancer.start(url)
+            clock.now += latency
+            request.finish()
+
+        assert balancer.select(URLS) == "http://b"
+
+    def test_affinity_prefers_nodes_with_the_model_loaded(self, clock):
+        balancer = LoadBalancer(strategy="affinity")
+        balancer.update_loaded_models("http://b", ["llama3"])
+        balancer.start("http://b")
+
+        assert balancer.select(URLS, "llama3") == "http://b"
+        # Without a loaded copy the least busy node is used
+        assert balancer.select(URLS, "mistral") in ["http://a", "http://c"]
+
+    def test_ejects_after_consecutive_failures(self, clock):
+        balancer = LoadBalancer(failure_threshold=3, cooldown=30.0)
+        self._fail(balancer, "http://a", 2)
+        balancer.start("http://a").finish(success=True)
+        self._fail(balancer, "http://a", 2)
+        assert "http://a" in {balancer.select(URLS) for _ in range(50)}
+
+        self._fail(balancer, "http://a")
+        assert "http://a" not in {balancer.select(URLS) for _ in range(50)}
+
+        state = {node["url"]: node for node in balancer.get_state()["nodes"]}
+        assert state["http://a"]["ejected"]
+        assert state["http://a"]["errors"] == 5
+
+    def test_all_ejected_picks_the_first_to_recover(self, clock):
+        balancer = LoadBalancer(failure_threshold=1, cooldown=30.0)
+        for url in URLS:
+            self._fail(balancer, url)
+            clock.now += 1
+
+        assert balancer.select(URLS) == "http://a"
+
+    def test_half_open_lets_one_probe_through(self, clock):
+        balancer = LoadBalancer(failure_threshold=1, cooldown=30.0)
+        self._fail(balancer, "http://a")
+        clock.now += 31
+
+        assert balancer.select(["http://a", "http://b"]) in ["http://a", "http://b"]
+        probe = balancer.start("http://a")
+        assert probe.probe
+        # No further requests while the probe is running
+        assert {balancer.select(["http://a", "http://b"]) for _ in range(50)} == {
+            "http://b"
+        }
+
+        probe.finish(success=True)
+        assert "http://a" in {
+            balancer.select(["http://a", "http://b"]) for _ in range(50)
+        }
+        assert not balancer.start("http://a").probe
+
+    def test_failed_probe_ejects_again(self, clock):
+        balancer = LoadBalancer(failure_threshold=3, cooldown=30.0)
+        self._fail(balancer, "http://a", 3)
+        clock.now += 31
+
+        probe = balancer.start("http://a")
+        assert probe.probe
+        probe.finish(success=False)
+
+        assert "http://a" not in {
+            balancer.select(["http://a", "http://b"]) for _ in range(50)
+        }
+        clock.now += 31
+        assert balancer.start("http://a").probe
@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+from open_webui.utils import tools, upstream_cache
+from open_webui.utils.upstream_cache import UpstreamCache
+
+URL = "http://tools.local/openapi.json"
+
+SPEC = {
+    "openapi": "3.1.0",
+    "info": {"title": "Tools", "description": ""},
+    "paths": {
+        "/time": {
+            "get": {
+                "operationId": "get_time",
+                "summary": "Current time",
+            }
+        }
+    },
+}
+
+
+class Response:
+    def __init__(self, status: int, body=None, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def json(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class ToolServer:
+    """Serves an OpenAPI spec with an ETag, recording the request headers."""
+
+    def __init__(self, spec: dict, etag: str):
+        self.spec = spec
+        self.etag = etag
+        self.down = False
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        if self.down:
+            return Response(503, {"detail": "unavailable"})
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return Response(304)
+        return Response(200, self.spec, {"ETag": self.etag})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class TestToolServerCache:
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = Clock()
+        monkeypatch.setattr(upstream_cache.time, "time", clock.time)
+        return clock
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        server = ToolServer(SPEC, '"v1"')
+        monkeypatch.setattr(tools, "get_http_session", lambda url: server)
+        monkeypatch.setattr(
+            tools,
+            "TOOL_SERVER_CACHE",
+            UpstreamCache(ttl=300, stale_ttl=3600, namespace="test"),
+        )
+        return server
+
+    def test_spec_is_parsed_and_cached(self, clock, server):
+        async def run():
+            first = await tools.get_cached_tool_server_data("token", URL)
+            clock.now += 100
+            return first, await tools.get_cached_tool_server_data("token", URL)
+
+        first, second = asyncio.run(run())
+        assert first["etag"] == '"v1"'
+        assert [spec["name"] for spec in first["specs"]] == ["get_time"]
+        assert "get_time" in first["operations"]
+        assert second == first
+        assert len(server.requests) == 1
+        assert server.requests[0]["Authorization"] == "Bearer token"
+
+    def test_stale_spec_is_revalidated_with_its_etag(self, clock, server):
+        async def run():
+            await tools.get_cached_tool_server_data("token", URL)
+
+            clock.now += 400
+            stale = await tools.get_cached_tool_server_data("token", URL)
+            await _settle()
+
+            # Unchanged: the revalidated spec is fresh again
+            clock.now += 100
+            await tools.get_cached_tool_server_data("token", URL)
+            return stale
+
+        stale = asyncio.run(run())
+        assert stale["etag"] == '"v1"'
+        assert len(server.requests) == 2
+        assert "If-None-Match" not in server.requests[0]
+        assert server.requests[1]["If-None-Match"] == '"v1"'
+
+    def test_changed_spec_replaces_the_cached_one(self, clock, server):
+        async def run():
+            await tools.get_cached_tool_server_data("token", URL)
+
+            server.spec = {**SPEC, "info": {"title": "Tools v2"}}
+            server.etag = '"v2"'
+            clock.now += 400
+            await tools.get_cached_tool_server_data("token", URL)
+            await _settle()
+            return await tools.get_cached_tool_server_data("token", URL)
+
+        data = asyncio.run(run())
+        assert data["etag"] == '"v2"'
+        assert data["info"] == {"title": "Tools v2"}
+
+    def test_unreachable_server_is_served_stale(self, clock, server):
+        async def run():
+            await tools.get_cached_tool_server_data("token", URL)
+
+            server.down = True
+            clock.now += 400
+            stale = await tools.get_cached_tool_server_data("token", URL)
+            await _settle()
+
+            # Past ttl + stale_ttl the spec is fetched in the foreground
+            clock.now += 3600
+            try:
+                await tools.get_cached_tool_server_data("token", URL)
+            except Exception as e:
+                return stale, e
+
+        stale, error = asyncio.run(run())
+        assert stale["etag"] == '"v1"'
+        assert "Could not fetch tool server spec" in str(error)
+
+    def test_invalidate(self, clock, server):
+        async def run():
+            await tools.get_cached_tool_server_data("token", URL)
+            await tools.invalidate_tool_servers_data(
+                [{"url": "http://tools.local", "path": "openapi.json"}]
+            )
+            return await tools.get_cached_tool_server_data("token", URL)
+
+        asyncio.run(run())
+        assert len(server.requests) == 2
+        # Dropped specs are fetched again without revalidation
+        assert "If-None-Match" not in server.requests[1]
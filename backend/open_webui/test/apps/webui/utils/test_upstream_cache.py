@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from open_webui.utils import upstream_cache
+from open_webui.utils.upstream_cache import UpstreamCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class Upstream:
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+async def _settle():
+    # Let background refreshes run to completion
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestUpstreamCache:
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = Clock()
+        monkeypatch.setattr(upstream_cache.time, "time", clock.time)
+        return clock
+
+    @pytest.fixture
+    def cache(self):
+        return UpstreamCache(ttl=10, stale_ttl=60, namespace="test")
+
+    def test_fresh_entry_is_served_from_cache(self, clock, cache):
+        upstream = Upstream({"models": ["a"]}, {"models": ["b"]})
+
+        async def run():
+            first = await cache.get("key", upstream.fetch)
+            clock.now += 5
+            return first, await cache.get("key", upstream.fetch)
+
+        assert asyncio.run(run()) == ({"models": ["a"]}, {"models": ["a"]})
+        assert upstream.calls == 1
+
+    def test_concurrent_misses_share_one_fetch(self, clock, cache):
+        upstream = Upstream(["a"])
+
+        async def run():
+            return await asyncio.gather(
+                *[cache.get("key", upstream.fetch) for _ in range(5)]
+            )
+
+        assert asyncio.run(run()) == [["a"]] * 5
+        assert upstream.calls == 1
+
+    def test_stale_entry_is_served_while_revalidating(self, clock, cache):
+        upstream = Upstream(["a"], ["b"])
+
+        async def run():
+            await cache.get("key", upstream.fetch)
+            clock.now += 15
+            stale = await cache.get("key", upstream.fetch)
+            await _settle()
+            return stale, await cache.get("key", upstream.fetch)
+
+        assert asyncio.run(run()) == (["a"], ["b"])
+        assert upstream.calls == 2
+
+    def test_failed_refresh_keeps_the_stale_bound(self, clock, cache):
+        upstream = Upstream(["a"], None, RuntimeError("down"), None)
+
+        async def run():
+            await cache.get("key", upstream.fetch)
+
+            clock.now += 15
+            results = [await cache.get("key", upstream.fetch)]
+            await _settle()
+
+            # The failed refresh isn't retried within ttl
+            clock.now += 5
+            results.append(await cache.get("key", upstream.fetch))
+            await _settle()
+            calls = upstream.calls
+
+            clock.now += 10
+            results.append(await cache.get("key", upstream.fetch))
+            await _settle()
+
+            # Past ttl + stale_ttl the last good value is no longer served
+            clock.now += 60
+            results.append(await cache.get("key", upstream.fetch))
+            return results, calls
+
+        results, calls = asyncio.run(run())
+        assert results == [["a"], ["a"], ["a"], None]
+        assert calls == 2
+        assert upstream.calls == 4
+
+    def test_failed_fetch_is_not_cached(self, clock, cache):
+        upstream = Upstream(RuntimeError("down"), None, ["a"])
+
+        async def run():
+            return [await cache.get("key", upstream.fetch) for _ in range(3)]
+
+        assert asyncio.run(run()) == [None, None, ["a"]]
+        assert upstream.calls == 3
+
+    def test_least_recently_used_entries_are_evicted(self, clock):
+        cache = UpstreamCache(ttl=10, stale_ttl=60, namespace="test", max_entries=2)
+        upstream = Upstream(["a"], ["b"], ["c"], ["a2"])
+
+        async def run():
+            await cache.get("a", upstream.fetch)
+            await cache.get("b", upstream.fetch)
+            await cache.get("a", upstream.fetch)
+            await cache.get("c", upstream.fetch)
+            return await cache.get("a", upstream.fetch), cache.peek("b")
+
+        assert asyncio.run(run()) == (["a"], None)
+        assert upstream.calls == 3
+
+    def test_invalidate(self, clock, cache):
+        upstream = Upstream(["a"], ["b"])
+        key = cache.get_key("http://upstream", "key")
+
+        async def run():
+            await cache.get(key, upstream.fetch)
+            await cache.invalidate("http://upstream")
+            return await cache.get(key, upstream.fetch)
+
+        assert asyncio.run(run()) == ["b"]
+
+    def test_values_are_copied(self, clock, cache):
+        upstream = Upstream({"models": ["a"]})
+
+        async def run():
+            value = await cache.get("key", upstream.fetch)
+            value["models"].append("b")
+            return await cache.get("key", upstream.fetch)
+
+        assert asyncio.run(run()) == {"models": ["a"]}
@@ -150,6 +150,10 @@ class AbstractPostgresTest(AbstractIntegrationTest):
             "chat",
             "chatidtag",
             "document",
+            '"group"',
+            "group_member",
+            "ingestion_job",
+            "ingestion_task",
             "memory",
             "model",
             "prompt",
@@ -157,5 +161,6 @@ class AbstractPostgresTest(AbstractIntegrationTest):
             '"user"',
         ]
         for table in tables:
-            Session.execute(text(f"TRUNCATE TABLE {table}"))
+            # CASCADE also empties tables referencing them, e.g. chat_search
+            Session.execute(text(f"TRUNCATE TABLE {table} CASCADE"))
         Session.commit()
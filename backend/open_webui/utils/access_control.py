@@ -53,14 +53,13 @@ def get_permissions(
                     )  # Use the most permissive value (True > False)
         return permissions
 
-    user_groups = Groups.get_groups_by_member_id(user_id)
+    user_groups = Groups.get_memberships_by_member_id(user_id)
 
     # Deep copy default permissions to avoid modifying the original dict
     permissions = json.loads(json.dumps(default_permissions))
 
     # Combine permissions from all user groups
-    for group in user_groups:
-        group_permissions = group.permissions or {}
+    for _, group_permissions in user_groups:
         permissions = combine_permissions(permissions, group_permissions)
 
     # Ensure all fields from default_permissions are present and filled in
@@ -93,10 +92,9 @@ def has_permission(
     permission_hierarchy = permission_key.split(".")
 
     # Retrieve user group permissions
-    user_groups = Groups.get_groups_by_member_id(user_id)
+    user_groups = Groups.get_memberships_by_member_id(user_id)
 
-    for group in user_groups:
-        group_permissions = group.permissions
+    for _, group_permissions in user_groups:
         if get_permission(group_permissions, permission_hierarchy):
             return True
 
@@ -111,12 +109,13 @@ def has_access(
     user_id: str,
     type: str = "write",
     access_control: Optional[dict] = None,
+    user_group_ids: Optional[set[str]] = None,
 ) -> bool:
     if access_control is None:
         return type == "read"
 
-    user_groups = Groups.get_groups_by_member_id(user_id)
-    user_group_ids = [group.id for group in user_groups]
+    if user_group_ids is None:
+        user_group_ids = Groups.get_group_ids_by_member_id(user_id)
     permission_access = access_control.get(type, {})
     permitted_group_ids = permission_access.get("group_ids", [])
     permitted_user_ids = permission_access.get("user_ids", [])
@@ -126,6 +125,25 @@ def has_access(
     )
 
 
+def has_access_batch(
+    user_id: str,
+    type: str = "write",
+    access_controls: Optional[List[Optional[dict]]] = None,
+) -> List[bool]:
+    """
+    Check access to many resources at once, resolving the user's groups only
+    once. Returns one boolean per entry of `access_controls`.
+    """
+    if not access_controls:
+        return []
+
+    user_group_ids = Groups.get_group_ids_by_member_id(user_id)
+    return [
+        has_access(user_id, type, access_control, user_group_ids)
+        for access_control in access_controls
+    ]
+
+
 # Get all users with access to a resource
 def get_users_with_access(
     type: str = "write", access_control: Optional[dict] = None
@@ -137,11 +155,8 @@ def get_users_with_access(
     permitted_group_ids = permission_access.get("group_ids", [])
     permitted_user_ids = permission_access.get("user_ids", [])
 
-    user_ids_with_access = set(permitted_user_ids)
-
-    for group_id in permitted_group_ids:
-        group_user_ids = Groups.get_group_user_ids_by_id(group_id)
-        if group_user_ids:
-            user_ids_with_access.update(group_user_ids)
+    user_ids_with_access = set(permitted_user_ids) | Groups.get_user_ids_by_group_ids(
+        permitted_group_ids
+    )
 
     return Users.get_users_by_user_ids(list(user_ids_with_access))
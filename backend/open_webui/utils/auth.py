@@ -220,7 +220,7 @@ def get_current_user(
         )
 
     if data is not None and "id" in data:
-        user = Users.get_user_by_id(data["id"])
+        user = Users.get_cached_user_by_id(data["id"])
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -250,10 +250,9 @@ def get_current_user(
                 current_span.set_attribute("client.user.role", user.role)
                 current_span.set_attribute("client.auth.type", "jwt")
 
-            # Refresh the user's last active timestamp asynchronously
-            # to prevent blocking the request
-            if background_tasks:
-                background_tasks.add_task(Users.update_user_last_active_by_id, user.id)
+            # Refresh the user's last active timestamp, written in bulk
+            # in the background
+            Users.touch_user_last_active_by_id(user.id)
         return user
     else:
         raise HTTPException(
@@ -263,7 +262,7 @@ def get_current_user(
 
 
 def get_current_user_by_api_key(api_key: str):
-    user = Users.get_user_by_api_key(api_key)
+    user = Users.get_cached_user_by_api_key(api_key)
 
     if user is None:
         raise HTTPException(
@@ -279,7 +278,7 @@ def get_current_user_by_api_key(api_key: str):
             current_span.set_attribute("client.user.role", user.role)
             current_span.set_attribute("client.auth.type", "api_key")
 
-        Users.update_user_last_active_by_id(user.id)
+        Users.touch_user_last_active_by_id(user.id)
 
     return user
 
@@ -0,0 +1,77 @@
+import logging
+import time
+from typing import Callable, Union
+
+from open_webui.models.chats import Chats
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    REALTIME_CHAT_SAVE_INTERVAL,
+    REALTIME_CHAT_SAVE_BUFFER_SIZE,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+class ChatMessageBuffer:
+    """
+    Write-behind buffer for a single streamed chat message.
+
+    Updates are coalesced in memory and persisted at most once per `interval`
+    seconds, or as soon as `max_size` characters of new content have been
+    buffered. `flush()` must be called once the response is complete.
+
+    An update can be a dict of message fields or a callable returning one;
+    callables are only evaluated on flush so that expensive serialisation of
+    the message content is skipped for updates that never reach the database.
+    """
+
+    def __init__(
+        self,
+        chat_id: str,
+        message_id: str,
+        interval: float = REALTIME_CHAT_SAVE_INTERVAL,
+        max_size: int = REALTIME_CHAT_SAVE_BUFFER_SIZE,
+    ):
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.interval = interval
+        self.max_size = max_size
+
+        self._pending = {}
+        self._producer = None
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def update(self, message: Union[dict, Callable[[], dict]], size: int = 0):
+        if callable(message):
+            self._producer = message
+        else:
+            self._pending.update(message)
+
+        self._size += size
+        if (
+            self._size >= self.max_size
+            or time.monotonic() - self._last_flush >= self.interval
+        ):
+            self.flush()
+
+    def flush(self):
+        message = {**self._pending}
+        if self._producer is not None:
+            message.update(self._producer())
+
+        self._pending = {}
+        self._producer = None
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+        if not message:
+            return
+
+        if not Chats.update_message_by_id_and_message_id(
+            self.chat_id, self.message_id, message
+        ):
+            Chats.upsert_message_to_chat_by_id_and_message_id(
+                self.chat_id, self.message_id, message
+            )
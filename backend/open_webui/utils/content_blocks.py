@@ -0,0 +1,261 @@
+import html
+import json
+from typing import Optional
+
+
+def split_content_and_whitespace(content):
+    content_stripped = content.rstrip()
+    original_whitespace = (
+        content[len(content_stripped) :] if len(content) > len(content_stripped) else ""
+    )
+    return content_stripped, original_whitespace
+
+
+def is_opening_code_block(content):
+    backtick_segments = content.split("```")
+    # Even number of segments means the last backticks are opening a new block
+    return len(backtick_segments) > 1 and len(backtick_segments) % 2 == 0
+
+
+def get_utf16_length(content: str) -> int:
+    # Offsets in delta events are consumed by JavaScript, which indexes strings
+    # in UTF-16 code units rather than code points.
+    return len(content.encode("utf-16-le")) // 2
+
+
+def render_tool_calls_block(block: dict) -> str:
+    tool_calls = block.get("content", [])
+    results = block.get("results", [])
+
+    tool_calls_display_content = ""
+    for tool_call in tool_calls:
+        tool_call_id = tool_call.get("id", "")
+        tool_name = tool_call.get("function", {}).get("name", "")
+        tool_arguments = tool_call.get("function", {}).get("arguments", "")
+
+        tool_result = None
+        tool_result_files = None
+        for result in results or []:
+            if tool_call_id == result.get("tool_call_id", ""):
+                tool_result = result.get("content", None)
+                tool_result_files = result.get("files", None)
+                break
+
+        if tool_result:
+            tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="true" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}" result="{html.escape(json.dumps(tool_result))}" files="{html.escape(json.dumps(tool_result_files)) if tool_result_files else ""}">\n<summary>Tool Executed</summary>\n</details>\n'
+        else:
+            tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>'
+
+    return f"\n{tool_calls_display_content}\n\n"
+
+
+def render_code_interpreter_block(block: dict, raw: bool) -> str:
+    attributes = block.get("attributes", {})
+    output = block.get("output", None)
+    lang = attributes.get("lang", "")
+
+    if output:
+        output = html.escape(json.dumps(output))
+
+        if raw:
+            return f'\n<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n```output\n{output}\n```\n'
+        else:
+            return f'\n<details type="code_interpreter" done="true" output="{output}">\n<summary>Analyzed</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
+    else:
+        if raw:
+            return f'\n<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n'
+        else:
+            return f'\n<details type="code_interpreter" done="false">\n<summary>Analyzing...</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
+
+
+def render_reasoning_lines(content: str) -> str:
+    return "\n".join(
+        (f"> {line}" if not line.startswith(">") else line)
+        for line in content.splitlines()
+    )
+
+
+class ContentBlockSerializer:
+    """
+    Serialises the content blocks of a streamed response into message content.
+
+    The rendering of every block is cached, keyed by the block object and a
+    cheap fingerprint of the fields its rendering depends on, so each call
+    only re-renders the blocks that changed (normally just the last one).
+    Reasoning blocks are additionally rendered incrementally: only the lines
+    after the last complete line seen so far are quoted again.
+    """
+
+    def __init__(self):
+        self._blocks = {}
+        self._reasoning = {}
+
+    def _get_fingerprint(self, block: dict, raw: bool):
+        block_type = block["type"]
+        if block_type == "text":
+            return block["content"]
+        elif block_type == "reasoning":
+            return (raw, block["content"], block.get("duration", None))
+        elif block_type == "tool_calls":
+            if raw:
+                return True
+            results = block.get("results", None)
+            return (
+                id(block.get("content")),
+                len(block.get("content") or []),
+                id(results),
+                len(results or []),
+            )
+        elif block_type == "code_interpreter":
+            return (
+                raw,
+                block["content"],
+                id(block.get("output", None)),
+                block.get("attributes", {}).get("lang", ""),
+            )
+        else:
+            return str(block["content"])
+
+    def _render_reasoning_display(self, block: dict) -> str:
+        content = block["content"]
+
+        stable_content, stable_display = "", ""
+        cached = self._reasoning.get(id(block))
+        if cached and cached[0] is block and content.startswith(cached[1]):
+            stable_content, stable_display = cached[1], cached[2]
+        # Everything up to (and including) the last newline is complete and
+        # can be reused as is on the next call.
+        newline_idx = content.rfind("\n")
+        if newline_idx + 1 > len(stable_content):
+            addition = render_reasoning_lines(
+                content[len(stable_content) : newline_idx + 1]
+            )
+            stable_display = (
+                f"{stable_display}\n{addition}" if stable_content else addition
+            )
+            stable_content = content[: newline_idx + 1]
+            self._reasoning[id(block)] = (block, stable_content, stable_display)
+
+        tail_content = content[len(stable_content) :]
+        if not tail_content:
+            return stable_display
+
+        tail = render_reasoning_lines(tail_content)
+        return f"{stable_display}\n{tail}" if stable_content else tail
+
+    def _render(self, block: dict, raw: bool) -> str:
+        block_type = block["type"]
+        if block_type == "text":
+            return f"{block['content'].strip()}\n"
+        elif block_type == "tool_calls":
+            return "" if raw else render_tool_calls_block(block)
+        elif block_type == "reasoning":
+            if raw:
+                return (
+                    f'\n<{block["start_tag"]}>{block["content"]}<{block["end_tag"]}>\n'
+                )
+
+            reasoning_display_content = self._render_reasoning_display(block)
+            reasoning_duration = block.get("duration", None)
+            if reasoning_duration is not None:
+                return f'\n<details type="reasoning" done="true" duration="{reasoning_duration}">\n<summary>Thought for {reasoning_duration} seconds</summary>\n{reasoning_display_content}\n</details>\n'
+            else:
+                return f'\n<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{reasoning_display_content}\n</details>\n'
+        elif block_type == "code_interpreter":
+            return render_code_interpreter_block(block, raw)
+        else:
+            block_content = str(block["content"]).strip()
+            return f"{block_type}: {block_content}\n"
+
+    def render_block(self, block: dict, raw: bool = False) -> str:
+        key = (id(block), raw)
+        fingerprint = self._get_fingerprint(block, raw)
+
+        cached = self._blocks.get(key)
+        # Holding a reference to the block keeps its id from being reused
+        if cached and cached[0] is block and cached[1] == fingerprint:
+            return cached[2]
+
+        rendered = self._render(block, raw)
+        self._blocks[key] = (block, fingerprint, rendered)
+        return rendered
+
+    def serialize(self, content_blocks: list[dict], raw: bool = False) -> str:
+        content = ""
+
+        for block in content_blocks:
+            if block["type"] == "code_interpreter":
+                content_stripped, original_whitespace = split_content_and_whitespace(
+                    content
+                )
+                if is_opening_code_block(content_stripped):
+                    # Remove trailing backticks that would open a new block
+                    content = (
+                        content_stripped.rstrip("`").rstrip() + original_whitespace
+                    )
+                else:
+                    # Keep content as is - either closing backticks or no backticks
+                    content = content_stripped + original_whitespace
+
+            content = f"{content}{self.render_block(block, raw)}"
+
+        return content.strip()
+
+
+class ContentDeltaEncoder:
+    """
+    Encodes successive message contents as `chat:completion` event data.
+
+    In delta mode only the changed tail of the content is sent as
+    `{"delta": ..., "offset": ...}`, meaning "keep the first `offset` UTF-16
+    code units of the current content and append `delta`". A full
+    `{"content": ...}` snapshot is sent for the first update and then every
+    `snapshot_interval` events so that clients can resynchronise.
+    """
+
+    def __init__(self, enabled: bool = False, snapshot_interval: int = 50):
+        self.enabled = enabled
+        self.snapshot_interval = snapshot_interval
+
+        self._content: Optional[str] = None
+        self._length = 0
+        self._count = 0
+
+    @staticmethod
+    def _get_common_prefix_length(a: str, b: str) -> int:
+        n = min(len(a), len(b))
+        if a[:n] == b[:n]:
+            return n
+
+        # Invariant: a[:lo] == b[:lo] and a[:hi] != b[:hi]
+        lo, hi = 0, n
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if a[lo:mid] == b[lo:mid]:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def snapshot(self, content: str) -> dict:
+        self._content = content
+        self._length = get_utf16_length(content) if self.enabled else 0
+        self._count = 0
+        return {"content": content}
+
+    def encode(self, content: str) -> dict:
+        if (
+            not self.enabled
+            or self._content is None
+            or self._count >= self.snapshot_interval
+        ):
+            return self.snapshot(content)
+
+        prefix_length = self._get_common_prefix_length(self._content, content)
+        offset = self._length - get_utf16_length(self._content[prefix_length:])
+        delta = content[prefix_length:]
+
+        self._content = content
+        self._length = offset + get_utf16_length(delta)
+        self._count += 1
+        return {"delta": delta, "offset": offset}
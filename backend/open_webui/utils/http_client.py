@@ -0,0 +1,87 @@
+import logging
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    AIOHTTP_CLIENT_DNS_CACHE_TTL,
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+def get_base_url(url: str) -> str:
+    parsed_url = urlparse(url)
+    return f"{parsed_url.scheme}://{parsed_url.netloc}".lower()
+
+
+class HTTPClientRegistry:
+    """
+    App-lifetime pooled aiohttp sessions, one per upstream base URL.
+
+    Every session keeps connections alive between requests, caches DNS
+    lookups and bounds the number of concurrent connections to its upstream.
+    Timeouts and SSL settings are passed per request, so one session serves
+    all call sites talking to the same upstream. Callers must release
+    responses (`response.release()`) instead of closing the session.
+    """
+
+    def __init__(self):
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        base_url = get_base_url(url)
+        session = self._sessions.get(base_url)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=0,
+                    limit_per_host=AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+                    ttl_dns_cache=AIOHTTP_CLIENT_DNS_CACHE_TTL or None,
+                    use_dns_cache=AIOHTTP_CLIENT_DNS_CACHE_TTL > 0,
+                    keepalive_timeout=AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+                ),
+                trust_env=True,
+            )
+            self._sessions[base_url] = session
+        return session
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+
+        for session in sessions:
+            try:
+                await session.close()
+            except Exception as e:
+                log.warning(f"Failed to close HTTP client session: {e}")
+
+
+HTTP_CLIENTS: Optional[HTTPClientRegistry] = None
+
+
+def get_http_session(url: str) -> aiohttp.ClientSession:
+    """Return the pooled session for the upstream serving `url`."""
+    global HTTP_CLIENTS
+    if HTTP_CLIENTS is None:
+        # Outside of the app lifespan (e.g. scripts), create the registry on demand
+        HTTP_CLIENTS = HTTPClientRegistry()
+    return HTTP_CLIENTS.get_session(url)
+
+
+def start_http_clients() -> HTTPClientRegistry:
+    global HTTP_CLIENTS
+    HTTP_CLIENTS = HTTPClientRegistry()
+    return HTTP_CLIENTS
+
+
+async def stop_http_clients():
+    global HTTP_CLIENTS
+    if HTTP_CLIENTS is not None:
+        await HTTP_CLIENTS.close()
+        HTTP_CLIENTS = None
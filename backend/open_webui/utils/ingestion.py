@@ -0,0 +1,304 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Optional
+
+from fastapi import Request
+
+from open_webui.models.files import Files, FileModel
+from open_webui.models.ingestion import (
+    Ingestions,
+    IngestionJobModel,
+    IngestionTaskModel,
+)
+from open_webui.models.knowledge import Knowledges
+from open_webui.models.users import Users, UserModel
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.routers.retrieval import (
+    get_embedding_metadata,
+    process_file,
+    ProcessFileForm,
+)
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    INGESTION_WORKERS,
+    INGESTION_TASK_TIMEOUT,
+    INGESTION_TASK_MAX_ATTEMPTS,
+    INGESTION_POLL_INTERVAL,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class IngestionQueue:
+    """
+    Background queue that processes files into knowledge collections.
+
+    Jobs and their per-file tasks are persisted in the database, so a job
+    survives restarts and can be followed through the progress endpoints and
+    `ingestion-events` socket messages. Files are processed by a pool of
+    `workers` threads; embedding requests are batched and sent concurrently
+    by the embedding client. A file whose chunks in the collection already
+    carry its current hash and embedding config is skipped.
+
+    Tasks are claimed with a conditional update, so several app workers can
+    share the queue. Tasks being processed get a heartbeat every third of
+    `task_timeout`. A task without a heartbeat for `task_timeout` seconds,
+    i.e. of a worker that died, is claimed again, up to `max_attempts` times
+    in total.
+    """
+
+    EMIT_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        workers: int,
+        task_timeout: float,
+        max_attempts: int,
+        poll_interval: float,
+    ):
+        self.workers = workers
+        self.task_timeout = task_timeout
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = task_timeout / 3
+
+        self._app = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        # Serialises the first inserts into a collection that doesn't exist yet
+        self._collection_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def start(self, app):
+        self._app = app
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="ingestion"
+        )
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._executor is not None:
+            # Files being processed are claimed again after a restart
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def notify(self):
+        """Start processing newly created jobs without waiting for the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                for job in await asyncio.to_thread(Ingestions.get_unfinished_jobs):
+                    await self._run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.exception(f"Ingestion queue error: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _run_job(self, job: IngestionJobModel):
+        user = await asyncio.to_thread(Users.get_user_by_id, job.user_id)
+        if user is None:
+            log.warning(f"Cancelling ingestion job {job.id} of deleted user")
+            await asyncio.to_thread(Ingestions.cancel_job_by_id, job.id)
+            return
+
+        if job.status == "pending":
+            job = await asyncio.to_thread(
+                Ingestions.update_job_status_by_id, job.id, "running"
+            )
+
+        # process_file only reads the app state from the request
+        request = Request({"type": "http", "app": self._app, "headers": []})
+        loop = asyncio.get_running_loop()
+
+        in_flight = {}  # future -> task id
+        emitted_at = 0.0
+        heartbeat_at = time.monotonic()
+        while True:
+            if len(in_flight) < self.workers:
+                tasks = await asyncio.to_thread(
+                    Ingestions.claim_tasks_by_job_id,
+                    job.id,
+                    self.workers - len(in_flight),
+                    int(time.time() - self.task_timeout),
+                    self.max_attempts,
+                )
+                for task in tasks:
+                    future = loop.run_in_executor(
+                        self._executor, self._process_task, request, task, user
+                    )
+                    in_flight[future] = task.id
+
+            if not in_flight:
+                break
+
+            done, _ = await asyncio.wait(
+                in_flight,
+                timeout=self.heartbeat_interval,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for future in done:
+                del in_flight[future]
+
+            if in_flight and time.monotonic() - heartbeat_at >= self.heartbeat_interval:
+                heartbeat_at = time.monotonic()
+                await asyncio.to_thread(
+                    Ingestions.touch_tasks_by_ids, list(in_flight.values())
+                )
+
+            if time.monotonic() - emitted_at >= self.EMIT_INTERVAL:
+                emitted_at = time.monotonic()
+                await self._emit(job)
+
+        progress = await asyncio.to_thread(Ingestions.get_job_progress, job.id)
+        if progress.get("pending") or progress.get("processing"):
+            # Other workers are still processing files of this job
+            return
+
+        job = await asyncio.to_thread(Ingestions.get_job_by_id, job.id)
+        if job.status == "running":
+            if job.type == "add":
+                await asyncio.to_thread(self._add_files_to_knowledge, job)
+            job = await asyncio.to_thread(
+                Ingestions.update_job_status_by_id, job.id, "completed"
+            )
+            log.info(f"Ingestion job {job.id} completed: {progress}")
+
+        await self._emit(job)
+
+    def _process_task(
+        self, request: Request, task: IngestionTaskModel, user: UserModel
+    ) -> str:
+        try:
+            status = self._ingest_file(request, task, user)
+            Ingestions.update_task_status_by_id(task.id, status)
+        except Exception as e:
+            error = str(getattr(e, "detail", None) or e) or type(e).__name__
+            log.error(
+                f"Error ingesting file {task.file_id} into {task.collection_name}: {error}"
+            )
+            status = "failed"
+            Ingestions.update_task_status_by_id(task.id, status, error)
+        return status
+
+    def _ingest_file(
+        self, request: Request, task: IngestionTaskModel, user: UserModel
+    ) -> str:
+        file = Files.get_file_by_id(task.file_id)
+        if file is None:
+            raise ValueError(ERROR_MESSAGES.NOT_FOUND)
+
+        collection_name = task.collection_name
+        has_collection = VECTOR_DB_CLIENT.has_collection(
+            collection_name=collection_name
+        )
+
+        if has_collection:
+            if self._is_indexed(request, collection_name, file):
+                return "skipped"
+
+            # Drop the chunks of an older version of the file
+            try:
+                VECTOR_DB_CLIENT.delete(
+                    collection_name=collection_name, filter={"file_id": file.id}
+                )
+                BM25_INDEX.delete(
+                    collection_name=collection_name, filter={"file_id": file.id}
+                )
+            except Exception as e:
+                log.debug(f"Error deleting chunks of file {file.id}: {e}")
+
+        with nullcontext() if has_collection else self._get_lock(collection_name):
+            process_file(
+                request,
+                ProcessFileForm(file_id=file.id, collection_name=collection_name),
+                user=user,
+            )
+        return "completed"
+
+    @staticmethod
+    def _is_indexed(request: Request, collection_name: str, file: FileModel) -> bool:
+        """Whether the collection holds chunks of this version of the file."""
+        if not file.hash:
+            return False
+
+        result = VECTOR_DB_CLIENT.query(
+            collection_name=collection_name, filter={"file_id": file.id}, limit=1
+        )
+        if not result or not result.ids or not result.ids[0]:
+            return False
+
+        metadata = (result.metadatas[0][0] if result.metadatas else None) or {}
+        embedding_config = get_embedding_metadata(request)
+        return (
+            metadata.get("hash") == file.hash
+            and metadata.get("embedding_config") == embedding_config
+        )
+
+    def _get_lock(self, collection_name: str) -> threading.Lock:
+        with self._lock:
+            if collection_name not in self._collection_locks:
+                self._collection_locks[collection_name] = threading.Lock()
+            return self._collection_locks[collection_name]
+
+    @staticmethod
+    def _add_files_to_knowledge(job: IngestionJobModel):
+        knowledge_id = (job.meta or {}).get("knowledge_id")
+        knowledge = Knowledges.get_knowledge_by_id(id=knowledge_id)
+        if knowledge is None:
+            return
+
+        file_ids = Ingestions.get_file_ids_by_job_id_and_statuses(
+            job.id, ["completed", "skipped"]
+        )
+
+        data = knowledge.data or {}
+        data["file_ids"] = list(dict.fromkeys(data.get("file_ids", []) + file_ids))
+        Knowledges.update_knowledge_data_by_id(id=knowledge.id, data=data)
+
+    async def _emit(self, job: IngestionJobModel):
+        try:
+            from open_webui.socket.main import sio, USER_POOL
+
+            response = await asyncio.to_thread(
+                Ingestions.get_job_response_by_id, job.id
+            )
+            data = response.model_dump(exclude={"errors"})
+            await asyncio.gather(
+                *[
+                    sio.emit("ingestion-events", data, to=session_id)
+                    for session_id in await USER_POOL.get(job.user_id, [])
+                ]
+            )
+        except Exception as e:
+            log.debug(f"Failed to emit progress of ingestion job {job.id}: {e}")
+
+
+INGESTION_QUEUE = IngestionQueue(
+    workers=INGESTION_WORKERS,
+    task_timeout=INGESTION_TASK_TIMEOUT,
+    max_attempts=INGESTION_TASK_MAX_ATTEMPTS,
+    poll_interval=INGESTION_POLL_INTERVAL,
+)
@@ -0,0 +1,235 @@
+import logging
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class NodeState:
+    def __init__(self, url: str):
+        self.url = url
+        self.in_flight = 0
+        self.latency = None  # EWMA of the time to the first response byte
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.probing = False  # A probe request after the cooldown is running
+        self.loaded_models: set[str] = set()
+        self.loaded_models_at = 0.0
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "url": self.url,
+            "in_flight": self.in_flight,
+            "latency": self.latency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "consecutive_failures": self.consecutive_failures,
+            "ejected": self.is_ejected(now),
+            "ejected_for": max(0.0, self.ejected_until - now),
+            "probing": self.probing,
+            "loaded_models": sorted(self.loaded_models),
+        }
+
+
+def _least_outstanding(nodes: list[NodeState], model: Optional[str]) -> NodeState:
+    return min(
+        nodes,
+        key=lambda node: (
+            node.in_flight,
+            node.latency if node.latency is not None else 0.0,
+            random.random(),
+        ),
+    )
+
+
+def _ewma(nodes: list[NodeState], model: Optional[str]) -> NodeState:
+    # Nodes without a measurement yet are tried first
+    return min(
+        nodes,
+        key=lambda node: (
+            (node.in_flight + 1) * (node.latency or 0.0),
+            node.in_flight,
+            random.random(),
+        ),
+    )
+
+
+def _affinity(nodes: list[NodeState], model: Optional[str]) -> NodeState:
+    # Prefer nodes that already hold the model in memory to avoid a cold load
+    loaded = [node for node in nodes if model and model in node.loaded_models]
+    return _least_outstanding(loaded or nodes, model)
+
+
+def _random(nodes: list[NodeState], model: Optional[str]) -> NodeState:
+    return random.choice(nodes)
+
+
+STRATEGIES: dict[str, Callable[[list[NodeState], Optional[str]], NodeState]] = {
+    "least_outstanding": _least_outstanding,
+    "ewma": _ewma,
+    "affinity": _affinity,
+    "random": _random,
+}
+
+
+class NodeRequest:
+    """Tracks a single request sent to a node; `finish` may be called repeatedly."""
+
+    def __init__(self, balancer: "LoadBalancer", node: NodeState, probe: bool = False):
+        self.balancer = balancer
+        self.node = node
+        self.probe = probe
+        self.started_at = time.monotonic()
+        self.responded = False
+        self.finished = False
+
+    def respond(self):
+        """Record the latency once the response headers arrived."""
+        if not self.responded:
+            self.responded = True
+            self.balancer._record_latency(self.node, time.monotonic() - self.started_at)
+
+    def finish(self, success: bool = True):
+        if not self.finished:
+            self.finished = True
+            if success:
+                self.respond()
+            self.balancer._finish(self.node, success, self.probe)
+
+
+class LoadBalancer:
+    """
+    Picks one of several upstream nodes serving the same model.
+
+    Nodes are identified by their base URL. Every request is tracked from
+    `start` to `NodeRequest.finish`, which gives the number of in-flight
+    requests and an EWMA of the response latency per node. A node failing
+    `failure_threshold` times in a row is ejected for `cooldown` seconds
+    (circuit breaker). After the cooldown the node is half-open: a single
+    probe request is let through at a time, a success closes the circuit
+    again and a failure ejects the node immediately. The loaded models
+    reported by a node are used by the "affinity" strategy.
+
+    State is kept per process.
+    """
+
+    def __init__(
+        self,
+        strategy: str = "least_outstanding",
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        alpha: float = 0.3,
+    ):
+        if strategy not in STRATEGIES:
+            log.warning(f"Unknown load balancer strategy {strategy}, using random")
+            strategy = "random"
+
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.alpha = alpha
+
+        self._nodes: dict[str, NodeState] = {}
+        self._lock = threading.Lock()
+
+    def _get_node(self, url: str) -> NodeState:
+        if url not in self._nodes:
+            self._nodes[url] = NodeState(url)
+        return self._nodes[url]
+
+    def _is_half_open(self, node: NodeState, now: float) -> bool:
+        return (
+            node.consecutive_failures >= self.failure_threshold
+            and not node.is_ejected(now)
+        )
+
+    def _is_available(self, node: NodeState, now: float) -> bool:
+        if node.is_ejected(now):
+            return False
+        # Only one probe request at a time is sent to a recovering node
+        return not (node.probing and self._is_half_open(node, now))
+
+    def select(self, urls: list[str], model: Optional[str] = None) -> str:
+        if len(urls) == 1:
+            return urls[0]
+
+        now = time.monotonic()
+        with self._lock:
+            nodes = [self._get_node(url) for url in dict.fromkeys(urls)]
+            available = [node for node in nodes if self._is_available(node, now)]
+            if not available:
+                # Every node is ejected, try the one that recovers first
+                return min(nodes, key=lambda node: node.ejected_until).url
+
+            return STRATEGIES[self.strategy](available, model).url
+
+    def start(self, url: str) -> NodeRequest:
+        with self._lock:
+            node = self._get_node(url)
+            node.in_flight += 1
+            node.requests += 1
+            probe = not node.probing and self._is_half_open(node, time.monotonic())
+            if probe:
+                node.probing = True
+        return NodeRequest(self, node, probe)
+
+    def _record_latency(self, node: NodeState, latency: float):
+        with self._lock:
+            if node.latency is None:
+                node.latency = latency
+            else:
+                node.latency = self.alpha * latency + (1 - self.alpha) * node.latency
+
+    def _finish(self, node: NodeState, success: bool, probe: bool = False):
+        with self._lock:
+            node.in_flight = max(0, node.in_flight - 1)
+            if probe:
+                node.probing = False
+            if success:
+                node.consecutive_failures = 0
+                node.ejected_until = 0.0
+                return
+
+            node.errors += 1
+            node.consecutive_failures += 1
+            if node.consecutive_failures >= self.failure_threshold:
+                node.ejected_until = time.monotonic() + self.cooldown
+                log.warning(
+                    f"Ejecting {node.url} for {self.cooldown}s after "
+                    f"{node.consecutive_failures} consecutive failures"
+                )
+
+    def update_loaded_models(self, url: str, models: list[str]):
+        with self._lock:
+            node = self._get_node(url)
+            node.loaded_models = set(models)
+            node.loaded_models_at = time.monotonic()
+
+    def loaded_models_age(self, urls: list[str]) -> float:
+        """Seconds since the loaded models of the least recently updated node were refreshed."""
+        now = time.monotonic()
+        with self._lock:
+            return max(
+                (now - self._get_node(url).loaded_models_at for url in urls),
+                default=0.0,
+            )
+
+    def get_state(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "strategy": self.strategy,
+                "failure_threshold": self.failure_threshold,
+                "cooldown": self.cooldown,
+                "nodes": [node.to_dict(now) for node in self._nodes.values()],
+            }
@@ -9,7 +9,6 @@ from aiocache import cached
 from typing import Any, Optional
 import random
 import json
-import html
 import inspect
 import re
 import ast
@@ -25,6 +24,8 @@ from starlette.responses import Response, StreamingResponse
 
 from open_webui.models.chats import Chats
 from open_webui.models.users import Users
+from open_webui.utils.chat_buffer import ChatMessageBuffer
+from open_webui.utils.content_blocks import ContentBlockSerializer, ContentDeltaEncoder
 from open_webui.socket.main import (
     get_event_call,
     get_event_emitter,
@@ -51,6 +52,7 @@ from open_webui.routers.pipelines import (
 from open_webui.routers.memories import query_memory, QueryMemoryForm
 
 from open_webui.utils.webhook import post_webhook
+from open_webui.utils.response import StreamChunk, loads
 
 
 from open_webui.models.users import UserModel
@@ -96,6 +98,8 @@ from open_webui.env import (
     GLOBAL_LOG_LEVEL,
     BYPASS_MODEL_ACCESS_CONTROL,
     ENABLE_REALTIME_CHAT_SAVE,
+    ENABLE_CHAT_COMPLETION_DELTA_EVENTS,
+    CHAT_COMPLETION_SNAPSHOT_INTERVAL,
 )
 from open_webui.constants import TASKS
 
@@ -1867,7 +1871,7 @@ async def process_chat_response(
                     )
 
                     # Send a webhook notification if the user is not active
-                    if not get_active_status_by_user_id(user.id):
+                    if not await get_active_status_by_user_id(user.id):
                         webhook_url = Users.get_user_webhook_url_by_id(user.id)
                         if webhook_url:
                             post_webhook(
@@ -1949,134 +1953,21 @@ async def process_chat_response(
             },
         )
 
-        def split_content_and_whitespace(content):
-            content_stripped = content.rstrip()
-            original_whitespace = (
-                content[len(content_stripped) :]
-                if len(content) > len(content_stripped)
-                else ""
-            )
-            return content_stripped, original_whitespace
-
-        def is_opening_code_block(content):
-            backtick_segments = content.split("```")
-            # Even number of segments means the last backticks are opening a new block
-            return len(backtick_segments) > 1 and len(backtick_segments) % 2 == 0
-
         # Handle as a background task
         async def post_response_handler(response, events):
-            def serialize_content_blocks(content_blocks, raw=False):
-                content = ""
-
-                for block in content_blocks:
-                    if block["type"] == "text":
-                        content = f"{content}{block['content'].strip()}\n"
-                    elif block["type"] == "tool_calls":
-                        attributes = block.get("attributes", {})
-
-                        tool_calls = block.get("content", [])
-                        results = block.get("results", [])
-
-                        if results:
-
-                            tool_calls_display_content = ""
-                            for tool_call in tool_calls:
-
-                                tool_call_id = tool_call.get("id", "")
-                                tool_name = tool_call.get("function", {}).get(
-                                    "name", ""
-                                )
-                                tool_arguments = tool_call.get("function", {}).get(
-                                    "arguments", ""
-                                )
-
-                                tool_result = None
-                                tool_result_files = None
-                                for result in results:
-                                    if tool_call_id == result.get("tool_call_id", ""):
-                                        tool_result = result.get("content", None)
-                                        tool_result_files = result.get("files", None)
-                                        break
-
-                                if tool_result:
-                                    tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="true" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}" result="{html.escape(json.dumps(tool_result))}" files="{html.escape(json.dumps(tool_result_files)) if tool_result_files else ""}">\n<summary>Tool Executed</summary>\n</details>\n'
-                                else:
-                                    tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>'
-
-                            if not raw:
-                                content = f"{content}\n{tool_calls_display_content}\n\n"
-                        else:
-                            tool_calls_display_content = ""
-
-                            for tool_call in tool_calls:
-                                tool_call_id = tool_call.get("id", "")
-                                tool_name = tool_call.get("function", {}).get(
-                                    "name", ""
-                                )
-                                tool_arguments = tool_call.get("function", {}).get(
-                                    "arguments", ""
-                                )
-
-                                tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>'
-
-                            if not raw:
-                                content = f"{content}\n{tool_calls_display_content}\n\n"
-
-                    elif block["type"] == "reasoning":
-                        reasoning_display_content = "\n".join(
-                            (f"> {line}" if not line.startswith(">") else line)
-                            for line in block["content"].splitlines()
-                        )
-
-                        reasoning_duration = block.get("duration", None)
-
-                        if reasoning_duration is not None:
-                            if raw:
-                                content = f'{content}\n<{block["start_tag"]}>{block["content"]}<{block["end_tag"]}>\n'
-                            else:
-                                content = f'{content}\n<details type="reasoning" done="true" duration="{reasoning_duration}">\n<summary>Thought for {reasoning_duration} seconds</summary>\n{reasoning_display_content}\n</details>\n'
-                        else:
-                            if raw:
-                                content = f'{content}\n<{block["start_tag"]}>{block["content"]}<{block["end_tag"]}>\n'
-                            else:
-                                content = f'{content}\n<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{reasoning_display_content}\n</details>\n'
-
-                    elif block["type"] == "code_interpreter":
-                        attributes = block.get("attributes", {})
-                        output = block.get("output", None)
-                        lang = attributes.get("lang", "")
-
-                        content_stripped, original_whitespace = (
-                            split_content_and_whitespace(content)
-                        )
-                        if is_opening_code_block(content_stripped):
-                            # Remove trailing backticks that would open a new block
-                            content = (
-                                content_stripped.rstrip("`").rstrip()
-                                + original_whitespace
-                            )
-                        else:
-                            # Keep content as is - either closing backticks or no backticks
-                            content = content_stripped + original_whitespace
-
-                        if output:
-                            output = html.escape(json.dumps(output))
-
-                            if raw:
-                                content = f'{content}\n<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n```output\n{output}\n```\n'
-                            else:
-                                content = f'{content}\n<details type="code_interpreter" done="true" output="{output}">\n<summary>Analyzed</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
-                        else:
-                            if raw:
-                                content = f'{content}\n<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n'
-                            else:
-                                content = f'{content}\n<details type="code_interpreter" done="false">\n<summary>Analyzing...</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
-
-                    else:
-                        block_content = str(block["content"]).strip()
-                        content = f"{content}{block['type']}: {block_content}\n"
+            serializer = ContentBlockSerializer()
+            # With realtime chat save the client appends raw chunks itself, so
+            # its content cannot be tracked for delta encoding.
+            content_encoder = ContentDeltaEncoder(
+                enabled=(
+                    ENABLE_CHAT_COMPLETION_DELTA_EVENTS
+                    and not ENABLE_REALTIME_CHAT_SAVE
+                ),
+                snapshot_interval=CHAT_COMPLETION_SNAPSHOT_INTERVAL,
+            )
 
-                return content.strip()
+            def serialize_content_blocks(content_blocks, raw=False):
+                return serializer.serialize(content_blocks, raw=raw)
 
             def convert_content_blocks_to_messages(content_blocks):
                 messages = []
@@ -2273,6 +2164,9 @@ async def process_chat_response(
             )
 
             tool_calls = []
+            message_buffer = ChatMessageBuffer(
+                metadata["chat_id"], metadata["message_id"]
+            )
 
             last_assistant_message = None
             try:
@@ -2342,22 +2236,30 @@ async def process_chat_response(
                     response_tool_calls = []
 
                     async for line in response.body_iterator:
-                        line = line.decode("utf-8") if isinstance(line, bytes) else line
-                        data = line
+                        if isinstance(line, StreamChunk):
+                            # Already parsed upstream, e.g. converted Ollama chunks
+                            data = line.data
+                            line = ""
+                        else:
+                            line = (
+                                line.decode("utf-8") if isinstance(line, bytes) else line
+                            )
+                            data = line
 
-                        # Skip empty lines
-                        if not data.strip():
-                            continue
+                            # Skip empty lines
+                            if not data.strip():
+                                continue
 
-                        # "data:" is the prefix for each event
-                        if not data.startswith("data:"):
-                            continue
+                            # "data:" is the prefix for each event
+                            if not data.startswith("data:"):
+                                continue
 
-                        # Remove the prefix
-                        data = data[len("data:") :].strip()
+                            # Remove the prefix
+                            data = data[len("data:") :].strip()
 
                         try:
-                            data = json.loads(data)
+                            if isinstance(data, str):
+                                data = loads(data)
 
                             data, _ = await process_filter_functions(
                                 request=request,
@@ -2494,11 +2396,9 @@ async def process_chat_response(
 
                                         reasoning_block["content"] += reasoning_content
 
-                                        data = {
-                                            "content": serialize_content_blocks(
-                                                content_blocks
-                                            )
-                                        }
+                                        data = content_encoder.encode(
+                                            serialize_content_blocks(content_blocks)
+                                        )
 
                                     if value:
                                         if (
@@ -2571,22 +2471,21 @@ async def process_chat_response(
                                             )
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
-                                            # Save message in the database
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
-                                                metadata["chat_id"],
-                                                metadata["message_id"],
-                                                {
+                                            # Save message in the database (coalesced)
+                                            message_buffer.update(
+                                                lambda: {
                                                     "content": serialize_content_blocks(
                                                         content_blocks
                                                     ),
                                                 },
+                                                size=len(value),
                                             )
                                         else:
-                                            data = {
-                                                "content": serialize_content_blocks(
+                                            data = content_encoder.encode(
+                                                serialize_content_blocks(
                                                     content_blocks
-                                                ),
-                                            }
+                                                )
+                                            )
 
                                 await event_emitter(
                                     {
@@ -2646,9 +2545,9 @@ async def process_chat_response(
                     await event_emitter(
                         {
                             "type": "chat:completion",
-                            "data": {
-                                "content": serialize_content_blocks(content_blocks),
-                            },
+                            "data": content_encoder.encode(
+                                serialize_content_blocks(content_blocks)
+                            ),
                         }
                     )
 
@@ -2768,9 +2667,9 @@ async def process_chat_response(
                     await event_emitter(
                         {
                             "type": "chat:completion",
-                            "data": {
-                                "content": serialize_content_blocks(content_blocks),
-                            },
+                            "data": content_encoder.encode(
+                                serialize_content_blocks(content_blocks)
+                            ),
                         }
                     )
 
@@ -2808,9 +2707,9 @@ async def process_chat_response(
                         await event_emitter(
                             {
                                 "type": "chat:completion",
-                                "data": {
-                                    "content": serialize_content_blocks(content_blocks),
-                                },
+                                "data": content_encoder.encode(
+                                    serialize_content_blocks(content_blocks)
+                                ),
                             }
                         )
 
@@ -2930,9 +2829,9 @@ async def process_chat_response(
                         await event_emitter(
                             {
                                 "type": "chat:completion",
-                                "data": {
-                                    "content": serialize_content_blocks(content_blocks),
-                                },
+                                "data": content_encoder.encode(
+                                    serialize_content_blocks(content_blocks)
+                                ),
                             }
                         )
 
@@ -2966,22 +2865,18 @@ async def process_chat_response(
                 title = Chats.get_chat_title_by_id(metadata["chat_id"])
                 data = {
                     "done": True,
-                    "content": serialize_content_blocks(content_blocks),
+                    **content_encoder.snapshot(serialize_content_blocks(content_blocks)),
                     "title": title,
                 }
 
-                if not ENABLE_REALTIME_CHAT_SAVE:
-                    # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        metadata["chat_id"],
-                        metadata["message_id"],
-                        {
-                            "content": serialize_content_blocks(content_blocks),
-                        },
-                    )
+                # Save message in the database
+                message_buffer.update(
+                    {"content": serialize_content_blocks(content_blocks)}
+                )
+                message_buffer.flush()
 
                 # Send a webhook notification if the user is not active
-                if not get_active_status_by_user_id(user.id):
+                if not await get_active_status_by_user_id(user.id):
                     webhook_url = Users.get_user_webhook_url_by_id(user.id)
                     if webhook_url:
                         post_webhook(
@@ -3008,15 +2903,11 @@ async def process_chat_response(
                 log.warning("Task was cancelled!")
                 await event_emitter({"type": "task-cancelled"})
 
-                if not ENABLE_REALTIME_CHAT_SAVE:
-                    # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        metadata["chat_id"],
-                        metadata["message_id"],
-                        {
-                            "content": serialize_content_blocks(content_blocks),
-                        },
-                    )
+                # Save message in the database
+                message_buffer.update(
+                    {"content": serialize_content_blocks(content_blocks)}
+                )
+                message_buffer.flush()
 
             if response.background is not None:
                 await response.background()
@@ -3046,6 +2937,10 @@ async def process_chat_response(
                     yield wrap_item(json.dumps(event))
 
             async for data in original_generator:
+                if filter_functions and isinstance(data, StreamChunk):
+                    # Stream filters receive the raw SSE line here
+                    data = str(data)
+
                 data, _ = await process_filter_functions(
                     request=request,
                     filter_functions=filter_functions,
@@ -1,7 +1,11 @@
 import time
 import logging
 import asyncio
+import copy
+import hashlib
+import json
 import sys
+from typing import Optional
 
 from aiocache import cached
 from fastapi import Request
@@ -14,10 +18,7 @@ from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 
 
-from open_webui.utils.plugin import (
-    load_function_module_by_id,
-    get_function_module_from_cache,
-)
+from open_webui.utils.plugin import get_function_module_from_cache
 from open_webui.utils.access_control import has_access
 
 
@@ -76,114 +77,205 @@ async def get_all_base_models(request: Request, user: UserModel = None):
     return function_models + openai_models + ollama_models
 
 
-async def get_all_models(request, user: UserModel = None):
-    models = await get_all_base_models(request, user=user)
+def get_arena_models(request) -> list[dict]:
+    if len(request.app.state.config.EVALUATION_ARENA_MODELS) > 0:
+        return [
+            {
+                "id": model["id"],
+                "name": model["name"],
+                "info": {
+                    "meta": model["meta"],
+                },
+                "object": "model",
+                "created": int(time.time()),
+                "owned_by": "arena",
+                "arena": True,
+            }
+            for model in request.app.state.config.EVALUATION_ARENA_MODELS
+        ]
+    else:
+        # Add default arena model
+        return [
+            {
+                "id": DEFAULT_ARENA_MODEL["id"],
+                "name": DEFAULT_ARENA_MODEL["name"],
+                "info": {
+                    "meta": DEFAULT_ARENA_MODEL["meta"],
+                },
+                "object": "model",
+                "created": int(time.time()),
+                "owned_by": "arena",
+                "arena": True,
+            }
+        ]
 
-    # If there are no models, return an empty list
-    if len(models) == 0:
-        return []
+
+# Process action_ids to get the actions
+def get_action_items_from_module(function, module):
+    actions = []
+    if hasattr(module, "actions"):
+        actions = module.actions
+        return [
+            {
+                "id": f"{function.id}.{action['id']}",
+                "name": action.get("name", f"{function.name} ({action['id']})"),
+                "description": function.meta.description,
+                "icon": action.get(
+                    "icon_url",
+                    function.meta.manifest.get("icon_url", None)
+                    or getattr(module, "icon_url", None)
+                    or getattr(module, "icon", None),
+                ),
+            }
+            for action in actions
+        ]
+    else:
+        return [
+            {
+                "id": function.id,
+                "name": function.name,
+                "description": function.meta.description,
+                "icon": function.meta.manifest.get("icon_url", None)
+                or getattr(module, "icon_url", None)
+                or getattr(module, "icon", None),
+            }
+        ]
+
+
+# Process filter_ids to get the filters
+def get_filter_items_from_module(function, module):
+    return [
+        {
+            "id": function.id,
+            "name": function.name,
+            "description": function.meta.description,
+            "icon": function.meta.manifest.get("icon_url", None)
+            or getattr(module, "icon_url", None)
+            or getattr(module, "icon", None),
+        }
+    ]
+
+
+def get_model_catalogue_stamp(request, base_models: list[dict]) -> Optional[str]:
+    """
+    Return a stamp that changes whenever the assembled catalogue could, or
+    None if the catalogue must not be cached.
+    """
+    models_stamp = Models.get_version_stamp()
+    functions_stamp = Functions.get_version_stamp()
+
+    # Another write within the same second would leave the stamp unchanged
+    if max(models_stamp[1], functions_stamp[1]) >= int(time.time()):
+        return None
+
+    return hashlib.sha256(
+        json.dumps(
+            [
+                models_stamp,
+                functions_stamp,
+                request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS,
+                request.app.state.config.EVALUATION_ARENA_MODELS,
+                # Ollama models are stamped with the time they were listed
+                [
+                    {key: value for key, value in model.items() if key != "created"}
+                    for model in base_models
+                ],
+            ],
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+def build_model_catalogue(request, base_models: list[dict]) -> list[dict]:
+    # The base model dicts are shared with the upstream model caches
+    models = copy.deepcopy(base_models)
 
     # Add arena models
     if request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
-        arena_models = []
-        if len(request.app.state.config.EVALUATION_ARENA_MODELS) > 0:
-            arena_models = [
-                {
-                    "id": model["id"],
-                    "name": model["name"],
-                    "info": {
-                        "meta": model["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-                for model in request.app.state.config.EVALUATION_ARENA_MODELS
-            ]
-        else:
-            # Add default arena model
-            arena_models = [
-                {
-                    "id": DEFAULT_ARENA_MODEL["id"],
-                    "name": DEFAULT_ARENA_MODEL["name"],
-                    "info": {
-                        "meta": DEFAULT_ARENA_MODEL["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-            ]
-        models = models + arena_models
-
+        models = models + get_arena_models(request)
+
+    functions = {
+        function.id: function
+        for function in Functions.get_functions_by_types(
+            ["action", "filter"], active_only=True
+        )
+    }
     global_action_ids = [
-        function.id for function in Functions.get_global_action_functions()
-    ]
-    enabled_action_ids = [
         function.id
-        for function in Functions.get_functions_by_type("action", active_only=True)
+        for function in functions.values()
+        if function.type == "action" and function.is_global
     ]
-
     global_filter_ids = [
-        function.id for function in Functions.get_global_filter_functions()
-    ]
-    enabled_filter_ids = [
         function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
+        for function in functions.values()
+        if function.type == "filter" and function.is_global
     ]
 
-    custom_models = Models.get_all_models()
-    for custom_model in custom_models:
+    # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b'),
+    # so models are also indexed by their id without the tag
+    models_by_id = {}
+    matching_models = {}
+
+    def index_model(model):
+        model_id = model["id"]
+        base_id = model_id.split(":")[0]
+
+        models_by_id.setdefault(model_id, model)
+        models_by_id.setdefault(base_id, model)
+
+        matching_models.setdefault(model_id, []).append(model)
+        if model.get("owned_by") == "ollama" and base_id != model_id:
+            matching_models.setdefault(base_id, []).append(model)
+
+    for model in models:
+        index_model(model)
+
+    model_ids = {model["id"] for model in models}
+    removed = set()
+
+    for custom_model in Models.get_all_models():
         if custom_model.base_model_id is None:
-            for model in models:
-                if custom_model.id == model["id"] or (
-                    model.get("owned_by") == "ollama"
-                    and custom_model.id
-                    == model["id"].split(":")[
-                        0
-                    ]  # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
-                ):
-                    if custom_model.is_active:
-                        model["name"] = custom_model.name
-                        model["info"] = custom_model.model_dump()
-
-                        # Set action_ids and filter_ids
-                        action_ids = []
-                        filter_ids = []
-
-                        if "info" in model and "meta" in model["info"]:
-                            action_ids.extend(
-                                model["info"]["meta"].get("actionIds", [])
-                            )
-                            filter_ids.extend(
-                                model["info"]["meta"].get("filterIds", [])
-                            )
-
-                        model["action_ids"] = action_ids
-                        model["filter_ids"] = filter_ids
-                    else:
-                        models.remove(model)
-
-        elif custom_model.is_active and (
-            custom_model.id not in [model["id"] for model in models]
-        ):
+            for model in matching_models.get(custom_model.id, []):
+                if id(model) in removed:
+                    continue
+
+                if custom_model.is_active:
+                    model["name"] = custom_model.name
+                    model["info"] = custom_model.model_dump()
+
+                    # Set action_ids and filter_ids
+                    meta = model["info"].get("meta") or {}
+                    model["action_ids"] = list(meta.get("actionIds", []))
+                    model["filter_ids"] = list(meta.get("filterIds", []))
+                else:
+                    removed.add(id(model))
+                    model_ids.discard(model["id"])
+
+        elif custom_model.is_active and custom_model.id not in model_ids:
             owned_by = "openai"
             pipe = None
 
             action_ids = []
             filter_ids = []
 
-            for model in models:
-                if (
-                    custom_model.base_model_id == model["id"]
-                    or custom_model.base_model_id == model["id"].split(":")[0]
-                ):
-                    owned_by = model.get("owned_by", "unknown owner")
-                    if "pipe" in model:
-                        pipe = model["pipe"]
-                    break
+            base_model = models_by_id.get(custom_model.base_model_id)
+            if base_model is not None and id(base_model) in removed:
+                base_model = next(
+                    (
+                        model
+                        for model in models
+                        if id(model) not in removed
+                        and custom_model.base_model_id
+                        in (model["id"], model["id"].split(":")[0])
+                    ),
+                    None,
+                )
+
+            if base_model is not None:
+                owned_by = base_model.get("owned_by", "unknown owner")
+                if "pipe" in base_model:
+                    pipe = base_model["pipe"]
 
             if custom_model.meta:
                 meta = custom_model.meta.model_dump()
@@ -194,104 +286,99 @@ async def get_all_models(request, user: UserModel = None):
                 if "filterIds" in meta:
                     filter_ids.extend(meta["filterIds"])
 
-            models.append(
-                {
-                    "id": f"{custom_model.id}",
-                    "name": custom_model.name,
-                    "object": "model",
-                    "created": custom_model.created_at,
-                    "owned_by": owned_by,
-                    "info": custom_model.model_dump(),
-                    "preset": True,
-                    **({"pipe": pipe} if pipe is not None else {}),
-                    "action_ids": action_ids,
-                    "filter_ids": filter_ids,
-                }
-            )
-
-    # Process action_ids to get the actions
-    def get_action_items_from_module(function, module):
-        actions = []
-        if hasattr(module, "actions"):
-            actions = module.actions
-            return [
-                {
-                    "id": f"{function.id}.{action['id']}",
-                    "name": action.get("name", f"{function.name} ({action['id']})"),
-                    "description": function.meta.description,
-                    "icon": action.get(
-                        "icon_url",
-                        function.meta.manifest.get("icon_url", None)
-                        or getattr(module, "icon_url", None)
-                        or getattr(module, "icon", None),
-                    ),
-                }
-                for action in actions
-            ]
-        else:
-            return [
-                {
-                    "id": function.id,
-                    "name": function.name,
-                    "description": function.meta.description,
-                    "icon": function.meta.manifest.get("icon_url", None)
-                    or getattr(module, "icon_url", None)
-                    or getattr(module, "icon", None),
-                }
-            ]
-
-    # Process filter_ids to get the filters
-    def get_filter_items_from_module(function, module):
-        return [
-            {
-                "id": function.id,
-                "name": function.name,
-                "description": function.meta.description,
-                "icon": function.meta.manifest.get("icon_url", None)
-                or getattr(module, "icon_url", None)
-                or getattr(module, "icon", None),
+            model = {
+                "id": f"{custom_model.id}",
+                "name": custom_model.name,
+                "object": "model",
+                "created": custom_model.created_at,
+                "owned_by": owned_by,
+                "info": custom_model.model_dump(),
+                "preset": True,
+                **({"pipe": pipe} if pipe is not None else {}),
+                "action_ids": action_ids,
+                "filter_ids": filter_ids,
             }
-        ]
+            models.append(model)
+            model_ids.add(model["id"])
+            index_model(model)
+
+    # Action and filter items only depend on the function, resolve them once
+    function_items = {}
+
+    def get_function_items(function_id):
+        if function_id not in function_items:
+            function = functions[function_id]
+            function_module, _, _ = get_function_module_from_cache(
+                request, function_id, function=function
+            )
 
-    def get_function_module_by_id(function_id):
-        function_module, _, _ = get_function_module_from_cache(request, function_id)
-        return function_module
+            if function.type == "action":
+                function_items[function_id] = get_action_items_from_module(
+                    function, function_module
+                )
+            elif getattr(function_module, "toggle", None):
+                function_items[function_id] = get_filter_items_from_module(
+                    function, function_module
+                )
+            else:
+                function_items[function_id] = []
+        return function_items[function_id]
 
+    catalogue = []
     for model in models:
+        if id(model) in removed:
+            continue
+
         action_ids = [
             action_id
-            for action_id in list(set(model.pop("action_ids", []) + global_action_ids))
-            if action_id in enabled_action_ids
+            for action_id in dict.fromkeys(
+                model.pop("action_ids", []) + global_action_ids
+            )
+            if action_id in functions and functions[action_id].type == "action"
         ]
         filter_ids = [
             filter_id
-            for filter_id in list(set(model.pop("filter_ids", []) + global_filter_ids))
-            if filter_id in enabled_filter_ids
+            for filter_id in dict.fromkeys(
+                model.pop("filter_ids", []) + global_filter_ids
+            )
+            if filter_id in functions and functions[filter_id].type == "filter"
         ]
 
         model["actions"] = []
         for action_id in action_ids:
-            action_function = Functions.get_function_by_id(action_id)
-            if action_function is None:
-                raise Exception(f"Action not found: {action_id}")
-
-            function_module = get_function_module_by_id(action_id)
-            model["actions"].extend(
-                get_action_items_from_module(action_function, function_module)
-            )
+            model["actions"].extend(get_function_items(action_id))
 
         model["filters"] = []
         for filter_id in filter_ids:
-            filter_function = Functions.get_function_by_id(filter_id)
-            if filter_function is None:
-                raise Exception(f"Filter not found: {filter_id}")
+            model["filters"].extend(get_function_items(filter_id))
 
-            function_module = get_function_module_by_id(filter_id)
+        catalogue.append(model)
 
-            if getattr(function_module, "toggle", None):
-                model["filters"].extend(
-                    get_filter_items_from_module(filter_function, function_module)
-                )
+    return catalogue
+
+
+# The last assembled catalogue and the stamp it was built for
+MODEL_CATALOGUE = {"stamp": None, "models": []}
+
+
+async def get_all_models(request, user: UserModel = None):
+    models = await get_all_base_models(request, user=user)
+
+    # If there are no models, return an empty list
+    if len(models) == 0:
+        return []
+
+    stamp = get_model_catalogue_stamp(request, models)
+    if stamp is not None and stamp == MODEL_CATALOGUE["stamp"]:
+        catalogue = MODEL_CATALOGUE["models"]
+    else:
+        catalogue = build_model_catalogue(request, models)
+        if stamp is not None:
+            MODEL_CATALOGUE.update(stamp=stamp, models=catalogue)
+
+    # Callers annotate the returned dicts and their nested info/meta, keep the
+    # cached ones intact
+    models = copy.deepcopy(catalogue)
 
     log.debug(f"get_all_models() returned {len(models)} models")
 
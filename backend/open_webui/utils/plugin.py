@@ -166,13 +166,17 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         os.unlink(temp_file.name)
 
 
-def get_function_module_from_cache(request, function_id, load_from_db=True):
+def get_function_module_from_cache(
+    request, function_id, load_from_db=True, function=None
+):
     if load_from_db:
         # Always load from the database by default
         # This is useful for hooks like "inlet" or "outlet" where the content might change
         # and we want to ensure the latest content is used.
+        # Callers that already fetched the function can pass it in to skip the query.
 
-        function = Functions.get_function_by_id(function_id)
+        if function is None:
+            function = Functions.get_function_by_id(function_id)
         if not function:
             raise Exception(f"Function not found: {function_id}")
         content = function.content
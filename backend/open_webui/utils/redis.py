@@ -1,6 +1,14 @@
+import logging
+import threading
+import time
 import socketio
 from urllib.parse import urlparse
-from typing import Optional
+from typing import Callable, Optional
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
 
 def parse_redis_service_url(redis_url):
@@ -78,3 +86,75 @@ def get_sentinel_url_from_env(redis_url, sentinel_hosts_env, sentinel_port_env):
         f"{host}:{sentinel_port_env}" for host in sentinel_hosts_env.split(",")
     )
     return f"redis+sentinel://{auth_part}{hosts_part}/{redis_config['db']}/{redis_config['service']}"
+
+
+class RedisPubSubListener:
+    """
+    Subscribes to a Redis channel from a daemon thread and hands every message
+    to `callback`. Used to invalidate process-local caches across workers.
+
+    `connected` is only True while the subscription is established, so
+    callers can stop trusting their caches when messages may be lost.
+    `on_reset` is called on every (re)subscription, because messages sent
+    while disconnected are gone.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        redis_sentinels: list,
+        channel: str,
+        callback: Callable[[str], None],
+        on_reset: Optional[Callable[[], None]] = None,
+    ):
+        self.channel = channel
+        self.callback = callback
+        self.on_reset = on_reset
+        self.connected = False
+        self.redis = get_redis_connection(
+            redis_url, redis_sentinels, decode_responses=True
+        )
+
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread is not None:
+            return self
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._listen, name=f"pubsub:{self.channel}", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                self.connected = True
+                if self.on_reset:
+                    self.on_reset()
+
+                for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.callback(message["data"])
+            except Exception as e:
+                log.warning(f"Lost subscription to {self.channel}: {e}")
+            finally:
+                self.connected = False
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+            time.sleep(1)
+
+    def publish(self, message: str):
+        try:
+            self.redis.publish(self.channel, message)
+        except Exception as e:
+            log.warning(f"Failed to publish to {self.channel}: {e}")
@@ -1,10 +1,60 @@
 import json
+from typing import Any, Union
 from uuid import uuid4
 from open_webui.utils.misc import (
     openai_chat_chunk_message_template,
     openai_chat_completion_message_template,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(data: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bit, which the json module handles
+            pass
+    return json.dumps(data)
+
+
+class StreamChunk:
+    """
+    A parsed chunk of an OpenAI compatible event stream.
+
+    Consumers inside the app (the chat middleware) read `data` directly. The
+    `data: ...` SSE line is only serialised when the chunk is written to an
+    HTTP response, where Starlette calls `encode`, or when it is used as a
+    string by code expecting the raw line.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: dict):
+        self.data = data
+
+    def __str__(self) -> str:
+        return f"data: {dumps(self.data)}\n\n"
+
+    def encode(self, encoding: str = "utf-8", errors: str = "strict") -> bytes:
+        return str(self).encode(encoding, errors)
+
+    def __contains__(self, value: str) -> bool:
+        return value in str(self)
+
+    def __getattr__(self, name: str):
+        return getattr(str(self), name)
+
 
 def convert_ollama_tool_call_to_openai(tool_calls: dict) -> dict:
     openai_tool_calls = []
@@ -102,12 +152,16 @@ def convert_response_ollama_to_openai(ollama_response: dict) -> dict:
 
 async def convert_streaming_response_ollama_to_openai(ollama_streaming_response):
     async for data in ollama_streaming_response.body_iterator:
-        data = json.loads(data)
+        if not data.strip():
+            continue
+
+        data = loads(data)
+        message = data.get("message", {})
 
         model = data.get("model", "ollama")
-        message_content = data.get("message", {}).get("content", None)
-        reasoning_content = data.get("message", {}).get("thinking", None)
-        tool_calls = data.get("message", {}).get("tool_calls", None)
+        message_content = message.get("content", None)
+        reasoning_content = message.get("thinking", None)
+        tool_calls = message.get("tool_calls", None)
         openai_tool_calls = None
 
         if tool_calls:
@@ -119,13 +173,13 @@ async def convert_streaming_response_ollama_to_openai(ollama_streaming_response)
         if done:
             usage = convert_ollama_usage_to_openai(data)
 
-        data = openai_chat_chunk_message_template(
-            model, message_content, reasoning_content, openai_tool_calls, usage
+        # Serialised only once it leaves the app, see StreamChunk
+        yield StreamChunk(
+            openai_chat_chunk_message_template(
+                model, message_content, reasoning_content, openai_tool_calls, usage
+            )
         )
 
-        line = f"data: {json.dumps(data)}\n\n"
-        yield line
-
     yield "data: [DONE]\n\n"
 
 
@@ -0,0 +1,246 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from open_webui.config import (
+    CACHE_DIR,
+    AUDIO_TTS_CACHE_MAX_SIZE_MB,
+    AUDIO_TTS_CACHE_TTL,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["AUDIO"])
+
+SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
+SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+
+class SpeechCache:
+    """
+    Synthesised speech on disk, keyed by a hash of the speech request.
+
+    Every entry is a `{key}.mp3` clip with the request payload next to it in
+    `{key}.json`. An in-memory index keeps the size and last access time of
+    every entry, in access order. It is built from the file mtimes, which
+    cache hits refresh, so the order survives restarts and is picked up from
+    other workers when the directory is rescanned.
+
+    Eviction removes the entries not accessed for `ttl` seconds, then the
+    least recently used ones until the cache fits in `max_size` bytes. It runs
+    in the background, periodically and whenever a new entry takes the cache
+    over its size.
+    """
+
+    def __init__(self, directory: Path, max_size: int, ttl: int):
+        self.directory = directory
+        self.max_size = max_size
+        self.ttl = ttl
+
+        # key -> (size, accessed_at)
+        self._index: Optional[OrderedDict[str, tuple[int, float]]] = None
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @staticmethod
+    def get_key(body: bytes, *parts) -> str:
+        return hashlib.sha256(
+            body + b"".join(str(part).encode("utf-8") for part in parts)
+        ).hexdigest()
+
+    def get_path(self, key: str) -> Path:
+        return self.directory / f"{key}.mp3"
+
+    def get_payload_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def create_temp_path(self, key: str) -> Path:
+        """Path to write a clip to before it is added with `add`."""
+        return self.directory / f"{key}.mp3.{uuid.uuid4().hex}.part"
+
+    def _get_entry_size(self, key: str) -> int:
+        size = 0
+        for path in [self.get_path(key), self.get_payload_path(key)]:
+            try:
+                size += path.stat().st_size
+            except OSError:
+                pass
+        return size
+
+    def _load_index(self):
+        if self._index is not None:
+            return
+
+        entries = []
+        for path in self.directory.glob("*.mp3"):
+            try:
+                accessed_at = path.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((accessed_at, path.stem, self._get_entry_size(path.stem)))
+        entries.sort()
+
+        self._index = OrderedDict(
+            (key, (size, accessed_at)) for accessed_at, key, size in entries
+        )
+        self._size = sum(size for _, _, size in entries)
+
+    def _is_expired(self, accessed_at: float, now: float) -> bool:
+        return bool(self.ttl) and accessed_at < now - self.ttl
+
+    def get(self, key: str) -> Optional[Path]:
+        """Path of the cached clip for `key`, marked as just accessed, or None."""
+        path = self.get_path(key)
+        now = time.time()
+
+        with self._lock:
+            self._load_index()
+            entry = self._index.get(key)
+            if not path.is_file() or (
+                entry is not None and self._is_expired(entry[1], now)
+            ):
+                if entry is not None:
+                    del self._index[key]
+                    self._size -= entry[0]
+                self._stats["misses"] += 1
+                return None
+
+            if entry is None:
+                # Added by another worker
+                size = self._get_entry_size(key)
+                self._size += size
+            else:
+                size = entry[0]
+            self._index[key] = (size, now)
+            self._index.move_to_end(key)
+            self._stats["hits"] += 1
+
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        return path
+
+    def add(self, key: str, temp_path: Optional[Path] = None) -> Path:
+        """
+        Add the clip for `key`, moving it into place from `temp_path` if
+        given, with its payload already written to `get_payload_path(key)`.
+        """
+        path = self.get_path(key)
+        if temp_path is not None:
+            os.replace(temp_path, path)
+        size = self._get_entry_size(key)
+
+        with self._lock:
+            self._load_index()
+            previous = self._index.pop(key, None)
+            self._size += size - (previous[0] if previous else 0)
+            self._index[key] = (size, time.time())
+            over_size = self._size > self.max_size
+
+        if over_size and self._wakeup is not None:
+            self._wakeup.set()
+        return path
+
+    def _remove_files(self, keys: list[str]):
+        for key in keys:
+            for path in [self.get_path(key), self.get_payload_path(key)]:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError as e:
+                    log.warning(f"Failed to remove {path}: {e}")
+
+    def _remove_stale_temp_files(self, now: float):
+        # Left behind by streams interrupted by a restart
+        for path in self.directory.glob("*.part"):
+            try:
+                if path.stat().st_mtime < now - 3600:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def evict(self, rescan: bool = False) -> int:
+        """Remove expired entries, then the least recently used ones over the size limit."""
+        now = time.time()
+        if rescan:
+            self._remove_stale_temp_files(now)
+
+        keys = []
+        with self._lock:
+            if rescan:
+                self._index = None
+            self._load_index()
+
+            while self._index:
+                key, (size, accessed_at) = next(iter(self._index.items()))
+                if (
+                    not self._is_expired(accessed_at, now)
+                    and self._size <= self.max_size
+                ):
+                    break
+                del self._index[key]
+                self._size -= size
+                keys.append(key)
+            self._stats["evictions"] += len(keys)
+
+        self._remove_files(keys)
+        return len(keys)
+
+    async def run_eviction(self, interval: int):
+        """Evict in the background every `interval` seconds, or as soon as the cache is over its size."""
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+                rescan = False
+            except asyncio.TimeoutError:
+                # Pick up entries added and accessed by other workers
+                rescan = True
+            self._wakeup.clear()
+
+            try:
+                evicted = await asyncio.to_thread(self.evict, rescan)
+                if evicted:
+                    log.info(f"Evicted {evicted} clips from the speech cache")
+            except Exception as e:
+                log.exception(f"Error evicting speech cache: {e}")
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            self._load_index()
+            total = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._index),
+                "size": self._size,
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hit_rate": self._stats["hits"] / total if total else 0.0,
+            }
+
+    def clear(self) -> int:
+        with self._lock:
+            self._index = None
+            self._load_index()
+            keys = list(self._index.keys())
+            self._index.clear()
+            self._size = 0
+
+        self._remove_files(keys)
+        return len(keys)
+
+
+SPEECH_CACHE = SpeechCache(
+    SPEECH_CACHE_DIR,
+    max_size=AUDIO_TTS_CACHE_MAX_SIZE_MB * 1024 * 1024,
+    ttl=AUDIO_TTS_CACHE_TTL,
+)
@@ -36,10 +36,14 @@ from langchain_core.utils.function_calling import (
 from open_webui.models.tools import Tools
 from open_webui.models.users import UserModel
 from open_webui.utils.plugin import load_tool_module_by_id
+from open_webui.utils.http_client import get_http_session
+from open_webui.utils.upstream_cache import UpstreamCache
 from open_webui.env import (
     SRC_LOG_LEVELS,
     AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA,
     AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+    TOOL_SERVER_CACHE_TTL,
+    TOOL_SERVER_CACHE_STALE_TTL,
 )
 
 import copy
@@ -47,6 +51,14 @@ import copy
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
+# Parsed OpenAPI specs of tool servers, keyed by url and token. Session
+# tokens differ per user, the cache only keeps the most recently used specs
+TOOL_SERVER_CACHE = UpstreamCache(
+    ttl=TOOL_SERVER_CACHE_TTL,
+    stale_ttl=TOOL_SERVER_CACHE_STALE_TTL,
+    namespace="tool-server",
+)
+
 
 def get_async_tool_function_and_apply_extra_params(
     function: Callable, extra_params: dict
@@ -440,7 +452,40 @@ def convert_openapi_to_tool_payload(openapi_spec):
     return tool_payload
 
 
-async def get_tool_server_data(token: str, url: str) -> Dict[str, Any]:
+def get_tool_server_operations(openapi: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Index the operations of an OpenAPI spec by operationId."""
+    operations = {}
+    for route_path, methods in openapi.get("paths", {}).items():
+        if not isinstance(methods, dict):
+            continue
+        for http_method, operation in methods.items():
+            if isinstance(operation, dict) and operation.get("operationId"):
+                operations.setdefault(
+                    operation["operationId"],
+                    {
+                        "method": http_method.lower(),
+                        "path": route_path,
+                        "parameters": [
+                            (param["name"], param["in"])
+                            for param in operation.get("parameters", [])
+                            if isinstance(param, dict) and "name" in param
+                        ],
+                        "has_body": bool(
+                            operation.get("requestBody", {}).get("content")
+                        ),
+                    },
+                )
+    return operations
+
+
+async def get_tool_server_data(
+    token: str, url: str, previous: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Fetch and parse the OpenAPI spec of a tool server. With the `previous`
+    data of the same server, the spec is revalidated with its ETag or
+    Last-Modified date and the previous data is returned if it is unchanged.
+    """
     headers = {
         "Accept": "application/json",
         "Content-Type": "application/json",
@@ -448,23 +493,38 @@ async def get_tool_server_data(token: str, url: str) -> Dict[str, Any]:
     if token:
         headers["Authorization"] = f"Bearer {token}"
 
+    if previous:
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
     error = None
     try:
         timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url, headers=headers, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
-            ) as response:
-                if response.status != 200:
-                    error_body = await response.json()
-                    raise Exception(error_body)
-
-                # Check if URL ends with .yaml or .yml to determine format
-                if url.lower().endswith((".yaml", ".yml")):
-                    text_content = await response.text()
-                    res = yaml.safe_load(text_content)
-                else:
-                    res = await response.json()
+        async with get_http_session(url).get(
+            url,
+            headers=headers,
+            ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+            timeout=timeout,
+        ) as response:
+            if response.status == 304 and previous:
+                log.debug(f"Tool server spec at {url} is unchanged")
+                return previous
+
+            if response.status != 200:
+                error_body = await response.json()
+                raise Exception(error_body)
+
+            # Check if URL ends with .yaml or .yml to determine format
+            if url.lower().endswith((".yaml", ".yml")):
+                text_content = await response.text()
+                res = yaml.safe_load(text_content)
+            else:
+                res = await response.json()
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
     except Exception as err:
         log.exception(f"Could not fetch tool server spec from {url}")
         if isinstance(err, dict) and "detail" in err:
@@ -477,12 +537,48 @@ async def get_tool_server_data(token: str, url: str) -> Dict[str, Any]:
         "openapi": res,
         "info": res.get("info", {}),
         "specs": convert_openapi_to_tool_payload(res),
+        "operations": get_tool_server_operations(res),
+        "etag": etag,
+        "last_modified": last_modified,
     }
 
     log.info(f"Fetched data: {data}")
     return data
 
 
+async def get_cached_tool_server_data(token: str, url: str) -> Dict[str, Any]:
+    key = TOOL_SERVER_CACHE.get_key(url, token or "")
+
+    async def fetch():
+        # The cached data, however old, is used to revalidate the spec
+        return await get_tool_server_data(token, url, TOOL_SERVER_CACHE.peek(key))
+
+    data = await TOOL_SERVER_CACHE.get(key, fetch)
+    if data is None:
+        raise Exception(f"Could not fetch tool server spec from {url}")
+    return data
+
+
+def get_tool_server_url(server: Dict[str, Any]) -> str:
+    # Path (to OpenAPI spec URL) can be either a full URL or a path to append to the base URL
+    openapi_path = server.get("path", "openapi.json")
+    if "://" in openapi_path:
+        # If it contains "://", it's a full URL
+        return openapi_path
+
+    if not openapi_path.startswith("/"):
+        # Ensure the path starts with a slash
+        openapi_path = f"/{openapi_path}"
+
+    return f"{server.get('url')}{openapi_path}"
+
+
+async def invalidate_tool_servers_data(servers: List[Dict[str, Any]]):
+    for server in servers:
+        url = get_tool_server_url(server)
+        await TOOL_SERVER_CACHE.invalidate(url)
+
+
 async def get_tool_servers_data(
     servers: List[Dict[str, Any]], session_token: Optional[str] = None
 ) -> List[Dict[str, Any]]:
@@ -490,17 +586,7 @@ async def get_tool_servers_data(
     server_entries = []
     for idx, server in enumerate(servers):
         if server.get("config", {}).get("enable"):
-            # Path (to OpenAPI spec URL) can be either a full URL or a path to append to the base URL
-            openapi_path = server.get("path", "openapi.json")
-            if "://" in openapi_path:
-                # If it contains "://", it's a full URL
-                full_url = openapi_path
-            else:
-                if not openapi_path.startswith("/"):
-                    # Ensure the path starts with a slash
-                    openapi_path = f"/{openapi_path}"
-
-                full_url = f"{server.get('url')}{openapi_path}"
+            full_url = get_tool_server_url(server)
 
             info = server.get("info", {})
 
@@ -515,7 +601,8 @@ async def get_tool_servers_data(
 
     # Create async tasks to fetch data
     tasks = [
-        get_tool_server_data(token, url) for (_, _, url, _, token) in server_entries
+        get_cached_tool_server_data(token, url)
+        for (_, _, url, _, token) in server_entries
     ]
 
     # Execute tasks concurrently
@@ -544,52 +631,47 @@ async def get_tool_servers_data(
                 "openapi": openapi_data,
                 "info": response.get("info"),
                 "specs": response.get("specs"),
+                "operations": response.get("operations"),
             }
         )
 
     return results
 
 
+async def refresh_tool_servers(app):
+    """Keep `app.state.TOOL_SERVERS` up to date, so chats never wait for specs."""
+    while True:
+        try:
+            app.state.TOOL_SERVERS = await get_tool_servers_data(
+                app.state.config.TOOL_SERVER_CONNECTIONS
+            )
+        except Exception as e:
+            log.exception(f"Failed to refresh tool servers: {e}")
+
+        await asyncio.sleep(TOOL_SERVER_CACHE_TTL or 300)
+
+
 async def execute_tool_server(
     token: str, url: str, name: str, params: Dict[str, Any], server_data: Dict[str, Any]
 ) -> Any:
     error = None
     try:
-        openapi = server_data.get("openapi", {})
-        paths = openapi.get("paths", {})
-
-        matching_route = None
-        for route_path, methods in paths.items():
-            for http_method, operation in methods.items():
-                if isinstance(operation, dict) and operation.get("operationId") == name:
-                    matching_route = (route_path, methods)
-                    break
-            if matching_route:
-                break
-
-        if not matching_route:
-            raise Exception(f"No matching route found for operationId: {name}")
+        operations = server_data.get("operations")
+        if operations is None:
+            operations = get_tool_server_operations(server_data.get("openapi", {}))
 
-        route_path, methods = matching_route
-
-        method_entry = None
-        for http_method, operation in methods.items():
-            if operation.get("operationId") == name:
-                method_entry = (http_method.lower(), operation)
-                break
-
-        if not method_entry:
-            raise Exception(f"No matching method found for operationId: {name}")
+        operation = operations.get(name)
+        if not operation:
+            raise Exception(f"No matching route found for operationId: {name}")
 
-        http_method, operation = method_entry
+        http_method = operation["method"]
+        route_path = operation["path"]
 
         path_params = {}
         query_params = {}
         body_params = {}
 
-        for param in operation.get("parameters", []):
-            param_name = param["name"]
-            param_in = param["in"]
+        for param_name, param_in in operation["parameters"]:
             if param_name in params:
                 if param_in == "path":
                     path_params[param_name] = params[param_name]
@@ -604,7 +686,7 @@ async def execute_tool_server(
             query_string = "&".join(f"{k}={v}" for k, v in query_params.items())
             final_url = f"{final_url}?{query_string}"
 
-        if operation.get("requestBody", {}).get("content"):
+        if operation["has_body"]:
             if params:
                 body_params = params
             else:
@@ -0,0 +1,241 @@
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    REDIS_URL,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    MODEL_LIST_CACHE_TTL,
+    MODEL_LIST_CACHE_STALE_TTL,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+class UpstreamCache:
+    """
+    Stale-while-revalidate cache for responses of upstream APIs, such as the
+    model lists of OpenAI and Ollama connections.
+
+    Every upstream is cached under its own key, so a slow or failing upstream
+    doesn't affect the others. Entries younger than `ttl` are served as is.
+    Older entries are served for another `stale_ttl` seconds while a single
+    background task refreshes them. Only a missing entry makes the caller wait,
+    and concurrent callers share that one fetch. A failed fetch (None) keeps
+    serving the last good value until it is `ttl + stale_ttl` old, retrying
+    at most once per `ttl`. Without a good value failures aren't cached, the
+    next caller fetches again. At most `max_entries` keys are kept, the least
+    recently used are dropped first.
+
+    With Redis configured, good values are shared between workers and a
+    short lock makes sure only one worker refreshes an upstream at a time.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float,
+        namespace: str,
+        redis_url: Optional[str] = None,
+        redis_sentinels: Optional[list] = None,
+        max_entries: int = 1000,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.namespace = namespace
+        self.max_entries = max_entries
+
+        # key -> (fetched_at, value)
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._pending: dict[str, asyncio.Task] = {}
+        # key -> time before which a failed refresh isn't retried
+        self._retry_at: dict[str, float] = {}
+
+        self.redis = None
+        if ttl > 0 and redis_url:
+            try:
+                self.redis = get_redis_connection(
+                    redis_url, redis_sentinels or [], async_mode=True
+                )
+            except Exception as e:
+                log.warning(f"Shared {namespace} cache unavailable: {e}")
+
+    def get_key(self, url: str, *parts: str) -> str:
+        return f"{_hash(url)}:{_hash(chr(0).join(parts))}"
+
+    def peek(self, key: str) -> Any:
+        """The cached value of `key`, however old, without fetching it."""
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+
+    def _set(self, key: str, entry: tuple[float, Any]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._retry_at.pop(evicted, None)
+
+    def _redis_key(self, key: str) -> str:
+        return f"open-webui:{self.namespace}:{key}"
+
+    async def _read_shared(self, key: str) -> Optional[tuple[float, Any]]:
+        if self.redis is None:
+            return None
+        try:
+            data = await self.redis.get(self._redis_key(key))
+            if data is None:
+                return None
+            entry = json.loads(data)
+            return entry["fetched_at"], entry["value"]
+        except Exception as e:
+            log.debug(
+                f"Failed to read {key} from the shared {self.namespace} cache: {e}"
+            )
+            return None
+
+    async def _write_shared(self, key: str, entry: tuple[float, Any], ttl: float):
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(
+                self._redis_key(key),
+                json.dumps({"fetched_at": entry[0], "value": entry[1]}),
+                ex=max(1, int(ttl + self.stale_ttl)),
+            )
+        except Exception as e:
+            log.debug(
+                f"Failed to write {key} to the shared {self.namespace} cache: {e}"
+            )
+
+    async def _acquire_refresh(self, key: str, ttl: float) -> bool:
+        if self.redis is None:
+            return True
+        try:
+            return bool(
+                await self.redis.set(
+                    f"{self._redis_key(key)}:lock", "1", nx=True, ex=max(1, int(ttl))
+                )
+            )
+        except Exception:
+            return True
+
+    async def _refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        previous: Optional[tuple[float, Any]],
+        ttl: float,
+    ) -> tuple[float, Any]:
+        try:
+            value = await fetch()
+        except Exception as e:
+            log.warning(f"Failed to refresh {self.namespace} entry {key}: {e}")
+            value = None
+
+        now = time.time()
+        if (
+            value is None
+            and previous is not None
+            and previous[1] is not None
+            and now - previous[0] < ttl + self.stale_ttl
+        ):
+            # Keep serving the last good value, as fetched at its original
+            # time so it still expires, and retry after another ttl
+            entry = previous
+            self._retry_at[key] = now + ttl
+        elif value is None:
+            # Nothing good to serve, the next caller fetches again
+            self._entries.pop(key, None)
+            self._retry_at.pop(key, None)
+            return (now, None)
+        else:
+            entry = (now, value)
+            self._retry_at.pop(key, None)
+            await self._write_shared(key, entry, ttl)
+
+        self._set(key, entry)
+        return entry
+
+    def _fetch_once(self, key, fetch, previous, ttl) -> asyncio.Task:
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, fetch, previous, ttl))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return task
+
+    async def get(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return await fetch()
+
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None or now - entry[0] >= ttl:
+            # Another worker may have refreshed it already
+            shared = await self._read_shared(key)
+            if shared is not None and (entry is None or shared[0] > entry[0]):
+                entry = shared
+                self._set(key, entry)
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = now - entry[0]
+            if age >= ttl and age < ttl + self.stale_ttl:
+                if (
+                    key not in self._pending
+                    and self._retry_at.get(key, 0) <= now
+                    and await self._acquire_refresh(key, ttl)
+                ):
+                    self._fetch_once(key, fetch, entry, ttl)
+            if age < ttl + self.stale_ttl:
+                # Callers post-process the values in place
+                return copy.deepcopy(entry[1])
+
+        entry = await asyncio.shield(self._fetch_once(key, fetch, entry, ttl))
+        return copy.deepcopy(entry[1])
+
+    async def invalidate(self, url: str):
+        """Drop every entry of the upstream serving `url`."""
+        prefix = f"{_hash(url)}:"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+            self._retry_at.pop(key, None)
+
+        if self.redis is not None:
+            try:
+                async for redis_key in self.redis.scan_iter(
+                    match=f"{self._redis_key(prefix)}*"
+                ):
+                    await self.redis.delete(redis_key)
+            except Exception as e:
+                log.debug(
+                    f"Failed to invalidate the shared {self.namespace} cache: {e}"
+                )
+
+
+MODEL_LIST_CACHE = UpstreamCache(
+    ttl=MODEL_LIST_CACHE_TTL,
+    stale_ttl=MODEL_LIST_CACHE_STALE_TTL,
+    namespace="model-list",
+    redis_url=REDIS_URL,
+    redis_sentinels=get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+)